@@ -0,0 +1,71 @@
+# benchmarks/bench_before_alarm.py
+#
+# Before-alarm matching: the old per-alarm loop (iterrows + three masks over the whole frame)
+# vs. filters.match_before_alarm (one merge_asof grouped by ASRS).
+# The loop is only timed up to LOOP_MAX_ROWS; it grows with alarms x rows.
+#
+#   python benchmarks/bench_before_alarm.py                  # 10k, 100k, 1M, 5M rows
+#   python benchmarks/bench_before_alarm.py 20000 200000     # custom sizes
+
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.filters import match_before_alarm
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+LOOP_MAX_ROWS = 20_000
+
+def make_frame(n_rows, srms=8, alarm_share=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    normal_codes = np.array([1, 2, 5, 10, 11, 20, 30, 50, 80, 90])
+    alarm_codes = np.array([101, 102, 103, 104, 105])
+    plccode = np.where(rng.random(n_rows) < alarm_share,
+                       rng.choice(alarm_codes, n_rows), rng.choice(normal_codes, n_rows))
+    seconds = np.sort(rng.integers(0, 86_400 * 30, n_rows))[::-1]
+    return pd.DataFrame({
+        'ASRS': pd.array(rng.integers(1, srms + 1, n_rows), dtype='Int16'),
+        'CDATE': pd.Timestamp('2025-01-01') + pd.to_timedelta(seconds, unit='s'),
+        'PLCCODE': pd.array(plccode, dtype='Int16'),
+        'Present_Level (D145)': pd.array(rng.integers(0, 20, n_rows), dtype='Int32'),
+    })
+
+def loop_match(filtered_df):
+    """The previous process_alarm_data body."""
+    alarm_df = filtered_df[filtered_df['PLCCODE'] > 100].sort_values('CDATE', ascending=False)
+    sorted_df = filtered_df.sort_values('CDATE')
+    rows = []
+    for _, alarm_row in alarm_df.iterrows():
+        previous_rows = sorted_df[(sorted_df['ASRS'] == alarm_row['ASRS']) &
+                                  (sorted_df['CDATE'] < alarm_row['CDATE']) &
+                                  (sorted_df['PLCCODE'] < 100)]
+        if len(previous_rows) > 0:
+            previous_row = previous_rows.iloc[-1].copy()
+            previous_row['Alarm'] = alarm_row['PLCCODE']
+            previous_row['AlarmTime'] = alarm_row['CDATE']
+            previous_row['Duration'] = (alarm_row['CDATE'] - previous_row['CDATE']).total_seconds()
+            rows.append(previous_row)
+    return alarm_df, pd.DataFrame(rows)
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'rows':>10} {'alarms':>8} {'matched':>8} {'merge_asof':>11} {'loop':>9} {'speedup':>8}")
+    for size in sizes:
+        df = make_frame(size)
+        asof_s, (alarm_df, before_df) = timed(match_before_alarm, df)
+        if size <= LOOP_MAX_ROWS:
+            loop_s, (_, loop_df) = timed(loop_match, df)
+            assert len(loop_df) == len(before_df)
+            loop_text, speedup = f"{loop_s:8.2f}s", f"{loop_s / asof_s:7.0f}x"
+        else:
+            loop_text, speedup = f"{'-':>9}", f"{'-':>8}"
+        print(f"{size:>10,} {len(alarm_df):>8,} {len(before_df):>8,} {asof_s:10.3f}s {loop_text} {speedup}")
@@ -0,0 +1,65 @@
+# benchmarks/bench_export.py
+#
+# Export of the details table: the old path (pd.ExcelWriter into a BytesIO, base64 for a data: URL)
+# vs. the streaming writers in src/export.py. Reports rows/s, file size and peak Python memory.
+# Each export runs twice: timed, then under tracemalloc for the peak (tracing slows it down ~10x).
+#
+#   python benchmarks/bench_export.py                  # 20k rows, every format
+#   python benchmarks/bench_export.py 1000000 csv      # rows, then formats to run ("legacy" = old path)
+
+import sys
+import os
+import time
+import base64
+import tracemalloc
+from io import BytesIO
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_log_schema import make_frame
+from src.log_schema import normalize_logs
+from src.export import write_export, frame_chunks, _remove
+
+DEFAULT_ROWS = 20_000
+DEFAULT_FORMATS = ['legacy', 'xlsx', 'csv', 'parquet']
+
+def legacy_export(df):
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name="Logs")
+    buf.seek(0)
+    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    return len(f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}")
+
+def legacy_run(df, measure_memory):
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    size = legacy_export(df)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    if measure_memory:
+        tracemalloc.stop()
+    return {'bytes': size, 'seconds': seconds, 'rows_per_sec': round(len(df) / seconds), 'peak_bytes': peak}
+
+def streaming_run(df, fmt, measure_memory):
+    result = write_export([("Logs", frame_chunks(df))], "bench", fmt=fmt, measure_memory=measure_memory)
+    _remove(result['path'])
+    return result
+
+def run(df, fmt):
+    measure = (lambda m: legacy_run(df, m)) if fmt == 'legacy' else (lambda m: streaming_run(df, fmt, m))
+    timed, traced = measure(False), measure(True)
+    print(f"{fmt:>8}: {len(df):>9,} rows in {timed['seconds']:7.1f}s = {timed['rows_per_sec']:>9,} rows/s | "
+          f"{timed['bytes'] / 1024 ** 2:7.1f} MB {'data: URL' if fmt == 'legacy' else 'file'} | "
+          f"peak {traced['peak_bytes'] / 1024 ** 2:7.1f} MB")
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    formats = sys.argv[2:] or DEFAULT_FORMATS
+    df = normalize_logs(make_frame(n_rows))
+    print(f"frame in memory: {df.memory_usage(index=False, deep=True).sum() / 1024 ** 2:.1f} MB")
+    for fmt in formats:
+        run(df, fmt)
@@ -0,0 +1,73 @@
+# benchmarks/bench_filters.py
+#
+# One filter click on the loaded frame: what every tab rebuild used to do (apply_filters with
+# its df.copy(), filter_data_by_type, get_unique_statuses, get_status_stats on a second copy)
+# vs. the memoized filter engine (filters.select_rows and friends: row indexes per SRM/PLCCODE
+# built once per dataset version, selections as index intersections, results per
+# (version, SRM, status, type)). Also checks that both give the same rows.
+#
+#   python benchmarks/bench_filters.py                 # 100k, 1M, 5M rows
+#   python benchmarks/bench_filters.py 200000          # custom sizes
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.state import state, bind_session
+from src.incremental import publish_logs
+from src.filters import select_rows, get_status_stats, filter_stats
+from src.ui_components import get_unique_statuses
+from bench_before_alarm import make_frame
+
+DEFAULT_SIZES = [100_000, 1_000_000, 5_000_000]
+CLICKS = [("All", "All", "All"), ("3", "All", "All"), ("3", "All", "Alarm"), ("3", "101", "Alarm"), ("All", "All", "Normal")]
+
+def old_click(df, line, status, kind):
+    """The calls one tab rebuild made before the engine."""
+    filtered = df.copy()
+    if line != "All":
+        filtered = filtered[filtered['ASRS'] == int(line)]
+    if status != "All":
+        filtered = filtered[filtered['PLCCODE'] == int(status)]
+    if kind == "Alarm":
+        filtered = filtered[filtered['PLCCODE'] > 100]
+    elif kind == "Normal":
+        filtered = filtered[filtered['PLCCODE'] <= 100]
+    by_line = df.copy()
+    by_line = by_line[by_line['ASRS'] == int(line)] if line != "All" else by_line
+    statuses = sorted(by_line['PLCCODE'].dropna().unique().tolist())
+    counts = by_line['PLCCODE'].value_counts()
+    return filtered, statuses, counts
+
+def new_click(df, line, status, kind):
+    state['line_logs'] = line
+    return select_rows(df, line, status, kind), get_unique_statuses(kind), get_status_stats(df, line)
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+def run(n_rows):
+    df = make_frame(n_rows)
+    publish_logs(None, df)
+    old_s = first_s = again_s = 0.0
+    for click in CLICKS:
+        seconds, (old_rows, _, _) = timed(old_click, df, *click)
+        old_s += seconds
+        seconds, (new_rows, _, _) = timed(new_click, df, *click)
+        first_s += seconds
+        assert new_rows.index.equals(old_rows.index), click
+        seconds, _ = timed(new_click, df, *click)
+        again_s += seconds
+    n = len(CLICKS)
+    print(f"{n_rows:>10,} rows | old: {old_s / n * 1000:8.1f} ms/click | engine first: {first_s / n * 1000:7.1f} ms/click"
+          f" (incl. index build) | repeated: {again_s / n * 1e6:7.0f} us/click | {filter_stats}")
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    with bind_session('bench'):
+        for size in sizes:
+            run(size)
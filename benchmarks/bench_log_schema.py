@@ -0,0 +1,59 @@
+# benchmarks/bench_log_schema.py
+#
+# Memory per row of a loaded LogMnpAsrs frame before and after apply_log_schema.
+# "Before" is what load_data used to hand to the views: padded ASRS/PLCCODE strings (the
+# .astype(int, errors='ignore') fallback), Python strings per row and Int64 registers.
+#
+#   python benchmarks/bench_log_schema.py            # 100k and 1M rows
+#   python benchmarks/bench_log_schema.py 250000     # custom sizes
+
+import sys
+import os
+import time
+import random
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.monitor_parser import D_REGISTER_MEANINGS, add_register_columns
+from src.log_schema import apply_log_schema, memory_report
+from src.mock_database import (ASRS_VALUES, BARCODE_VALUES, CHKTYPE_VALUES, NORMAL_MSGLOG_VALUES,
+                               ALARM_MSGLOG_VALUES, NORMAL_PLCCODE_VALUES, ALARM_PLCCODE_VALUES)
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    py_rng = random.Random(seed)
+    monitor = [" ".join(f"{reg}={py_rng.randint(0, 40000)}" for reg in D_REGISTER_MEANINGS) for _ in range(5_000)]
+    pick = lambda values: np.array(values, dtype=object)[rng.integers(0, len(values), n_rows)]
+    # Fresh str objects per row, as the ODBC driver returns them
+    fresh = lambda values: np.array([f"{v}" for v in values], dtype=object)
+    df = pd.DataFrame({
+        'ASRS': fresh([f"{v:<4}" for v in pick(ASRS_VALUES)]),
+        'BARCODE': fresh(pick(BARCODE_VALUES)),
+        'CHKTYPE': fresh(pick(CHKTYPE_VALUES)),
+        'MSGLOG': fresh(pick(NORMAL_MSGLOG_VALUES + ALARM_MSGLOG_VALUES)),
+        'CDATE': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 86_400 * 30, n_rows), unit='s'),
+        'MSGTYPE': fresh(pick(["INFO", "NORMAL", "ERROR", "WARNING", "ALARM"])),
+        'PLCCODE': fresh([f"{v:<5}" for v in pick(NORMAL_PLCCODE_VALUES + ALARM_PLCCODE_VALUES)]),
+        'MONITORDATA': np.resize(np.array(monitor, dtype=object), n_rows),
+    })
+    return add_register_columns(df)
+
+def run(n_rows):
+    before = make_frame(n_rows)
+    started = time.perf_counter()
+    after = apply_log_schema(before.copy())
+    elapsed = time.perf_counter() - started
+    report = memory_report(before, after)
+    print(f"{n_rows:>10,} rows: {report['bytes_per_row_before']:>7.1f} -> {report['bytes_per_row_after']:>6.1f} bytes/row "
+          f"({report['ratio']}x smaller), cast {elapsed:.2f}s")
+    return report
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        report = run(size)
+    print("dtypes:", report['dtypes'])
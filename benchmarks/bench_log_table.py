@@ -0,0 +1,83 @@
+# benchmarks/bench_log_table.py
+#
+# Details-tab table: Flet controls and websocket payload per page for the paged table
+# (build_data_table, one Container + Text per cell) vs. the virtual table (VirtualLogTable,
+# a fixed window of reused row controls), and the page selector: the old one-option-per-page
+# dropdown vs. create_page_navigator.
+#
+#   python benchmarks/bench_log_table.py              # pages of 100 and 1000 rows
+#   python benchmarks/bench_log_table.py 500 5000     # custom page sizes
+
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import flet as ft
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.mock_database import generate_mock_data
+from src.log_schema import normalize_logs
+from src.ui_metrics import count_controls, add_payload_bytes, mark_sent, update_payload_bytes
+from src.ui_components import create_page_navigator
+from views.asrs_logs_view import build_data_table, VirtualLogTable, _normalize_page
+
+DEFAULT_SIZES = [100, 1000]
+
+def make_frame(n_rows):
+    start = datetime(2025, 1, 1)
+    return normalize_logs(generate_mock_data(start, start + timedelta(days=max(1, n_rows // 200)),
+                                             num_records=n_rows, seed=0))
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+def kb(n_bytes):
+    return f"{n_bytes / 1024:,.0f} KB"
+
+def run(rows_per_page, df):
+    first = _normalize_page(df.iloc[:rows_per_page])
+    second = _normalize_page(df.iloc[rows_per_page:2 * rows_per_page])
+
+    # Paged table: every page change builds and sends a new table
+    build_s, paged = timed(build_data_table, first)
+    paged_controls, paged_bytes = count_controls(paged), add_payload_bytes(paged)
+
+    # Virtual table: the first page is sent once, later pages only update cell values
+    table = VirtualLogTable()
+    virtual_s, _ = timed(table.show, first)
+    virtual_controls, virtual_bytes = count_controls(table.control), add_payload_bytes(table.control)
+    mark_sent(table.control)
+    change_s, _ = timed(table.show, second)
+    change_bytes = update_payload_bytes(table.control)
+    event = SimpleNamespace(pixels=table.row_height * rows_per_page / 2, viewport_dimension=table.row_height * 12)
+    table.list_view.update = lambda: None
+    table._on_scroll(event)
+    scroll_bytes = update_payload_bytes(table.control)
+
+    print(f"{rows_per_page:>6,} rows/page | paged: {paged_controls:>7,} controls, {kb(paged_bytes):>9} per page, {build_s:.2f}s"
+          f" | virtual: {virtual_controls:>5,} controls, {kb(virtual_bytes):>7} first page, "
+          f"{kb(change_bytes):>6} per page change ({change_s:.3f}s), {kb(scroll_bytes):>6} per scroll jump")
+
+def page_dropdown(total_pages):
+    """The selector both paginated views used to build."""
+    return ft.Dropdown(options=[ft.dropdown.Option(key=str(i), text=f"{i+1}") for i in range(total_pages)],
+                       value="0", width=100)
+
+def run_navigator(rows_per_page=100, totals=(1_000, 500_000, 5_000_000)):
+    for total_rows in totals:
+        total_pages = (total_rows + rows_per_page - 1) // rows_per_page
+        dropdown_bytes = add_payload_bytes(page_dropdown(total_pages))
+        navigator = create_page_navigator(total_rows, rows_per_page, 0, lambda page_no: None, lambda ts: 0)
+        print(f"{total_rows:>10,} rows ({total_pages:>6,} pages) | dropdown: {kb(dropdown_bytes):>9} | "
+              f"navigator: {count_controls(navigator)} controls, {kb(add_payload_bytes(navigator))}")
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    df = make_frame(2 * max(sizes))
+    for size in sizes:
+        run(size, df)
+    run_navigator()
@@ -0,0 +1,57 @@
+# benchmarks/bench_metrics.py
+#
+# Cost of the instrumentation in src/metrics.py: one span (enter, exit, histogram update) with
+# metrics enabled and disabled, and the same filter clicks as bench_filters.py (select_rows,
+# which records a span per call) timed both ways.
+#
+#   python benchmarks/bench_metrics.py                 # 1M rows
+#   python benchmarks/bench_metrics.py 200000          # custom sizes
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import metrics
+from src.metrics import METRICS_CONFIG, span
+from src.state import bind_session
+from src.incremental import publish_logs
+from src.filters import select_rows
+from bench_before_alarm import make_frame
+
+DEFAULT_SIZES = [1_000_000]
+SPANS = 200_000
+CLICKS = [("3", "All", "All"), ("3", "All", "Alarm"), ("3", "101", "Alarm"), ("All", "All", "Normal")]
+
+def span_cost(enabled):
+    METRICS_CONFIG['enabled'] = enabled
+    started = time.perf_counter()
+    for _ in range(SPANS):
+        with span('bench') as s:
+            s.rows(1)
+    return (time.perf_counter() - started) / SPANS
+
+def clicks_cost(df, enabled, repeat=200):
+    METRICS_CONFIG['enabled'] = enabled
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for click in CLICKS:
+            select_rows(df, *click)
+    return (time.perf_counter() - started) / (repeat * len(CLICKS))
+
+def run(n_rows):
+    df = make_frame(n_rows)
+    publish_logs(None, df)
+    for click in CLICKS:
+        select_rows(df, *click)   # build indexes and fill the result cache first
+    off, on = clicks_cost(df, False), clicks_cost(df, True)
+    print(f"{n_rows:>10,} rows | memoized filter click: off {off * 1e6:6.1f} us | on {on * 1e6:6.1f} us")
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"span with rows(): off {span_cost(False) * 1e9:6.0f} ns | on {span_cost(True) * 1e9:6.0f} ns")
+    metrics.reset()
+    with bind_session('bench'):
+        for size in sizes:
+            run(size)
@@ -0,0 +1,42 @@
+# benchmarks/bench_mock_data.py
+#
+# Mock log generator (mock_database.generate_mock_data): rows per second, then normalize_logs and
+# the before-alarm matching (process_alarm_data's hot path) on the generated month, so those can
+# be load-tested at production volume. The generator is seeded: reruns produce the same rows.
+#
+#   python benchmarks/bench_mock_data.py                          # 8 SRMs, 1M and 5M rows
+#   python benchmarks/bench_mock_data.py 20000000                 # custom sizes
+#   SRMS=12 python benchmarks/bench_mock_data.py 1000000          # other SRM count
+
+import sys
+import os
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.mock_database import generate_mock_data
+from src.log_schema import normalize_logs
+from src.filters import match_before_alarm
+
+DEFAULT_SIZES = [1_000_000, 5_000_000]
+START, END = datetime(2025, 1, 1), datetime(2025, 2, 1)
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+def run(n_rows, srms):
+    gen_s, df = timed(generate_mock_data, START, END, num_records=n_rows, seed=0, srms=srms)
+    norm_s, df = timed(normalize_logs, df)
+    match_s, (alarm_df, before_df) = timed(match_before_alarm, df)
+    print(f"{n_rows:>11,} rows, {srms} SRMs | generate: {gen_s:5.2f}s ({n_rows / gen_s / 1e6:4.1f}M rows/s)"
+          f" | normalize: {norm_s:5.2f}s | before-alarm match: {match_s:5.2f}s"
+          f" ({len(alarm_df):,} alarms, {len(before_df):,} matched)")
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    srms = int(os.environ.get('SRMS', 8))
+    for size in sizes:
+        run(size, srms)
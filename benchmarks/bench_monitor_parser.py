@@ -0,0 +1,89 @@
+# benchmarks/bench_monitor_parser.py
+#
+# Per-row MONITORDATA parse (apply + list of dicts + concat, the old load_data path)
+# vs. the vectorized parse_monitor_column. --fuzz first checks that both paths read the same
+# registers out of random text (leading zeros, long values, stray '=' and 'D', non-ASCII).
+#
+#   python benchmarks/bench_monitor_parser.py            # 100k and 1M rows
+#   python benchmarks/bench_monitor_parser.py 250000     # custom sizes
+#   python benchmarks/bench_monitor_parser.py --fuzz 200000
+
+import sys
+import os
+import time
+import random
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.monitor_parser import D_REGISTER_MEANINGS, parse_monitor_data, add_register_columns, parse_monitor_column
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+FUZZ_PIECES = ['D', '=', ' ', '0', '7', '57', '174', '057', '0057', 'D57=', 'D057=', 'D0=', 'D148=',
+               '=D', '==', 'x', 'é', '٣', '\x00', '9' * 19, '0' * 20, '12345678901234567890']
+INT64_MAX = np.iinfo(np.int64).max
+
+def make_frame(n_rows, distinct=5_000, seed=0):
+    rng = random.Random(seed)
+    samples = [
+        " ".join(f"{reg}={rng.randint(0, 40000)}" for reg in D_REGISTER_MEANINGS) + " D200=1 D201=0"
+        for _ in range(distinct)
+    ]
+    monitor = np.resize(np.array(samples, dtype=object), n_rows)
+    monitor[::997] = None  # rows without MONITORDATA
+    return pd.DataFrame({'ASRS': np.resize(np.arange(1, 9), n_rows), 'MONITORDATA': monitor})
+
+def per_row_path(df):
+    parsed_data = df['MONITORDATA'].apply(parse_monitor_data).tolist()
+    monitor_df = pd.DataFrame(parsed_data)
+    if not monitor_df.empty:
+        df = pd.concat([df, monitor_df], axis=1)
+    return df.drop(columns=['MONITORDATA'])
+
+def vectorized_path(df):
+    return add_register_columns(df)
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df.copy())
+    return time.perf_counter() - start, out
+
+def fuzz(n_rows, seed=0):
+    """Random MONITORDATA text through both paths; every row must give the same registers."""
+    rng = random.Random(seed)
+    texts = ["".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 30))) for _ in range(n_rows)]
+    registers = parse_monitor_column(pd.Series(texts))
+    checked = mismatches = 0
+    for i, text in enumerate(texts):
+        expected = parse_monitor_data(text)
+        if any(value > INT64_MAX for value in expected.values()):
+            continue  # can't be stored in the Int64 columns; the vectorized path leaves it empty
+        row = registers.iloc[i]
+        got = {col: int(row[col]) for col in registers.columns if not pd.isna(row[col])}
+        checked += 1
+        if got != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"mismatch {text!r}: per-row {expected} vectorized {got}")
+    print(f"fuzz: {checked:,} rows checked, {mismatches} mismatches")
+    assert mismatches == 0
+
+def main(sizes):
+    print(f"{'rows':>10} {'per-row (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for n_rows in sizes:
+        df = make_frame(n_rows)
+        old_s, old_df = timed(per_row_path, df)
+        new_s, new_df = timed(vectorized_path, df)
+
+        for col in D_REGISTER_MEANINGS.values():
+            assert old_df[col].astype('float64').equals(new_df[col].astype('float64')), col
+
+        print(f"{n_rows:>10,} {old_s:>12.3f} {new_s:>15.3f} {old_s / new_s:>7.1f}x")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ['--fuzz']:
+        fuzz(int(args[1]) if len(args) > 1 else 100_000)
+    else:
+        main([int(a) for a in args] or DEFAULT_SIZES)
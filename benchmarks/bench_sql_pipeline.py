@@ -0,0 +1,57 @@
+# benchmarks/bench_sql_pipeline.py
+#
+# The SQL load path (src/database.py: query building, pd.read_sql in chunks, MONITORDATA parsing,
+# normalize_logs) against the local SQLite stand-in for WCSLOG (src/sqlite_wcslog.py), at
+# production volume and without a SQL Server. Seeds the file on first use (days already present
+# are skipped), then times database.load_data and load_data_stream (not the data_source wrappers,
+# which would share the first load with the second) over growing ranges and reports rows/s
+# with the sql_fetch and parse span totals from src/metrics.py.
+#
+#   python benchmarks/bench_sql_pipeline.py                        # cache/wcslog.db, 1 and 7 days
+#   python benchmarks/bench_sql_pipeline.py 1 3 14                 # custom range lengths in days
+#   WCSLOG_SQLITE=/tmp/wcslog.db EVENTS_PER_DAY=5000 python benchmarks/bench_sql_pipeline.py
+
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import data_source, database, metrics, sqlite_wcslog
+from src.sqlite_wcslog import SQLITE_CONFIG
+from src.state import bind_session, state
+
+DEFAULT_DAYS = [1, 7]
+START = datetime(2025, 1, 1)
+
+def span_seconds(name):
+    return sum(total for (metric, span), (_, total, _) in metrics._histograms.items()
+               if metric == 'span_seconds' and span == name)
+
+def timed_load(load, days):
+    metrics.reset()
+    started = time.perf_counter()
+    load(start_date=START, end_date=START + timedelta(days=days))
+    seconds = time.perf_counter() - started
+    rows = len(state['df_logs'])
+    return seconds, rows, span_seconds('sql_fetch'), span_seconds('parse')
+
+def run(days):
+    for label, load in (('load_data', database.load_data), ('load_data_stream', database.load_data_stream)):
+        seconds, rows, fetch_s, parse_s = timed_load(load, days)
+        print(f"{days:>3} days | {label:>16}: {rows:>10,} rows in {seconds:6.2f}s ({rows / seconds / 1e3:6.0f}k rows/s)"
+              f" | sql_fetch {fetch_s:6.2f}s | parse {parse_s:6.2f}s")
+
+if __name__ == '__main__':
+    days = [int(arg) for arg in sys.argv[1:]] or DEFAULT_DAYS
+    SQLITE_CONFIG['path'] = SQLITE_CONFIG['path'] or os.path.join(os.path.dirname(__file__), '..', 'cache', 'wcslog.db')
+    events_per_day = int(os.environ.get('EVENTS_PER_DAY', SQLITE_CONFIG['events_per_day']))
+    # The load range runs to midnight of its last day inclusive, so seed one day past the longest range
+    sqlite_wcslog.seed(SQLITE_CONFIG['path'], START, START + timedelta(days=max(days) + 1), events_per_day=events_per_day)
+    print(sqlite_wcslog.stats(SQLITE_CONFIG['path']))
+    metrics.METRICS_CONFIG['enabled'] = True
+    data_source.configure(use_mock=False)
+    with bind_session('bench'):
+        for n_days in days:
+            run(n_days)
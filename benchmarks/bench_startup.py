@@ -0,0 +1,73 @@
+# benchmarks/bench_startup.py
+#
+# Cold start of the dashboard, each run in a fresh interpreter: time to `import main`, and time
+# from interpreter start to the first paint of the "กราฟ" tab (setup_page, mock load of the
+# default range, chart view built and sent with page.update) on a stand-in page. Also lists
+# which heavy modules were loaded by then. --eager imports what startup used to import up front
+# (all four views and SQLAlchemy) for comparison.
+#
+#   python benchmarks/bench_startup.py              # 5 runs, lazy and eager
+#   python benchmarks/bench_startup.py 10           # custom number of runs
+
+import sys
+import os
+import json
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY = ['sqlalchemy', 'pyodbc', 'openpyxl', 'matplotlib', 'views.chart_view', 'views.before_alm_view',
+         'views.statistics_view', 'views.asrs_logs_view']
+
+CHILD = r'''
+import json, os, sys, threading, time
+started = time.perf_counter()
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+if EAGER:
+    import sqlalchemy
+    import views.chart_view, views.before_alm_view, views.statistics_view, views.asrs_logs_view
+import main
+imported = time.perf_counter()
+
+class StandInPage:
+    """Just enough of ft.Page for setup_page and the chart tab."""
+    session_id = 'bench'
+    url = 'http://127.0.0.1:7777/'
+    def __init__(self):
+        self.overlay, self.views, self.controls = [], [], []
+        self.painted = threading.Event()
+    def go(self, route):
+        self.on_route_change(route)
+    def update(self, *controls):
+        if 'กราฟ' in getattr(self, 'view_inputs', {}):
+            self.painted.set()
+    def open(self, control):
+        pass
+
+page = StandInPage()
+with main.bind_session(page.session_id):
+    main.init_state()
+    main.setup_page(page)
+page.painted.wait(60)
+painted = time.perf_counter()
+print(json.dumps({'import': imported - started, 'paint': painted - started,
+                  'loaded': [m for m in HEAVY if m in sys.modules]}))
+os._exit(0)
+'''
+
+def run_once(eager):
+    code = f"ROOT = {ROOT!r}\nEAGER = {eager}\nHEAVY = {HEAVY!r}\n" + CHILD
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def report(label, results):
+    imports = statistics.median(r['import'] for r in results)
+    paints = statistics.median(r['paint'] for r in results)
+    print(f"{label:>5} | import main: {imports * 1000:7.0f} ms | first paint of กราฟ: {paints * 1000:7.0f} ms"
+          f" | loaded: {', '.join(results[-1]['loaded']) or '-'}")
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for label, eager in (('lazy', False), ('eager', True)):
+        report(label, [run_once(eager) for _ in range(runs)])
@@ -1,27 +1,59 @@
 import flet as ft
 from datetime import datetime, timedelta
-from src.state import state
-from views.asrs_logs_view import create_data_table_view as create_asrs_logs_view
-from views.statistics_view import create_statistics_view
-from views.chart_view import create_chart_view
-from views.before_alm_view import create_before_alarm_view
-from src.ui_components import on_date_change, on_end_date_change
-import threading
+from src.state import state, bind_session, end_session
+from src import tasks
+from src.metrics import span
+from src.profiling import action
+from src import data_source
+import importlib
+from src.ui_components import on_date_change, on_end_date_change, run_progressive_load, create_load_progress
 
 use_mock_data = True  # Set to True to use mock data for testing
 
-if use_mock_data == True:
-    from src.mock_database import load_data
-else:
-    from src.database import load_data
+# Views and ui_components read logs through src.data_source, which follows this flag
+data_source.configure(use_mock=use_mock_data)
 
 
-# Initialize state variables
-state['selected_date'] = datetime.now()
-state['end_date'] = state['selected_date'] + timedelta(days=1)  # Default end date is one day after selected date
-state['logged_in'] = True  # Set to True by default since we're removing login
+def init_state():
+    # Initialize state variables (kept if already set: ui_components re-imports this module as "main")
+    state['selected_date'] = state.get('selected_date') or datetime.now()
+    state['end_date'] = state.get('end_date') or state['selected_date'] + timedelta(days=1)  # Default end date is one day after selected date
+    state['logged_in'] = True  # Set to True by default since we're removing login
 
-def update_view(page, tab_name=None):
+init_state()
+
+# Tab -> (view module, builder function). Modules are imported when their tab is first shown;
+# each declares VIEW_INPUTS, the state keys it is built from.
+TAB_VIEWS = {
+    "กราฟ": ("views.chart_view", "create_chart_view"),
+    "ก่อนเกิด Alarm": ("views.before_alm_view", "create_before_alarm_view"),
+    "สรุป Alarm": ("views.statistics_view", "create_statistics_view"),
+    "รายละเอียด": ("views.asrs_logs_view", "create_data_table_view"),
+}
+
+def view_module(tab_name):
+    return importlib.import_module(TAB_VIEWS[tab_name][0])
+
+def view_inputs(tab_name):
+    return tuple(state.get(key) for key in view_module(tab_name).VIEW_INPUTS)
+
+def stale_tabs(page):
+    """Tabs whose inputs changed since they were built, or never built (rebuilt when shown)."""
+    built = getattr(page, 'view_inputs', {})
+    return [name for name in TAB_VIEWS if name not in built or built[name] != view_inputs(name)]
+
+def record_view_inputs(page, tab_name):
+    """Mark tab_name as built from the current state (for views that redraw themselves in place)."""
+    if not hasattr(page, 'view_inputs'):
+        page.view_inputs = {}
+        page.view_stats = {'rebuilds': 0, 'skipped': 0}
+    page.view_inputs[tab_name] = view_inputs(tab_name)
+
+def update_view(page, tab_name=None, force=False):
+    """
+    Rebuild tab_name (default: the visible tab) if its VIEW_INPUTS changed since it was last built,
+    or always with force. Hidden tabs are left stale and rebuilt by on_tab_change when shown.
+    """
     if hasattr(page, 'start_date_text') and page.start_date_text:
         page.start_date_text.value = f"Start: {state['selected_date'].strftime('%Y-%m-%d')}"
     
@@ -29,44 +61,44 @@ def update_view(page, tab_name=None):
         end_date_str = state['end_date'].strftime('%Y-%m-%d') if state.get('end_date') else "Not set"
         page.end_date_text.value = f"End: {end_date_str}"
     
-    if tab_name is None or tab_name == "รายละเอียด":
-        page.tabs["รายละเอียด"].content = ft.Container(
-            content=create_asrs_logs_view(page), 
-            expand=True
-        )
-        
-    if tab_name is None or tab_name == "ก่อนเกิด Alarm":
-        page.tabs["ก่อนเกิด Alarm"].content = ft.Container(
-            content=create_before_alarm_view(page), 
-            expand=True
-        )
-        
-    if tab_name is None or tab_name == "สรุป Alarm":
-        page.tabs["สรุป Alarm"].content = ft.Container(
-            content=create_statistics_view(page), 
-            expand=True
-        )
+    if tab_name is None:
+        tab_name = list(TAB_VIEWS)[page.tabs_control.selected_index]
+    if not hasattr(page, 'view_inputs'):
+        page.view_inputs = {}
+        page.view_stats = {'rebuilds': 0, 'skipped': 0}
     
-    if tab_name is None or tab_name == "กราฟ":
-        page.tabs["กราฟ"].content = ft.Container(
-            content=create_chart_view(page),
+    inputs = view_inputs(tab_name)
+    rebuilt = force or page.view_inputs.get(tab_name) != inputs
+    if rebuilt:
+        create_view = getattr(view_module(tab_name), TAB_VIEWS[tab_name][1])
+        with span(create_view.__name__) as build:
+            content = create_view(page)
+            build.controls(content)
+        page.tabs[tab_name].content = ft.Container(
+            content=content,
             expand=True
         )
+        # After building: views may normalize their inputs (e.g. clamp page_logs)
+        record_view_inputs(page, tab_name)
+        page.view_stats['rebuilds'] += 1
+    else:
+        page.view_stats['skipped'] += 1
+    print(f"update_view: {tab_name} {'rebuilt' if rebuilt else 'up to date'}, stale: {stale_tabs(page)}, "
+          f"rebuilds so far: {page.view_stats['rebuilds']}")
     
-    page.update()
+    with span('page_update'):
+        page.update()
 
 def load_data_async(page):
-    page.splash.visible = True
-    page.update()
+    def on_done(ok):
+        current_tab = page.tabs_control.selected_index
+        tab_names = ["กราฟ", "ก่อนเกิด Alarm", "สรุป Alarm", "รายละเอียด"] 
+        update_view(page, tab_names[current_tab])
 
-    load_data(start_date=state['selected_date'], end_date=state['end_date'])
-    
-    page.splash.visible = False
-    
-    current_tab = page.tabs_control.selected_index
-    tab_names = ["กราฟ", "ก่อนเกิด Alarm", "สรุป Alarm", "รายละเอียด"] 
-    update_view(page, tab_names[current_tab])
+    # Chunked load: the details tab shows page 1 after the first chunk, the rest streams in
+    run_progressive_load(page, state['selected_date'], state['end_date'], on_done)
 
+@action('tab_switch')
 def on_tab_change(e, page):
     tab_index = e.control.selected_index
     tab_names = ["กราฟ", "ก่อนเกิด Alarm", "สรุป Alarm", "รายละเอียด"]
@@ -135,6 +167,7 @@ def on_route_change(route, page):
     page.tabs_control = tabs_control  
     
     main_content = ft.Column([
+        create_load_progress(page),
         ft.Container(
             content=tabs_control,
             expand=True,
@@ -152,10 +185,22 @@ def on_route_change(route, page):
         )
     )
 
-    threading.Thread(target=lambda: load_data_async(page)).start()
+    # The load itself runs on the task pool under 'load' (run_progressive_load)
+    load_data_async(page)
     page.update()
 
 def main(page):
+    # Each browser session gets its own filters, dates and paging; loaded data is shared by range
+    with bind_session(page.session_id):
+        init_state()
+        setup_page(page)
+    page.on_close = lambda e: close_session(page.session_id)
+
+def close_session(session_id):
+    tasks.forget_session(session_id)
+    end_session(session_id)
+
+def setup_page(page):
     page.title = "ASRS Miniload Dashboard"
     page.theme_mode = ft.ThemeMode.LIGHT
     
@@ -186,4 +231,6 @@ def main(page):
     page.go("/")
 
 if __name__ == "__main__":
-    ft.app(target=main, view=ft.AppView.WEB_BROWSER, host="0.0.0.0", port=7777)
+    # Flet web app plus the /download route for exports, on one port
+    from src.web_app import serve
+    serve(main, host="0.0.0.0", port=7777)
@@ -0,0 +1,64 @@
+import threading
+import time
+from datetime import datetime
+from src.query_builder import ALARM_PLCCODE_MIN, as_value_list
+
+# Summaries of ranges that end in the past never change; ranges still open are re-queried after this
+OPEN_RANGE_TTL = 60  # seconds
+MAX_CACHED_SUMMARIES = 64
+
+_summary_cache = {}
+_summary_lock = threading.Lock()
+
+def _cache_key(query):
+    srms = as_value_list(query.get('srms'))
+    from src import data_source
+    return (data_source.use_mock_data, query.get('start_date'), query.get('end_date'),
+            query.get('end_inclusive', True), tuple(sorted(srms)) if srms else None)
+
+def _fresh(entry, query, now):
+    end_date = query.get('end_date')
+    if end_date is not None and end_date < datetime.now():
+        return True
+    return now - entry['computed_at'] < OPEN_RANGE_TTL
+
+def alarm_summary(**query):
+    """
+    Alarm counts for the statistics tab and its export, grouped in SQL instead of pandas:
+      total_rows   - rows matching the date/SRM predicates
+      total_alarms - rows with PLCCODE >= ALARM_PLCCODE_MIN
+      by_plccode   - DataFrame [PLCCODE, Count], most frequent first
+      by_srm       - DataFrame [ASRS, Count], most frequent first
+    query: load_range(...) bounds plus srms. Results are cached per (range, SRMs).
+    """
+    from src.data_source import count_logs, count_logs_by
+
+    key = _cache_key(query)
+    now = time.monotonic()
+    with _summary_lock:
+        entry = _summary_cache.get(key)
+        if entry is not None and _fresh(entry, query, now):
+            return entry['summary']
+
+    by_plccode = count_logs_by('PLCCODE', plccode_min=ALARM_PLCCODE_MIN, **query)
+    by_plccode = by_plccode.sort_values(['Count', 'PLCCODE'], ascending=[False, True], ignore_index=True)
+    by_srm = count_logs_by('ASRS', plccode_min=ALARM_PLCCODE_MIN, **query)
+    by_srm = by_srm.sort_values(['Count', 'ASRS'], ascending=[False, True], ignore_index=True)
+    summary = {
+        'total_rows': count_logs(**query),
+        'total_alarms': int(by_plccode['Count'].sum()),
+        'by_plccode': by_plccode,
+        'by_srm': by_srm,
+    }
+
+    with _summary_lock:
+        if len(_summary_cache) >= MAX_CACHED_SUMMARIES:
+            # Drop the oldest entry (dicts keep insertion order)
+            _summary_cache.pop(next(iter(_summary_cache)))
+        _summary_cache.pop(key, None)
+        _summary_cache[key] = {'summary': summary, 'computed_at': now}
+    return summary
+
+def clear_summary_cache():
+    with _summary_lock:
+        _summary_cache.clear()
@@ -0,0 +1,70 @@
+# Single entry point for reading ASRS logs.
+# main.py picks the backend once (real SQL Server or the mock generator); views and
+# ui_components call these wrappers so they always hit the same backend.
+#
+# Full loads of a date range go through src/dataset_cache.py first: a range another session has
+# loaded (or is loading) is shared and only brought up to date with a tail refresh.
+
+from src import dataset_cache
+from src.state import state, use_dataset
+
+use_mock_data = True
+
+def configure(use_mock):
+    global use_mock_data
+    use_mock_data = use_mock
+
+def backend():
+    if use_mock_data:
+        from src import mock_database as module
+    else:
+        from src import database as module
+    return module
+
+def _share_loaded(date_range, cancel_event=None):
+    """Bind the session to date_range if another session has it loaded completely (waiting for a load in flight)."""
+    if not dataset_cache.wait_for_load(date_range, cancel_event) or not dataset_cache.is_complete(date_range):
+        return False
+    use_dataset(date_range)
+    state['date_range'] = date_range
+    print(f"Sharing loaded data for range {date_range[0]:%Y-%m-%d} to {date_range[1]:%Y-%m-%d}")
+    return True
+
+def load_data(start_date=None, end_date=None):
+    if start_date is None or end_date is None:
+        return backend().load_data(start_date=start_date, end_date=end_date)
+    if _share_loaded((start_date, end_date)):
+        return backend().load_data_tail(start_date, end_date)
+    with dataset_cache.loading((start_date, end_date)):
+        return backend().load_data(start_date=start_date, end_date=end_date)
+
+def load_data_stream(start_date, end_date, on_progress=None, cancel_event=None):
+    """Chunked load into state['df_logs'] (see database.load_data_stream)."""
+    if _share_loaded((start_date, end_date), cancel_event):
+        return backend().load_data_tail(start_date, end_date)
+    with dataset_cache.loading((start_date, end_date)):
+        return backend().load_data_stream(start_date, end_date, on_progress=on_progress, cancel_event=cancel_event)
+
+def load_data_tail(start_date, end_date):
+    """Prepend only rows newer than the loaded frame (see database.load_data_tail)."""
+    return backend().load_data_tail(start_date, end_date)
+
+def load_range(start_date, end_date):
+    """Exact CDATE bounds load_data uses for (start_date, end_date), as fetch_logs keyword arguments."""
+    return backend().load_range(start_date, end_date)
+
+def fetch_logs(**query):
+    """Projected, filtered LogMnpAsrs rows (see query_builder.build_logs_query for the arguments)."""
+    return backend().fetch_logs(**query)
+
+def count_logs_by(group_by, **query):
+    """Row counts per ASRS or PLCCODE, grouped on the server: DataFrame [group_by, 'Count']."""
+    return backend().count_logs_by(group_by, **query)
+
+def count_logs(**query):
+    """Number of LogMnpAsrs rows matching the same arguments as fetch_logs (columns are ignored)."""
+    return backend().count_logs(**query)
+
+def fetch_page(key=None, offset=0, limit=100, **query):
+    """One keyset page in page order (see query_builder.build_page_query)."""
+    return backend().fetch_page(key=key, offset=offset, limit=limit, **query)
@@ -1,8 +1,15 @@
 import pandas as pd
-import re
-from sqlalchemy import create_engine
 from datetime import datetime, timedelta
-from src.state import state
+from src.state import state, use_dataset
+from src.db_engine import get_engine, pooled_connection
+from src.query_builder import (build_logs_query, build_count_query, build_group_count_query, build_page_query,
+                               LOG_COLUMNS)
+from src.streaming import LOAD_CHUNK_ROWS, publish_chunks
+from src.incremental import publish_logs, tail_start, publish_tail
+from src.log_schema import normalize_logs, concat_logs
+from src.day_cache import cache_available, plan_range, plan_rows, cached_chunks
+from src.metrics import span
+from src import sqlite_wcslog
 
 # Configuration
 DB_CONFIG = {
@@ -14,96 +21,92 @@ DB_CONFIG = {
 }
 
 def get_connection_string():
+    # SQLITE_CONFIG['path'] (WCSLOG_SQLITE) points every read at the local stand-in instead
+    if sqlite_wcslog.enabled():
+        return sqlite_wcslog.connection_url()
     return f"mssql+pyodbc://{DB_CONFIG['username']}:{DB_CONFIG['password']}@{DB_CONFIG['server']}/{DB_CONFIG['database']}?driver={DB_CONFIG['driver'].replace(' ', '+')}&TrustServerCertificate=yes"
 
-# Dictionary mapping D registers to their meanings
-D_REGISTER_MEANINGS = {
-    'D174': 'Command_X_Pos (D174)',
-    'D57':  'X_Distance_mm (D57) ',
-    'D130': 'Start_Bank (D130)',
-    'D131': 'Start_Pos_mm (D131)',
-    'D133': 'Start_Level_mm (D133)',
-    'D134': 'End_Bank (D134)',
-    'D135': 'End_Position_mm (D135)',
-    'D137': 'End_Level_mm (D137)',
-    'D138': 'Pallet_ID (D138)',
-    'D140': 'Present_Bay_Arm1 (D140)',
-    'D145': 'Present_Level (D145)',
-    'D146': 'Status_Arm1 (D146)',
-    'D147': 'Status (D147)',
-    'D148': 'Command Machine (D148)',
-}
+def get_db_engine():
+    """Shared, pooled engine for the WCSLOG server (created on first use, reused by every load)."""
+    return get_engine(get_connection_string())
+
+def _target():
+    """dialect/table arguments of the query builders for the configured database."""
+    return sqlite_wcslog.query_target() if sqlite_wcslog.enabled() else {}
+
+def _day(value):
+    """Midnight of the given date/datetime (the range filters have always compared whole days)."""
+    return datetime(value.year, value.month, value.day)
+
+def _clean_logs(df_logs):
+    """Basic data cleaning shared by every LogMnpAsrs read; only touches the columns that were selected."""
+    # Registers parsed from MONITORDATA (dropped afterwards), then the compact schema (log_schema.py)
+    return normalize_logs(df_logs)
+
+def load_range(start_date, end_date):
+    """CDATE bounds load_data uses for a (start_date, end_date) pair, as fetch_logs keyword arguments."""
+    return {'start_date': _day(start_date), 'end_date': _day(end_date), 'end_inclusive': True}
+
+def fetch_logs(columns=None, **filters):
+    """
+    Read LogMnpAsrs with every predicate pushed down to SQL Server and only `columns` selected
+    (see query_builder.build_where for the filters). Returns the cleaned DataFrame; unlike
+    load_data it does not touch state.
+    """
+    statement, params = build_logs_query(columns=columns, **_target(), **filters)
+    with pooled_connection(get_db_engine()) as conn, span('sql_fetch') as fetch:
+        df_logs = pd.read_sql(statement, conn, params=params)
+        fetch.rows(len(df_logs))
+    return _clean_logs(df_logs)
+
+def count_logs(columns=None, **filters):
+    """COUNT(*) of the rows fetch_logs would return for the same filters."""
+    statement, params = build_count_query(**_target(), **filters)
+    with pooled_connection(get_db_engine()) as conn:
+        return int(conn.execute(statement, params).scalar() or 0)
+
+def fetch_page(key=None, offset=0, limit=100, columns=None, **filters):
+    """
+    One keyset page of LogMnpAsrs (query_builder.build_page_query): only `limit` rows cross the
+    wire and get parsed. Cleaned like fetch_logs; ordered by query_builder.page_order.
+    """
+    statement, params = build_page_query(key=key, offset=offset, limit=limit, columns=columns, **_target(), **filters)
+    with pooled_connection(get_db_engine()) as conn, span('sql_fetch') as fetch:
+        df_logs = pd.read_sql(statement, conn, params=params)
+        fetch.rows(len(df_logs))
+    return _clean_logs(df_logs)
 
-def parse_monitor_data(monitor_data):
-    """Parse the MONITORDATA field and extract D register values."""
-    if pd.isna(monitor_data) or not isinstance(monitor_data, str):
-        return {}
-    
-    # Regular expression to extract D register values
-    pattern = r'D(\d+)=(\d+)'
-    matches = re.findall(pattern, monitor_data)
-    
-    # Create dictionary of D register values
-    d_values = {}
-    for register, value in matches:
-        d_key = f'D{register}'
-        if d_key in D_REGISTER_MEANINGS:
-            # Use the meaningful name as the key
-            d_values[D_REGISTER_MEANINGS[d_key]] = int(value.strip())
-    
-    return d_values
+def count_logs_by(group_by, columns=None, **filters):
+    """Row counts per ASRS or PLCCODE computed by SQL Server: DataFrame [group_by, 'Count']."""
+    statement, params = build_group_count_query(group_by, **_target(), **filters)
+    with pooled_connection(get_db_engine()) as conn, span('sql_fetch'):
+        counts = pd.read_sql(statement, conn, params=params)
+    counts = counts.dropna(subset=[group_by])
+    return counts.astype({group_by: int, 'Count': int})
 
 def load_data(start_date=None, end_date=None):
     try:
-        engine = create_engine(get_connection_string())
-        
         # Determine date filter based on parameters
         if start_date is not None and end_date is not None:
-            # Format dates for SQL query
-            start_date_str = start_date.strftime('%Y-%m-%d')
-            end_date_str = end_date.strftime('%Y-%m-%d')
-            logs_date_filter = f"WHERE [CDATE] >= '{start_date_str}' AND [CDATE] <= '{end_date_str}'"
+            query_range = load_range(start_date, end_date)
             
             # Store the date range in state for other components to use
             state['date_range'] = (start_date, end_date)
-            print(f"Loading data for date range: {start_date_str} to {end_date_str}")
+            print(f"Loading data for date range: {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
             
         elif 'selected_date' in state and state['selected_date'] is not None:
-            selected_date = state['selected_date']
-            next_day = selected_date + timedelta(days=1)
-            
-            # Format dates for SQL query
-            start_date_str = selected_date.strftime('%Y-%m-%d')
-            end_date_str = next_day.strftime('%Y-%m-%d')
-            
-            logs_date_filter = f"WHERE [CDATE] >= '{start_date_str}' AND [CDATE] < '{end_date_str}'"
+            selected_date = _day(state['selected_date'])
+            query_range = {'start_date': selected_date, 'end_date': selected_date + timedelta(days=1),
+                           'end_inclusive': False}
         else:
-            logs_date_filter = ""
-        
-        logs_query = f"""
-            SELECT [ASRS],[BARCODE],[CHKTYPE],[MSGLOG],[CDATE],[MSGTYPE],[PLCCODE],[MONITORDATA]
-            FROM [WCSLOG].[dbo].[LogMnpAsrs]
-            {logs_date_filter}
-            ORDER BY CDATE DESC
-        """
-        
-        df_logs = pd.read_sql(logs_query, engine)
-        
-        # Basic data cleaning
-        df_logs['ASRS'] = df_logs['ASRS'].str.strip().astype(int, errors='ignore')
-        df_logs['PLCCODE'] = df_logs['PLCCODE'].str.strip().astype(int, errors='ignore')
-        df_logs['CDATE'] = pd.to_datetime(df_logs['CDATE'])
-        
-        parsed_data = df_logs['MONITORDATA'].apply(parse_monitor_data).tolist()
-        monitor_df = pd.DataFrame(parsed_data)
-        
-        if not monitor_df.empty:
-            df_logs = pd.concat([df_logs, monitor_df], axis=1)
+            query_range = {}
         
-        if 'MONITORDATA' in df_logs.columns:
-            df_logs = df_logs.drop(columns=['MONITORDATA'])
+        chunks, _ = _range_chunks(query_range)
+        df_logs = concat_logs(list(chunks))
         
-        state['df_logs'] = df_logs
+        loaded_range = (start_date, end_date) if start_date is not None and end_date is not None else None
+        use_dataset(loaded_range)
+        publish_logs(loaded_range, df_logs)
         
         # Determine date info for logging
         if start_date is not None and end_date is not None:
@@ -118,4 +121,90 @@ def load_data(start_date=None, end_date=None):
         return True
     except Exception as e:
         print(f"Error loading data: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+def _read_chunks(statement, params, chunksize):
+    """Parsed LogMnpAsrs chunks as they arrive from the server (always at least one, possibly empty)."""
+    with pooled_connection(get_db_engine()) as conn:
+        empty = True
+        chunks = iter(pd.read_sql(statement, conn, params=params, chunksize=chunksize))
+        while True:
+            # Each chunk is one fetch span; parsing it happens outside (the 'parse' span)
+            with span('sql_fetch') as fetch:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    fetch.rows(len(chunk))
+            if chunk is None:
+                break
+            empty = False
+            yield _clean_logs(chunk)
+        if empty:
+            yield _clean_logs(pd.DataFrame(columns=LOG_COLUMNS))
+
+def _range_chunks(query_range, chunksize=LOAD_CHUNK_ROWS):
+    """
+    Cleaned chunks (newest first) for a load_range-style query. With the day cache available,
+    closed days come from disk and only missing days and the open day are read from SQL.
+    Returns (chunks, plan); plan is None when the whole range is read from SQL.
+    """
+    # The day cache holds SQL Server's days; the SQLite stand-in is always read directly
+    if not query_range or not cache_available() or sqlite_wcslog.enabled():
+        statement, params = build_logs_query(**_target(), **query_range)
+        return _read_chunks(statement, params, chunksize), None
+
+    def read_piece(lo, hi, hi_inclusive):
+        statement, params = build_logs_query(start_date=lo, end_date=hi, end_inclusive=hi_inclusive, **_target())
+        return _read_chunks(statement, params, chunksize)
+
+    plan = plan_range(query_range['start_date'], query_range['end_date'], query_range.get('end_inclusive', True))
+    return cached_chunks(plan, read_piece), plan
+
+def load_data_stream(start_date, end_date, on_progress=None, cancel_event=None, chunksize=LOAD_CHUNK_ROWS):
+    """
+    Chunked version of load_data: rows arrive newest first and state['df_logs'] is published as
+    they are parsed, so the first page can render before the range has finished loading.
+    on_progress(rows_loaded, total_rows, published) runs after each chunk. Returns False on error
+    or if cancel_event is set (e.g. the user picked another range mid-load).
+    """
+    try:
+        query_range = load_range(start_date, end_date)
+        print(f"Streaming data for date range: {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
+        
+        chunks, plan = _range_chunks(query_range, chunksize)
+        if plan is None:
+            total_rows = count_logs(**query_range)
+        else:
+            total_rows = plan_rows(plan, lambda lo, hi, inclusive: count_logs(start_date=lo, end_date=hi, end_inclusive=inclusive))
+        try:
+            df_logs = publish_chunks(chunks, total_rows, (start_date, end_date), on_progress, cancel_event)
+        finally:
+            # Closing the generator releases the pooled connection even when we stop early
+            chunks.close()
+        
+        if df_logs is None:
+            print(f"Load cancelled for range {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
+            return False
+        print(f"Data loaded for range {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}. Data Row: {len(df_logs)}")
+        return True
+    except Exception as e:
+        print(f"Error loading data: {str(e)}")
+        return False
+
+def load_data_tail(start_date, end_date):
+    """
+    Incremental refresh of an already loaded range: only rows at or after the newest loaded
+    CDATE (minus incremental.TAIL_OVERLAP) are read, parsed and put in front of state['df_logs'].
+    Falls back to load_data when (start_date, end_date) isn't the range that is fully loaded.
+    """
+    since = tail_start((start_date, end_date))
+    if since is None:
+        return load_data(start_date=start_date, end_date=end_date)
+    try:
+        query_range = load_range(start_date, end_date)
+        query_range['start_date'] = max(since, query_range['start_date'])
+        added = publish_tail(fetch_logs(**query_range), since)
+        print(f"Tail refresh for range {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}: {added} new rows. Data Row: {len(state['df_logs'])}")
+        return True
+    except Exception as e:
+        print(f"Error refreshing data: {str(e)}")
+        return False
@@ -0,0 +1,107 @@
+"""
+Process-wide cache of loaded log frames, shared between sessions.
+
+Entries are keyed by the loaded date range and reference-counted: each session holds one
+reference, to the range it shows (state.use_dataset). Sessions on the same range read the same
+DataFrame; when the last one moves to another range or closes, the entry and its frame are
+dropped. A full load of a range records itself here, so a second session asking for the same
+range waits for it and shares the result instead of loading it again.
+
+An entry's data is an immutable Snapshot. Loaders never modify a published frame; they publish a
+new snapshot, which gets the next version from one process-wide counter and replaces the old one
+in a single assignment. Readers take snapshot(key) once and use it throughout without locks, and
+anything derived from the data is keyed on snapshot.version, so results computed from a replaced
+snapshot are recognised as stale.
+"""
+import itertools
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+Snapshot = namedtuple('Snapshot', ['version', 'df_logs', 'tail_watermark'])
+EMPTY = Snapshot(0, None, None)
+
+_versions = itertools.count(1)
+_entries = {}
+# Writers only; re-entrant because publish_tail reads and replaces an entry's frame under it
+lock = threading.RLock()
+
+def _entry(key):
+    entry = _entries.get(key)
+    if entry is None:
+        entry = _entries[key] = {'refs': 0, 'snapshot': EMPTY, 'loading': None}
+    return entry
+
+def acquire(key):
+    with lock:
+        _entry(key)['refs'] += 1
+
+def release(key):
+    if key is None:
+        return
+    with lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return
+        entry['refs'] -= 1
+        if entry['refs'] <= 0 and entry['loading'] is None:
+            del _entries[key]
+
+def snapshot(key):
+    """Current snapshot of key (EMPTY if nothing is loaded). Lock-free: one dict read."""
+    entry = _entries.get(key)
+    return EMPTY if entry is None else entry['snapshot']
+
+def publish(key, **fields):
+    """
+    Replace key's snapshot with a copy that has `fields` (df_logs, tail_watermark) changed.
+    A new frame gets a new version; a watermark change alone keeps the version (same data).
+    """
+    with lock:
+        entry = _entry(key)
+        current = entry['snapshot']
+        version = next(_versions) if 'df_logs' in fields else current.version
+        entry['snapshot'] = current._replace(version=version, **fields)
+        return entry['snapshot']
+
+def is_complete(key):
+    """Whether key holds a complete load (one that incremental refreshes can extend)."""
+    return snapshot(key).tail_watermark is not None
+
+@contextmanager
+def loading(key):
+    """Mark a full load of key as running, for wait_for_load in other sessions."""
+    done = threading.Event()
+    with lock:
+        _entry(key)['loading'] = done
+    try:
+        yield
+    finally:
+        with lock:
+            entry = _entries.get(key)
+            if entry is not None and entry['loading'] is done:
+                entry['loading'] = None
+                if entry['refs'] <= 0:
+                    del _entries[key]
+        done.set()
+
+def wait_for_load(key, cancel_event=None, poll=0.2):
+    """Block while another session loads key. False if cancel_event was set meanwhile."""
+    entry = _entries.get(key)
+    done = None if entry is None else entry['loading']
+    while done is not None and not done.wait(poll):
+        if cancel_event is not None and cancel_event.is_set():
+            return False
+    return True
+
+def stats():
+    """{'datasets', 'sessions', 'rows', 'bytes'} over the cached frames (bytes counts each frame once)."""
+    with lock:
+        entries = list(_entries.values())
+    frames = [e['snapshot'].df_logs for e in entries if e['snapshot'].df_logs is not None]
+    return {
+        'datasets': len(entries),
+        'sessions': sum(max(e['refs'], 0) for e in entries),
+        'rows': sum(len(df) for df in frames),
+        'bytes': sum(int(df.memory_usage(deep=True).sum()) for df in frames),
+    }
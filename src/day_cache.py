@@ -0,0 +1,296 @@
+"""
+Day-partitioned on-disk cache for LogMnpAsrs.
+
+Closed days never change on the server, so each one is stored once as a Parquet file holding the
+cleaned frame (registers parsed, MONITORDATA dropped). Range loads read cached days from disk and
+only go to SQL Server for missing days and for the day that is still open. Partitions live under
+v<schema>/<target>/, where <target> hashes DB_CONFIG's server and database, so pointing the app at
+another database never reads the old one's days.
+
+Pre-warm from the command line:
+    python -m src.day_cache warm 2025-01-01 2025-01-31
+    python -m src.day_cache stats
+    python -m src.day_cache clear [START END]
+"""
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+from src.log_schema import concat_logs
+
+CACHE_CONFIG = {
+    'enabled': True,
+    'directory': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'logs'),
+    'max_bytes': 2 * 1024 ** 3,           # LRU eviction above this total size
+    'close_after': timedelta(hours=1),    # a day is "closed" this long after its midnight (late writes)
+}
+
+# Bump when the cached frame layout changes (parser, dtypes) so old partitions are never read
+CACHE_SCHEMA_VERSION = 3
+
+_cache_lock = threading.Lock()
+
+def cache_available():
+    if not CACHE_CONFIG['enabled']:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _version_directory():
+    return os.path.join(CACHE_CONFIG['directory'], f"v{CACHE_SCHEMA_VERSION}")
+
+def target_key():
+    """Short hash of the server and database the partitions come from."""
+    from src.database import DB_CONFIG
+    target = f"{DB_CONFIG['server']}/{DB_CONFIG['database']}".lower()
+    return hashlib.sha1(target.encode('utf-8')).hexdigest()[:12]
+
+def _directory():
+    return os.path.join(_version_directory(), target_key())
+
+def _day(value):
+    return datetime(value.year, value.month, value.day)
+
+def day_path(day):
+    return os.path.join(_directory(), f"{day:%Y-%m-%d}.parquet")
+
+def is_closed(day, now=None):
+    """True once no more rows can arrive for `day`."""
+    now = now or datetime.now()
+    return _day(day) + timedelta(days=1) + CACHE_CONFIG['close_after'] <= now
+
+def read_day(day):
+    """Cached frame for `day`, or None. Reading a partition marks it as recently used."""
+    path = day_path(day)
+    if not cache_available() or not os.path.exists(path):
+        return None
+    try:
+        df_logs = pd.read_parquet(path)
+    except Exception as e:
+        print(f"Dropping unreadable cache partition {path}: {str(e)}")
+        _remove(path)
+        return None
+    os.utime(path, None)
+    # Partitions are written from normalized frames only
+    df_logs.attrs['normalized'] = True
+    return df_logs
+
+def write_day(day, df_logs):
+    """Store a closed day's cleaned frame, then evict least recently used partitions over max_bytes."""
+    if not cache_available() or not is_closed(day):
+        return False
+    path = day_path(day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df_logs.reset_index(drop=True).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Could not cache {day:%Y-%m-%d}: {str(e)}")
+        _remove(tmp_path)
+        return False
+    evict()
+    return True
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _partitions(all_targets=False):
+    """(mtime, size, path) of the current target's partitions, or of every target's."""
+    directory = _version_directory() if all_targets else _directory()
+    partitions = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            partitions.append((stat.st_mtime, stat.st_size, path))
+        if not all_targets:
+            break
+    return partitions
+
+def evict(max_bytes=None):
+    """
+    Delete least recently used partitions, of any target, until the cache fits in max_bytes.
+    Returns files removed.
+    """
+    max_bytes = CACHE_CONFIG['max_bytes'] if max_bytes is None else max_bytes
+    with _cache_lock:
+        partitions = sorted(_partitions(all_targets=True))
+        total = sum(size for _, size, _ in partitions)
+        removed = 0
+        for _, size, path in partitions:
+            if total <= max_bytes:
+                break
+            _remove(path)
+            total -= size
+            removed += 1
+    return removed
+
+def invalidate(start_date=None, end_date=None):
+    """Drop cached days in [start_date, end_date] (both None: the whole cache). Returns files removed."""
+    removed = 0
+    with _cache_lock:
+        for _, _, path in _partitions():
+            day = datetime.strptime(os.path.basename(path)[:10], '%Y-%m-%d')
+            if start_date is not None and day < _day(start_date):
+                continue
+            if end_date is not None and day > _day(end_date):
+                continue
+            _remove(path)
+            removed += 1
+    return removed
+
+def cache_stats():
+    partitions = _partitions()
+    days = sorted(os.path.basename(path)[:10] for _, _, path in partitions)
+    return {
+        'directory': _directory(),
+        'days': len(partitions),
+        'bytes': sum(size for _, size, _ in partitions),
+        'max_bytes': CACHE_CONFIG['max_bytes'],
+        'first_day': days[0] if days else None,
+        'last_day': days[-1] if days else None,
+    }
+
+def split_days(start_date, end_date, end_inclusive=True):
+    """
+    Split CDATE bounds into per-day pieces, newest first: (day, lo, hi, hi_inclusive, whole_day).
+    """
+    pieces = []
+    day = _day(end_date)
+    while day >= _day(start_date):
+        next_day = day + timedelta(days=1)
+        lo = max(start_date, day)
+        if end_date < next_day:
+            hi, hi_inclusive = end_date, end_inclusive
+        else:
+            hi, hi_inclusive = next_day, False
+        if lo < hi or (lo == hi and hi_inclusive):
+            whole_day = lo == day and hi == next_day and not hi_inclusive
+            pieces.append((day, lo, hi, hi_inclusive, whole_day))
+        day -= timedelta(days=1)
+    return pieces
+
+def _slice(df_logs, lo, hi, hi_inclusive):
+    upper = (df_logs['CDATE'] <= hi) if hi_inclusive else (df_logs['CDATE'] < hi)
+    return df_logs[(df_logs['CDATE'] >= lo) & upper].reset_index(drop=True)
+
+def plan_range(start_date, end_date, end_inclusive=True):
+    """
+    Per-day plan for a range load, newest first: (day, lo, hi, hi_inclusive, whole_day, cached).
+    Days that are only partly covered still use the cached partition, sliced in pandas.
+    """
+    available = cache_available()
+    return [(day, lo, hi, hi_inclusive, whole_day, available and is_closed(day) and os.path.exists(day_path(day)))
+            for day, lo, hi, hi_inclusive, whole_day in split_days(start_date, end_date, end_inclusive)]
+
+def _read_piece_from_cache(day, lo, hi, hi_inclusive, whole_day):
+    df_logs = read_day(day)
+    if df_logs is not None and not whole_day:
+        df_logs = _slice(df_logs, lo, hi, hi_inclusive)
+    return df_logs
+
+def cached_chunks(plan, read_piece):
+    """
+    Frames for a plan from plan_range, newest first. read_piece(lo, hi, hi_inclusive) yields
+    cleaned chunks from SQL; whole closed days read that way are written to the cache.
+    Empty days are skipped; an empty frame is yielded only if the whole range is empty.
+    """
+    empty = None
+    yielded = False
+    for day, lo, hi, hi_inclusive, whole_day, cached in plan:
+        df_logs = _read_piece_from_cache(day, lo, hi, hi_inclusive, whole_day) if cached else None
+        if df_logs is not None:
+            if len(df_logs):
+                yielded = True
+                yield df_logs
+            elif empty is None:
+                empty = df_logs
+            continue
+
+        parts = []
+        for chunk in read_piece(lo, hi, hi_inclusive):
+            parts.append(chunk)
+            if len(chunk):
+                yielded = True
+                yield chunk
+            elif empty is None:
+                empty = chunk
+        if whole_day and is_closed(day) and parts:
+            write_day(day, concat_logs(parts))
+    if not yielded and empty is not None:
+        yield empty
+
+def _cached_rows(day, lo, hi, hi_inclusive, whole_day):
+    if whole_day:
+        import pyarrow.parquet as pq
+        try:
+            return pq.read_metadata(day_path(day)).num_rows
+        except Exception:
+            return None
+    df_logs = _read_piece_from_cache(day, lo, hi, hi_inclusive, whole_day)
+    return None if df_logs is None else len(df_logs)
+
+def plan_rows(plan, count_piece):
+    """Rows a plan will produce: cached partitions are counted locally, the rest via count_piece(lo, hi, hi_inclusive)."""
+    total = 0
+    for day, lo, hi, hi_inclusive, whole_day, cached in plan:
+        rows = _cached_rows(day, lo, hi, hi_inclusive, whole_day) if cached else None
+        total += rows if rows is not None else count_piece(lo, hi, hi_inclusive)
+    return total
+
+def warm(start_date, end_date, fetch_day):
+    """Fill the cache for every closed day in [start_date, end_date] that isn't cached yet."""
+    day = _day(start_date)
+    stored = 0
+    while day <= _day(end_date):
+        if is_closed(day) and not os.path.exists(day_path(day)):
+            started = time.perf_counter()
+            df_logs = fetch_day(day, day + timedelta(days=1))
+            if write_day(day, df_logs):
+                stored += 1
+                print(f"Cached {day:%Y-%m-%d}: {len(df_logs)} rows in {time.perf_counter() - started:.1f}s")
+        day += timedelta(days=1)
+    return stored
+
+def _main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m src.day_cache', description="LogMnpAsrs day cache")
+    commands = parser.add_subparsers(dest='command', required=True)
+    warm_cmd = commands.add_parser('warm', help="download and cache closed days START..END")
+    warm_cmd.add_argument('start', type=lambda s: datetime.strptime(s, '%Y-%m-%d'))
+    warm_cmd.add_argument('end', type=lambda s: datetime.strptime(s, '%Y-%m-%d'))
+    clear_cmd = commands.add_parser('clear', help="drop cached days (all, or START..END)")
+    clear_cmd.add_argument('start', nargs='?', type=lambda s: datetime.strptime(s, '%Y-%m-%d'))
+    clear_cmd.add_argument('end', nargs='?', type=lambda s: datetime.strptime(s, '%Y-%m-%d'))
+    commands.add_parser('stats', help="show cache size and coverage")
+    args = parser.parse_args(argv)
+
+    if not cache_available():
+        print("Day cache unavailable: enable CACHE_CONFIG and install pyarrow")
+        return 1
+    if args.command == 'warm':
+        from src.database import fetch_logs
+        stored = warm(args.start, args.end,
+                      lambda lo, hi: fetch_logs(start_date=lo, end_date=hi, end_inclusive=False))
+        print(f"Cached {stored} new day(s)")
+    elif args.command == 'clear':
+        print(f"Removed {invalidate(args.start, args.end or args.start)} day(s)")
+    print(cache_stats())
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(_main())
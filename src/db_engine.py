@@ -0,0 +1,170 @@
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+# Pool configuration shared by every engine created through get_engine()
+POOL_CONFIG = {
+    'pool_size': 5,           # connections kept open per process
+    'max_overflow': 10,       # extra connections allowed under burst load
+    'pool_timeout': 30,       # seconds to wait for a free connection before failing
+    'pool_recycle': 1800,     # seconds before a connection is replaced (SQL Server idle drops)
+    'pool_pre_ping': True,    # validate connections on checkout
+    'query_timeout': 120,     # seconds per statement, 0 disables
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+_local = threading.local()
+
+class PoolStats:
+    """Counters for one engine's pool: checkouts, wait time for a connection and new-connection latency."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connect_total = 0.0
+        self.connect_max = 0.0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_connect(self, seconds):
+        with self._lock:
+            self.connects += 1
+            self.connect_total += seconds
+            self.connect_max = max(self.connect_max, seconds)
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool):
+        with self._lock:
+            return {
+                'pool_size': pool.size() if hasattr(pool, 'size') else None,
+                'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+                'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+                'overflow': pool.overflow() if hasattr(pool, 'overflow') else None,
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'query_timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+                'connect_avg_ms': round(self.connect_total / self.connects * 1000, 3) if self.connects else 0.0,
+                'connect_max_ms': round(self.connect_max * 1000, 3),
+            }
+
+def _pool_kwargs(url):
+    parsed = make_url(url)
+    # In-memory SQLite uses a single-connection pool that doesn't take sizing arguments
+    if parsed.get_backend_name() == 'sqlite' and parsed.database in (None, '', ':memory:'):
+        return {'pool_pre_ping': POOL_CONFIG['pool_pre_ping']}
+    return {
+        'pool_size': POOL_CONFIG['pool_size'],
+        'max_overflow': POOL_CONFIG['max_overflow'],
+        'pool_timeout': POOL_CONFIG['pool_timeout'],
+        'pool_recycle': POOL_CONFIG['pool_recycle'],
+        'pool_pre_ping': POOL_CONFIG['pool_pre_ping'],
+    }
+
+def _apply_query_timeout(dbapi_conn, seconds):
+    """pyodbc exposes a per-connection statement timeout; sqlite3 gets an equivalent progress handler."""
+    if not seconds:
+        return
+    if hasattr(dbapi_conn, 'timeout'):
+        dbapi_conn.timeout = int(seconds)
+    elif hasattr(dbapi_conn, 'set_progress_handler'):
+        def abort_when_late():
+            deadline = getattr(_local, 'deadline', None)
+            return 1 if deadline is not None and time.perf_counter() > deadline else 0
+        dbapi_conn.set_progress_handler(abort_when_late, 10_000)
+
+def _install_listeners(engine, stats, query_timeout):
+    @event.listens_for(engine, 'do_connect')
+    def _before_connect(dialect, conn_rec, cargs, cparams):
+        _local.connect_started = time.perf_counter()
+
+    @event.listens_for(engine.pool, 'connect')
+    def _on_connect(dbapi_conn, conn_rec):
+        started = getattr(_local, 'connect_started', None)
+        if started is not None:
+            elapsed = time.perf_counter() - started
+            _local.connect_started = None
+            _local.connect_elapsed = getattr(_local, 'connect_elapsed', 0.0) + elapsed
+            stats.record_connect(elapsed)
+        _apply_query_timeout(dbapi_conn, query_timeout)
+
+    @event.listens_for(engine.pool, 'invalidate')
+    def _on_invalidate(dbapi_conn, conn_rec, exception):
+        stats.record_invalidation()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _start_deadline(conn, cursor, statement, parameters, context, executemany):
+        _local.deadline = time.perf_counter() + query_timeout if query_timeout else None
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _clear_deadline(conn, cursor, statement, parameters, context, executemany):
+        _local.deadline = None
+
+    @event.listens_for(engine, 'handle_error')
+    def _on_error(context):
+        _local.deadline = None
+        if 'interrupted' in str(context.original_exception).lower() or 'timeout' in str(context.original_exception).lower():
+            stats.record_timeout()
+
+def get_engine(url):
+    """Return the process-wide engine for `url`, creating it (and its pool) on first use."""
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, **_pool_kwargs(url))
+            engine.pool_stats = PoolStats()
+            _install_listeners(engine, engine.pool_stats, POOL_CONFIG['query_timeout'])
+            _engines[url] = engine
+    return engine
+
+@contextmanager
+def pooled_connection(engine):
+    """Check a connection out of the engine's pool, recording how long the checkout waited."""
+    _local.connect_elapsed = 0.0
+    started = time.perf_counter()
+    conn = engine.connect()
+    # Time spent opening a brand-new connection is reported separately as connect latency
+    engine.pool_stats.record_wait(max(0.0, time.perf_counter() - started - _local.connect_elapsed))
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def get_pool_stats(url=None):
+    """Pool statistics per engine URL (or for one URL), e.g. to size POOL_CONFIG for concurrent sessions."""
+    engines = {url: _engines[url]} if url is not None and url in _engines else dict(_engines)
+    return {
+        make_url(u).render_as_string(hide_password=True): e.pool_stats.snapshot(e.pool)
+        for u, e in engines.items()
+    }
+
+def dispose_engines():
+    """Close every pooled connection and forget the engines (next get_engine() starts fresh)."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
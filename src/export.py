@@ -0,0 +1,226 @@
+"""
+Streaming exports served as file downloads.
+
+Exports are written chunk by chunk to a temp file (openpyxl write-only workbooks, or CSV /
+Parquet for single-sheet exports), so memory stays flat however many rows are exported. The
+file is then registered under a random, short-lived token and downloaded from
+/download/<token> (see web_app.py) instead of being pushed through the websocket as a data: URL.
+"""
+import os
+import secrets
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+EXPORT_CONFIG = {
+    'directory': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'exports'),
+    'format': 'xlsx',           # 'xlsx', or 'csv' / 'parquet' for single-sheet exports
+    'chunk_rows': 10_000,       # rows converted and written per step
+    'token_ttl': 10 * 60,       # seconds a download link stays valid
+}
+
+# Excel's hard limit per sheet (header included); longer exports continue on "<name>_2", ...
+XLSX_MAX_ROWS = 1_048_576
+
+MEDIA_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+_downloads = {}
+_downloads_lock = threading.Lock()
+
+def frame_chunks(df, chunk_rows=None):
+    """An in-memory frame as a sequence of row slices (views, not copies)."""
+    chunk_rows = chunk_rows or EXPORT_CONFIG['chunk_rows']
+    if df is None:
+        return
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def _cell_rows(chunk):
+    """Rows of a chunk as openpyxl-ready tuples: NULLs become empty cells, categories plain values."""
+    values = chunk.astype(object)
+    values = values.where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def _write_xlsx(path, sheets, progress):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    try:
+        _fill_workbook(workbook, sheets, progress)
+    except BaseException:
+        # Finish and drop the per-sheet temp files of an export that failed or was cancelled.
+        # openpyxl has no public call for this; if its writer hook goes away, openpyxl's own
+        # exit handler still removes the temp files
+        for sheet in workbook.worksheets:
+            try:
+                sheet.close()
+                cleanup = getattr(getattr(sheet, '_writer', None), 'cleanup', None)
+                if cleanup is not None:
+                    cleanup()
+            except Exception:
+                pass
+        raise
+    workbook.save(path)
+
+def _fill_workbook(workbook, sheets, progress):
+    for sheet_name, chunks in sheets:
+        sheet, sheet_rows, part, header = None, 0, 1, None
+        for chunk in chunks:
+            if header is None:
+                header = [str(col) for col in chunk.columns]
+            start = 0
+            while start < len(chunk) or sheet is None:
+                if sheet is None or sheet_rows >= XLSX_MAX_ROWS:
+                    sheet = workbook.create_sheet(sheet_name if part == 1 else f"{sheet_name}_{part}")
+                    sheet.append(header)
+                    sheet_rows, part = 1, part + 1
+                piece = chunk.iloc[start:start + XLSX_MAX_ROWS - sheet_rows]
+                for row in _cell_rows(piece):
+                    sheet.append(row)
+                sheet_rows += len(piece)
+                start += len(piece)
+                progress(len(piece))
+        if sheet is None:
+            workbook.create_sheet(sheet_name)
+
+def _write_csv(path, sheets, progress):
+    (_, chunks), = sheets
+    header = True
+    # utf-8-sig so Excel opens the Thai column names and messages correctly
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+            progress(len(chunk))
+
+def _write_parquet(path, sheets, progress):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    (_, chunks), = sheets
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                # Categoricals can carry different dictionaries per chunk
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            progress(len(chunk))
+    finally:
+        if writer is not None:
+            writer.close()
+
+WRITERS = {'xlsx': _write_xlsx, 'csv': _write_csv, 'parquet': _write_parquet}
+
+def export_format(sheets, fmt=None):
+    """Requested format, or xlsx when the export has several sheets (CSV/Parquet hold one table)."""
+    fmt = fmt or EXPORT_CONFIG['format']
+    return fmt if fmt == 'xlsx' or len(sheets) == 1 else 'xlsx'
+
+def write_export(sheets, filename, fmt=None, on_progress=None, measure_memory=False):
+    """
+    Write sheets [(sheet name, iterable of DataFrame chunks), ...] to a new temp file.
+    filename is the download name without extension. on_progress(rows_written) runs per chunk.
+    Returns {'path', 'filename', 'format', 'rows', 'seconds', 'rows_per_sec', 'bytes', 'peak_bytes'};
+    peak_bytes (Python allocations while writing) is only measured with measure_memory=True,
+    since tracemalloc slows the export down considerably.
+    """
+    fmt = export_format(sheets, fmt)
+    os.makedirs(EXPORT_CONFIG['directory'], exist_ok=True)
+    path = os.path.join(EXPORT_CONFIG['directory'], f"{secrets.token_hex(8)}.{fmt}")
+    written = [0]
+
+    def progress(rows):
+        written[0] += rows
+        if on_progress:
+            on_progress(written[0])
+
+    started = time.perf_counter()
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        WRITERS[fmt](path, sheets, progress)
+    except Exception:
+        _remove(path)
+        raise
+    finally:
+        peak_bytes = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        if measure_memory:
+            tracemalloc.stop()
+    seconds = time.perf_counter() - started
+    return {
+        'path': path,
+        'filename': f"{filename}.{fmt}",
+        'format': fmt,
+        'rows': written[0],
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(written[0] / seconds) if seconds > 0 else None,
+        'bytes': os.path.getsize(path),
+        'peak_bytes': peak_bytes,
+    }
+
+def export_filename(prefix):
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def register_download(result, ttl=None):
+    """
+    Make an exported file downloadable for `ttl` seconds. Returns the URL path to open. A timer
+    deletes the file when the link expires, whether or not another export or download follows.
+    """
+    purge_expired()
+    token = secrets.token_urlsafe(24)
+    ttl = ttl or EXPORT_CONFIG['token_ttl']
+    expires = time.monotonic() + ttl
+    with _downloads_lock:
+        _downloads[token] = {'path': result['path'], 'filename': result['filename'],
+                             'media_type': MEDIA_TYPES[result['format']], 'expires': expires}
+    timer = threading.Timer(ttl + 1, purge_expired)
+    timer.daemon = True
+    timer.start()
+    return f"/download/{token}"
+
+def resolve_download(token):
+    """{'path', 'filename', 'media_type'} for a live token, or None (unknown or expired)."""
+    purge_expired()
+    with _downloads_lock:
+        entry = _downloads.get(token)
+    if entry is None or entry['expires'] < time.monotonic() or not os.path.exists(entry['path']):
+        return None
+    return entry
+
+def purge_expired():
+    """
+    Forget expired tokens and delete their files, plus files in EXPORT_CONFIG['directory'] no
+    token refers to that are older than token_ttl (left by a previous run).
+    """
+    now = time.monotonic()
+    with _downloads_lock:
+        expired = [token for token, entry in _downloads.items() if entry['expires'] < now]
+        paths = [_downloads.pop(token)['path'] for token in expired]
+        live = {os.path.abspath(entry['path']) for entry in _downloads.values()}
+    directory = EXPORT_CONFIG['directory']
+    if os.path.isdir(directory):
+        cutoff = time.time() - EXPORT_CONFIG['token_ttl']
+        for name in os.listdir(directory):
+            path = os.path.abspath(os.path.join(directory, name))
+            try:
+                orphan = path not in live and os.path.isfile(path) and os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+            if orphan:
+                paths.append(path)
+    for path in paths:
+        _remove(path)
+    return len(paths)
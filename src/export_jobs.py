@@ -0,0 +1,158 @@
+"""
+Background export jobs.
+
+Exports run on a small bounded pool instead of the Flet event handler, so the UI stays responsive
+and concurrent exports can't multiply the CPU/memory spike. Each job reports progress to every
+session waiting on it. A session can cancel its interest; the job stops once no session wants
+it. A request identical to a running or recently finished job (same key: tab, filters, format and
+dataset version) attaches to that job, or reuses its file while the download link is valid.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.state import state
+from src.export import EXPORT_CONFIG, write_export, export_filename, register_download, resolve_download
+from src.metrics import span
+from src import profiling
+
+JOB_CONFIG = {
+    'workers': 2,             # exports running at once
+    'max_pending': 8,         # queued + running jobs; further requests are refused
+    'progress_interval': 0.5, # seconds between progress callbacks per job
+}
+
+class JobCancelled(Exception):
+    pass
+
+class NoExportData(Exception):
+    """Raised by a prepare function when there is nothing to export (message shown to the user)."""
+
+class ExportJob:
+    def __init__(self, key, label, prepare):
+        self.key = key
+        self.label = label
+        self.prepare = prepare
+        self.status = 'queued'     # queued, running, done, failed, cancelled
+        self.rows = 0
+        self.result = None
+        self.url = None
+        self.error = None
+        self.created = time.monotonic()
+        self.cancel_event = threading.Event()
+        self.listeners = {}        # listener id -> on_update(job)
+        self.future = None
+        self._last_progress = 0.0
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def reusable(self):
+        """A finished export whose download link still works."""
+        return self.status == 'done' and resolve_download(self.url.rsplit('/', 1)[-1]) is not None
+
+_executor = None
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=JOB_CONFIG['workers'], thread_name_prefix='export')
+    return _executor
+
+def dataset_version():
+    """What the export reads: the loaded range and the session's snapshot version. Equal versions give equal exports."""
+    return (state.get('date_range'), state['data_version'])
+
+def _notify(job):
+    with _jobs_lock:
+        listeners = list(job.listeners.values())
+    for on_update in listeners:
+        try:
+            on_update(job)
+        except Exception as e:
+            print(f"Export progress callback failed: {str(e)}")
+
+def _run(job):
+    if job.cancel_event.is_set():
+        job.status = 'cancelled'
+        _notify(job)
+        return
+    job.status = 'running'
+    _notify(job)
+
+    def on_progress(rows):
+        if job.cancel_event.is_set():
+            raise JobCancelled()
+        job.rows = rows
+        now = time.monotonic()
+        if now - job._last_progress >= JOB_CONFIG['progress_interval']:
+            job._last_progress = now
+            _notify(job)
+
+    try:
+        with span('export_excel') as exporting, profiling.work('export_job'):
+            sheets, prefix = job.prepare()
+            job.result = write_export(sheets, export_filename(prefix), on_progress=on_progress)
+            exporting.rows(job.result['rows'])
+        job.url = register_download(job.result)
+        job.status = 'done'
+        print(f"Exported {job.result['rows']} rows to {job.result['filename']} in {job.result['seconds']}s "
+              f"({job.result['rows_per_sec']} rows/s, {job.result['bytes'] / 1024 ** 2:.1f} MB)")
+    except JobCancelled:
+        job.status = 'cancelled'
+    except NoExportData as e:
+        job.status = 'failed'
+        job.error = str(e)
+    except Exception as e:
+        job.status = 'failed'
+        job.error = f"Export error: {str(e)}"
+    _notify(job)
+
+def submit(key, label, prepare, listener_id, on_update):
+    """
+    Queue an export, or join/reuse an identical one. prepare() runs on the worker and returns
+    (sheets, filename prefix) for export.write_export, or raises NoExportData.
+    on_update(job) is called on status changes and (throttled) progress. Returns the job, or
+    None when JOB_CONFIG['max_pending'] jobs are already waiting or running.
+    """
+    key = (key, EXPORT_CONFIG['format'])
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is not None and not job.cancel_event.is_set() and (not job.finished or job.reusable()):
+            job.listeners[listener_id] = on_update
+            reused = job.finished
+        else:
+            pending = sum(1 for j in _jobs.values() if not j.finished)
+            if pending >= JOB_CONFIG['max_pending']:
+                return None
+            # Finished jobs are only kept while their file can be reused
+            for old_key in [k for k, j in _jobs.items() if j.finished and not j.reusable()]:
+                del _jobs[old_key]
+            job = _jobs[key] = ExportJob(key, label, prepare)
+            job.listeners[listener_id] = on_update
+            # In the requesting session, so prepare() reads its filters and data
+            job.future = _pool().submit(contextvars.copy_context().run, _run, job)
+            reused = False
+    if reused:
+        on_update(job)
+    return job
+
+def cancel(job, listener_id):
+    """Stop waiting for a job; the job itself is cancelled once nobody is waiting for it."""
+    with _jobs_lock:
+        job.listeners.pop(listener_id, None)
+        orphaned = not job.listeners and not job.finished
+        if orphaned:
+            job.cancel_event.set()
+    if orphaned and job.future is not None and job.future.cancel():
+        # Never started: nothing will report it
+        job.status = 'cancelled'
+
+def queue_stats():
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    return {status: sum(1 for j in jobs if j.status == status)
+            for status in ('queued', 'running', 'done', 'failed', 'cancelled')}
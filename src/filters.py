@@ -1,27 +1,146 @@
+import threading
+from collections import OrderedDict
+from functools import reduce
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from src.state import state
+from src.state import state, snapshot
+from src.metrics import span
 
-def apply_filters(df, line_filter, status_filter):
-    filtered_df = df.copy()
+# Filter results on the loaded frame are memoized per dataset version (src/dataset_cache.py):
+# row positions per SRM, per PLCCODE and per message type are built once per version, selections
+# are intersections of those position sets, and results are kept per (version, SRM, status, type).
+# Frames that aren't the session's current snapshot are filtered directly, without caching.
+FILTER_CACHE_CONFIG = {
+    'versions': 4,      # dataset versions whose row indexes are kept
+    'results': 64,      # memoized selections / counts across versions
+}
 
-    # SRM/LINE
-    if line_filter != "All":
-        filtered_df = filtered_df[filtered_df['ASRS'] == int(line_filter)]
+_indexes = OrderedDict()
+_results = OrderedDict()
+_cache_lock = threading.Lock()
+filter_stats = {'index_builds': 0, 'hits': 0, 'misses': 0, 'uncached': 0}
 
-    # Status / PLCCODE
-    if status_filter and status_filter != "All":
-        status_value = int(status_filter)
-        filtered_df = filtered_df[filtered_df["PLCCODE"] == status_value]
-        
-    return filtered_df
+def _version_of(df):
+    """Dataset version of df if it is the current session's snapshot frame, else None."""
+    data = snapshot()
+    return data.version if data.version and data.df_logs is df else None
 
-def get_status_stats(df, line_filter="All", selected_date=None):
-    stats_df = df.copy()
+def _positions(mask):
+    return np.flatnonzero(mask.fillna(False).to_numpy(dtype=bool))
+
+def _build_index(df):
+    def groups(column):
+        return {int(value): np.asarray(rows, dtype=np.int64)
+                for value, rows in df.groupby(column, observed=True, sort=False).indices.items()}
+    return {
+        'srm': groups('ASRS'),
+        'plccode': groups('PLCCODE'),
+        'type': {'Alarm': _positions(df['PLCCODE'] > 100), 'Normal': _positions(df['PLCCODE'] <= 100)},
+    }
+
+def _row_index(df, version):
+    with _cache_lock:
+        index = _indexes.get(version)
+        if index is not None:
+            _indexes.move_to_end(version)
+            return index
+    index = _build_index(df)
+    with _cache_lock:
+        filter_stats['index_builds'] += 1
+        _indexes[version] = index
+        while len(_indexes) > FILTER_CACHE_CONFIG['versions']:
+            _indexes.popitem(last=False)
+    return index
+
+def memoized(df, key, compute):
+    """compute(version) memoized under (version,) + key when df is the current snapshot frame."""
+    version = _version_of(df)
+    if version is None:
+        with _cache_lock:
+            filter_stats['uncached'] += 1
+        return compute(None)
+    key = (version,) + key
+    with _cache_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            filter_stats['hits'] += 1
+            return _results[key]
+    result = compute(version)
+    with _cache_lock:
+        filter_stats['misses'] += 1
+        _results[key] = result
+        while len(_results) > FILTER_CACHE_CONFIG['results']:
+            _results.popitem(last=False)
+    return result
 
+def _filter_frame(df, line_filter, status_filter, filter_type):
+    """Plain boolean-mask filtering, for frames without a cached index."""
     if line_filter and line_filter != "All":
-        stats_df = stats_df[stats_df['ASRS'] == int(line_filter)]
+        df = df[df['ASRS'] == int(line_filter)]
+    if status_filter and status_filter != "All":
+        df = df[df['PLCCODE'] == int(status_filter)]
+    if filter_type == "Alarm":
+        df = df[df['PLCCODE'] > 100]
+    elif filter_type == "Normal":
+        df = df[df['PLCCODE'] <= 100]
+    return df
+
+def select_rows(df, line_filter="All", status_filter="All", filter_type="All"):
+    """
+    Rows of df on SRM line_filter with PLCCODE status_filter and message type filter_type
+    ("Alarm": PLCCODE > 100, "Normal": <= 100); "All" leaves a criterion out. With no criterion
+    df itself is returned. Results may be shared between callers: treat them as read-only.
+    """
+    if df is None or len(df) == 0 or 'PLCCODE' not in df.columns:
+        return df
+    criteria = (str(line_filter or "All"), str(status_filter or "All"), filter_type if filter_type in ("Alarm", "Normal") else "All")
+    if criteria == ("All", "All", "All"):
+        return df
+
+    def compute(version):
+        if version is None:
+            return _filter_frame(df, *criteria)
+        index = _row_index(df, version)
+        empty = np.empty(0, dtype=np.int64)
+        line, status, kind = criteria
+        position_sets = []
+        if line != "All":
+            position_sets.append(index['srm'].get(int(line), empty))
+        if status != "All":
+            position_sets.append(index['plccode'].get(int(status), empty))
+        if kind != "All":
+            position_sets.append(index['type'][kind])
+        # Smallest set first; every set is sorted and unique, so the result stays in frame order
+        position_sets.sort(key=len)
+        rows = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), position_sets)
+        return df.iloc[rows]
+
+    with span('select_rows') as selecting:
+        selected = memoized(df, ('rows',) + criteria, compute)
+        selecting.rows(len(selected))
+    return selected
+
+def apply_filters(df, line_filter, status_filter):
+    return select_rows(df, line_filter, status_filter)
 
+def find_time_position(df, timestamp, column='CDATE'):
+    """
+    Position of the first row at or before `timestamp` in a frame sorted newest first
+    (binary search, so it costs the same on 100 rows and 5M). len(df) if every row is newer.
+    """
+    if df is None or len(df) == 0:
+        return 0
+    values = df[column].to_numpy(dtype='datetime64[ns]')[::-1]
+    return len(values) - int(np.searchsorted(values, np.datetime64(pd.Timestamp(timestamp), 'ns'), side='right'))
+
+def get_status_stats(df, line_filter="All", selected_date=None):
+    if df is None:
+        return pd.DataFrame(columns=['PLCCODE', 'Count', 'Percentage']), 0
+    return memoized(df, ('status_stats', str(line_filter or "All")),
+                     lambda version: _status_stats(select_rows(df, line_filter)))
+
+def _status_stats(stats_df):
     if len(stats_df) == 0:
         return pd.DataFrame(columns=['PLCCODE', 'Count', 'Percentage']), 0
 
@@ -34,8 +153,7 @@ def get_status_stats(df, line_filter="All", selected_date=None):
 
 def calculate_line_alarm_frequency():
     df = state['df_logs']
-    filtered_df = apply_filters(df, state['line_logs'], "All")
-    alarm_df = filtered_df[filtered_df['PLCCODE'] > 100].copy()
+    alarm_df = select_rows(df, state['line_logs'], "All", "Alarm").copy()
 
     if len(alarm_df) == 0:
         return pd.DataFrame(columns=['LINE', 'Count'])
@@ -58,4 +176,49 @@ def calculate_line_alarm_frequency():
     line_alarm_data['Count'] = line_alarm_data['Count'].fillna(0).astype(int)
     line_alarm_data = line_alarm_data[line_alarm_data['Count'] > 0]
 
-    return line_alarm_data.sort_values('Count', ascending=False)
\ No newline at end of file
+    return line_alarm_data.sort_values('Count', ascending=False)
+
+def match_before_alarm(filtered_df):
+    """
+    For every alarm (PLCCODE > 100), the last normal row (PLCCODE < 100) on the same ASRS with a
+    strictly earlier CDATE. Returns (alarm_df, before_alarm_df): before_alarm_df holds the matched
+    normal rows plus Alarm (alarm PLCCODE), AlarmTime and Duration (float seconds between them),
+    newest first. Alarms without an earlier normal row are left out.
+
+    One merge_asof per call (grouped by ASRS) instead of a scan of the frame per alarm.
+    """
+    if len(filtered_df) == 0 or 'PLCCODE' not in filtered_df.columns:
+        return pd.DataFrame(), pd.DataFrame()
+
+    alarm_df = filtered_df[filtered_df['PLCCODE'] > 100]
+    if len(alarm_df) == 0:
+        return alarm_df, pd.DataFrame()
+    alarm_df = alarm_df.sort_values('CDATE', ascending=False)
+
+    # Positions into filtered_df, so the matched rows are taken once at the end with every column
+    keys = filtered_df[['ASRS', 'CDATE', 'PLCCODE']].reset_index(drop=True)
+    keys['_row'] = np.arange(len(keys))
+    keys = keys.dropna(subset=['ASRS', 'CDATE', 'PLCCODE'])
+    keys['ASRS'] = keys['ASRS'].astype('int64')
+
+    is_alarm = (keys['PLCCODE'] > 100).to_numpy(dtype=bool)
+    alarms = keys[is_alarm].rename(columns={'CDATE': 'AlarmTime', 'PLCCODE': 'Alarm'}).drop(columns='_row')
+    normals = keys[(keys['PLCCODE'] < 100).to_numpy(dtype=bool)][['ASRS', 'CDATE', '_row']]
+
+    matched = pd.merge_asof(
+        alarms.sort_values('AlarmTime', kind='stable'), normals.sort_values('CDATE', kind='stable'),
+        left_on='AlarmTime', right_on='CDATE', by='ASRS',
+        direction='backward', allow_exact_matches=False,
+    )
+    matched = matched.dropna(subset=['_row'])
+    if len(matched) == 0:
+        return alarm_df, pd.DataFrame()
+
+    # Alarm order (newest first) decides ties, as the old per-alarm loop did
+    matched = matched.sort_values('AlarmTime', ascending=False, kind='stable')
+    before_alarm_df = filtered_df.iloc[matched['_row'].astype('int64').to_numpy()].copy()
+    before_alarm_df['Alarm'] = matched['Alarm'].array
+    before_alarm_df['AlarmTime'] = matched['AlarmTime'].to_numpy()
+    before_alarm_df['Duration'] = (matched['AlarmTime'] - matched['CDATE']).dt.total_seconds().to_numpy()
+    before_alarm_df = before_alarm_df.sort_values('CDATE', ascending=False, kind='stable')
+    return alarm_df, before_alarm_df
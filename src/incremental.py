@@ -0,0 +1,77 @@
+from collections import Counter
+from datetime import timedelta
+import pandas as pd
+from src.state import state, publish_dataset, snapshot
+from src import dataset_cache
+from src.log_schema import concat_logs
+
+# Rows this close to the newest loaded CDATE are fetched again and de-duplicated. That covers
+# rows sharing the boundary timestamp and SQL Server's 1/300 s datetime rounding.
+TAIL_OVERLAP = timedelta(seconds=1)
+
+def publish_logs(date_range, df_logs):
+    """
+    Publish df_logs as the session's dataset snapshot. With date_range it is recorded as the
+    complete load of that range, together with its newest CDATE (the watermark); date_range=None
+    marks a partial or unshared frame (the next refresh does a full load). Frame and watermark
+    are swapped in together, so readers never see one without the other.
+    """
+    newest = None
+    if date_range is not None and df_logs is not None and 'CDATE' in df_logs.columns and len(df_logs):
+        newest = df_logs['CDATE'].max()
+        newest = None if pd.isna(newest) else newest
+    watermark = {'date_range': date_range, 'cdate': newest} if date_range is not None else None
+    return publish_dataset(df_logs=df_logs, tail_watermark=watermark)
+
+def tail_start(date_range):
+    """
+    Lower CDATE bound for a tail query over the loaded frame, or None when date_range isn't the
+    range that was last loaded completely (or nothing was loaded), i.e. a full load is needed.
+    """
+    watermark = state.get('tail_watermark')
+    if not watermark or watermark['date_range'] != date_range or watermark['cdate'] is None:
+        return None
+    return (watermark['cdate'] - TAIL_OVERLAP).to_pydatetime()
+
+def merge_tail(df_logs, df_new, since):
+    """
+    Put the rows of df_new (all with CDATE >= since) that df_logs doesn't hold yet in front of
+    df_logs. Rows in the overlap window are matched as a multiset over every column, so a row
+    logged twice in the same millisecond is kept twice. Returns (merged frame, rows added).
+    """
+    if df_new is None or len(df_new) == 0:
+        return df_logs, 0
+
+    in_window = df_logs['CDATE'] >= since
+    old_window = df_logs[in_window]
+    columns = [c for c in df_new.columns if c in df_logs.columns]
+
+    # Row identity = every shared column rendered as text (NaN/NA compare equal that way)
+    seen = Counter(old_window[columns].astype(str).itertuples(index=False, name=None))
+    keep = []
+    for key in df_new[columns].astype(str).itertuples(index=False, name=None):
+        if seen[key]:
+            seen[key] -= 1
+            keep.append(False)
+        else:
+            keep.append(True)
+    added = df_new[keep]
+    if len(added) == 0:
+        return df_logs, 0
+
+    # Only the overlap window can interleave; everything older keeps its position
+    head = concat_logs([added, old_window]).sort_values('CDATE', ascending=False, kind='stable')
+    merged = concat_logs([head, df_logs[~in_window]])
+    return merged, len(added)
+
+def publish_tail(df_new, since):
+    """
+    Merge tail rows into state['df_logs'] and move the watermark forward. Returns rows added.
+    The frame may be shared with other sessions, so read-merge-replace happens under the cache lock.
+    """
+    with dataset_cache.lock:
+        current = snapshot()
+        df_logs, added = merge_tail(current.df_logs, df_new, since)
+        if added:
+            publish_logs(current.tail_watermark['date_range'], df_logs)
+    return added
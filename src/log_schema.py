@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from src.monitor_parser import REGISTER_COLUMNS, normalize_register_columns
+from src.metrics import span
+
+# Nullable integer dtype per column. Values that don't fit widen the column instead of wrapping.
+INT_SCHEMA = {
+    'ASRS': 'Int16',
+    'PLCCODE': 'Int16',
+    **{col: 'Int32' for col in REGISTER_COLUMNS},
+}
+
+# Strings kept as categoricals: integer codes plus one copy of each distinct value.
+# MSGLOG repeats a small set of messages, so this is its dictionary encoding.
+CATEGORY_COLUMNS = ['BARCODE', 'CHKTYPE', 'MSGTYPE', 'MSGLOG']
+
+_WIDER = {'Int8': 'Int16', 'Int16': 'Int32', 'Int32': 'Int64'}
+
+def _fit_int(values: pd.Series, dtype: str) -> str:
+    """Smallest dtype from `dtype` upwards that holds every value."""
+    if values.isna().all():
+        return dtype
+    low, high = values.min(), values.max()
+    while dtype in _WIDER:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            break
+        dtype = _WIDER[dtype]
+    return dtype
+
+def _strip_uniques(series: pd.Series):
+    """
+    (codes, stripped distinct values) of a string column. Work is done once per distinct value;
+    nchar/varchar padding from the server would otherwise split identical values.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    stripped = pd.Index([str(v).strip() for v in uniques], dtype=object)
+    return codes, stripped
+
+def _to_int(series: pd.Series, dtype: str, col: str) -> pd.Series:
+    if series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+        codes, stripped = _strip_uniques(series)
+        numbers = pd.to_numeric(pd.Series(stripped, dtype=object), errors='coerce')
+        failed_values = (numbers.isna() & (stripped != '')).to_numpy()
+        failed = int(np.isin(codes, np.flatnonzero(failed_values)).sum())
+        if failed:
+            print(f"Warning: {failed} non-numeric {col} value(s) loaded as NULL")
+        # -1 (NULL) codes pick the appended NaN
+        values = np.append(numbers.to_numpy(dtype=float), np.nan)[codes]
+        series = pd.Series(values, index=series.index)
+    elif series.dtype.kind == 'f':
+        # Registers can't be fractional; anything else is bad data rather than a value to round
+        series = series.where(series.isna() | (series == series.round()))
+    return series.astype(_fit_int(series, dtype))
+
+def _to_category(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    codes, stripped = _strip_uniques(series)
+    # Values that only differed by padding collapse onto one category
+    unique_codes, categories = pd.factorize(stripped)
+    codes = np.where(codes >= 0, unique_codes[np.maximum(codes, 0)] if len(unique_codes) else -1, -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index)
+
+def apply_log_schema(df_logs: pd.DataFrame) -> pd.DataFrame:
+    """Cast a cleaned LogMnpAsrs frame to the compact schema. Columns that aren't present are skipped."""
+    for col, dtype in INT_SCHEMA.items():
+        if col in df_logs.columns:
+            df_logs[col] = _to_int(df_logs[col], dtype, col)
+    for col in CATEGORY_COLUMNS:
+        if col in df_logs.columns:
+            df_logs[col] = _to_category(df_logs[col])
+    if 'CDATE' in df_logs.columns and df_logs['CDATE'].dtype != 'datetime64[ns]':
+        df_logs['CDATE'] = pd.to_datetime(df_logs['CDATE'])
+    return df_logs
+
+def normalize_logs(df_logs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Load-time normalization shared by both loaders: registers (md_* columns or MONITORDATA) and
+    then the compact schema. Marks df_logs.attrs['normalized'] (kept through slicing, filtering
+    and concat_logs) so views can page through the frame without touching registers again.
+    """
+    with span('parse') as parsing:
+        df_logs = apply_log_schema(normalize_register_columns(df_logs))
+        df_logs.attrs['normalized'] = True
+        parsing.frame(df_logs)
+    return df_logs
+
+def is_normalized(df_logs) -> bool:
+    return df_logs is not None and bool(df_logs.attrs.get('normalized'))
+
+def concat_logs(parts) -> pd.DataFrame:
+    """
+    pd.concat for schema frames. Categoricals with different categories would silently fall back to
+    object, so their categories are unified first.
+    """
+    parts = [part for part in parts if part is not None]
+    if len(parts) == 1:
+        return parts[0]
+    if not parts:
+        return pd.DataFrame()
+    for col in CATEGORY_COLUMNS:
+        dtypes = [part[col].dtype for part in parts if col in part.columns]
+        if len(dtypes) < 2 or not all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+            continue
+        if all(d == dtypes[0] for d in dtypes[1:]):
+            continue
+        categories = pd.Index(np.unique(np.concatenate([d.categories.to_numpy(dtype=object) for d in dtypes])))
+        parts = [part.assign(**{col: part[col].cat.set_categories(categories)}) if col in part.columns else part
+                 for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+def memory_report(df_before: pd.DataFrame, df_after: pd.DataFrame) -> dict:
+    """Deep memory use of a frame before and after apply_log_schema, in total and per row."""
+    rows = max(len(df_after), 1)
+    before = int(df_before.memory_usage(index=False, deep=True).sum())
+    after = int(df_after.memory_usage(index=False, deep=True).sum())
+    return {
+        'rows': len(df_after),
+        'bytes_before': before,
+        'bytes_after': after,
+        'bytes_per_row_before': round(before / rows, 1),
+        'bytes_per_row_after': round(after / rows, 1),
+        'ratio': round(before / after, 2) if after else None,
+        'dtypes': {col: str(dtype) for col, dtype in df_after.dtypes.items()},
+    }
@@ -0,0 +1,177 @@
+"""
+Timing spans and size histograms for the hot paths, rendered as Prometheus text for /metrics.
+
+    with metrics.span('sql_fetch') as s:
+        df = pd.read_sql(...)
+        s.frame(df)              # row count and DataFrame memory of the result
+
+A span records its duration in asrs_span_seconds{span="..."}; rows(), frame() and controls()
+add to asrs_rows, asrs_frame_bytes and asrs_controls under the same label. render() also
+reports the counters the other modules keep (sessions, dataset cache, filter cache, tasks,
+export queue, DB pool). With METRICS_CONFIG['enabled'] off (ASRS_METRICS=0) span() hands out
+one shared no-op object: no clock reads, no locks, no memory measurements.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+
+METRICS_CONFIG = {
+    'enabled': os.environ.get('ASRS_METRICS', '1') != '0',
+}
+
+# Upper bounds of the histogram buckets per metric (+Inf is implied)
+BUCKETS = {
+    'span_seconds': (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    'rows': (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    'frame_bytes': (10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9),
+    'controls': (10, 50, 100, 500, 1_000, 5_000, 10_000),
+}
+HELP = {
+    'span_seconds': "Duration of instrumented operations",
+    'rows': "Rows handled per operation",
+    'frame_bytes': "Memory of the DataFrame an operation produced",
+    'controls': "Flet controls in the tree an operation built",
+}
+
+_histograms = {}   # (metric, span) -> [bucket counts, sum, count]
+_lock = threading.Lock()
+
+def observe(metric, name, value):
+    """Add value to the histogram of metric (a BUCKETS key) labelled span=name."""
+    bounds = BUCKETS[metric]
+    with _lock:
+        hist = _histograms.get((metric, name))
+        if hist is None:
+            hist = _histograms[(metric, name)] = [[0] * (len(bounds) + 1), 0.0, 0]
+        hist[0][bisect.bisect_left(bounds, value)] += 1
+        hist[1] += value
+        hist[2] += 1
+
+class _Span:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe('span_seconds', self.name, time.perf_counter() - self.started)
+        return False
+
+    def rows(self, n):
+        observe('rows', self.name, n)
+        return self
+
+    def frame(self, df):
+        if df is not None:
+            self.rows(len(df))
+            observe('frame_bytes', self.name, int(df.memory_usage(deep=True).sum()))
+        return self
+
+    def controls(self, control):
+        if control is not None:
+            from src.ui_metrics import count_controls
+            observe('controls', self.name, count_controls(control))
+        return self
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def rows(self, n):
+        return self
+
+    def frame(self, df):
+        return self
+
+    def controls(self, control):
+        return self
+
+NULL_SPAN = _NullSpan()
+
+def span(name):
+    """Context manager timing the block as `name` (the no-op NULL_SPAN when metrics are disabled)."""
+    return _Span(name) if METRICS_CONFIG['enabled'] else NULL_SPAN
+
+def timed(name):
+    """Decorator: each call of the function is a span called name."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS_CONFIG['enabled']:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _render_histograms(lines):
+    with _lock:
+        items = sorted((key, [list(h[0]), h[1], h[2]]) for key, h in _histograms.items())
+    for metric in BUCKETS:
+        family = [(name, hist) for (m, name), hist in items if m == metric]
+        if not family:
+            continue
+        lines.append(f"# HELP asrs_{metric} {HELP[metric]}")
+        lines.append(f"# TYPE asrs_{metric} histogram")
+        for name, (counts, total, count) in family:
+            label = f'span="{_label(name)}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS[metric] + ('+Inf',), counts):
+                cumulative += n
+                lines.append(f'asrs_{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"asrs_{metric}_sum{{{label}}} {total}")
+            lines.append(f"asrs_{metric}_count{{{label}}} {count}")
+
+def _gauge_samples(family, values, labels):
+    extra = ''.join(f',{k}="{_label(v)}"' for k, v in labels.items())
+    return [f'asrs_{family}{{stat="{_label(stat)}"{extra}}} {value}' for stat, value in values.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)]
+
+def _stats_sources():
+    """(family, help, stats dict, labels) from the modules that keep their own counters."""
+    from src import dataset_cache, tasks, export_jobs
+    from src.state import session_count
+    from src.filters import filter_stats
+    from src.db_engine import get_pool_stats
+    sources = [
+        ('sessions', "Open browser sessions", {'open': session_count()}, {}),
+        ('dataset_cache', "Loaded frames shared between sessions", dataset_cache.stats(), {}),
+        ('filter_cache', "Filter engine index builds and result cache", dict(filter_stats), {}),
+        ('tasks', "Background task pool (counts, queue depth, latency in seconds)", tasks.stats(), {}),
+        ('export_jobs', "Export jobs by status", export_jobs.queue_stats(), {}),
+    ]
+    sources += [('db_pool', "Database connection pool", pool, {'url': url}) for url, pool in get_pool_stats().items()]
+    return sources
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    _render_histograms(lines)
+    seen = set()
+    for family, help_text, values, labels in _stats_sources():
+        if family not in seen:
+            # One HELP/TYPE header per family; further label sets (e.g. another pool) follow it
+            seen.add(family)
+            lines.append(f"# HELP asrs_{family} {help_text}")
+            lines.append(f"# TYPE asrs_{family} gauge")
+        lines.extend(_gauge_samples(family, values, labels))
+    return '\n'.join(lines) + '\n'
@@ -1,35 +1,34 @@
+import numpy as np
 import pandas as pd
-import random
 from datetime import datetime, timedelta
-import re
-from src.state import state
-
-# Dictionary mapping D registers to their meanings (copied from database.py)
-D_REGISTER_MEANINGS = {
-    'D174': 'Command_X_Pos (D174)',
-    'D57':  'X_Distance_mm (D57) ',
-    'D130': 'Start_Bank (D130)',
-    'D131': 'Start_Pos_mm (D131)',
-    'D133': 'Start_Level_mm (D133)',
-    'D134': 'End_Bank (D134)',
-    'D135': 'End_Position_mm (D135)',
-    'D137': 'End_Level_mm (D137)',
-    'D138': 'Pallet_ID (D138)',
-    'D140': 'Present_Bay_Arm1 (D140)',
-    'D145': 'Present_Level (D145)',
-    'D146': 'Status_Arm1 (D146)',
-    'D147': 'Status (D147)',
-    'D148': 'Command Machine (D148)',
+from src.state import state, use_dataset
+from src.monitor_parser import D_REGISTER_MEANINGS, REGISTER_COLUMNS
+from src.query_builder import LOG_COLUMNS, as_value_list
+from src.streaming import LOAD_CHUNK_ROWS, publish_chunks
+from src.log_schema import normalize_logs
+from src.incremental import publish_logs, tail_start, publish_tail
+
+# Generator settings; generate_mock_data takes each of them as an argument too (load tests)
+MOCK_CONFIG = {
+    'srms': 8,                  # SRM lines, ASRS 1..srms
+    'events_per_day': 200,      # log rows per SRM per day
+    'alarm_rate': 0.02,         # chance that a cycle step ends in an alarm
+    'monitor_text': False,      # raw MONITORDATA text instead of register columns (slower)
 }
 
+# Normal operation is one row per step of the 1 -> 11 work cycle (Status_Detail.Normal_status_map)
+CYCLE_STEPS = 11
+
 # Mock data constants
-ASRS_VALUES = [1, 2, 3]
+ASRS_VALUES = list(range(1, MOCK_CONFIG['srms'] + 1))
 BARCODE_VALUES = ["PALLET001", "PALLET002", "PALLET003", "PALLET004", "PALLET005"]
 CHKTYPE_VALUES = ["IN", "OUT", "CHECK"]
 MSGTYPE_VALUES = ["INFO", "ERROR", "WARNING", "ALARM"]
+NORMAL_MSGTYPE_VALUES = ["INFO", "NORMAL"]
+ALARM_MSGTYPE_VALUES = ["ERROR", "WARNING", "ALARM"]
 
 # PLC code values - both normal (< 100) and alarm (> 100) cases
-NORMAL_PLCCODE_VALUES = [1, 2, 5, 10, 20, 30, 50, 80, 90]  # Normal operation codes
+NORMAL_PLCCODE_VALUES = list(range(1, CYCLE_STEPS + 1))   # Normal operation codes
 ALARM_PLCCODE_VALUES = [101, 102, 103, 104, 105]           # Alarm codes
 
 STATUS_VALUES = ["NORMAL", "ALARM", "FAULT", "MAINTENANCE", "IDLE"]
@@ -60,95 +59,178 @@ ALARM_MSGLOG_VALUES = [
     "Fault: Drive system error"
 ]
 
-def generate_monitor_data():
-    """Generate random MONITORDATA field with D register values."""
-    monitor_data = ""
-    for register in D_REGISTER_MEANINGS.keys():
-        register_num = register.replace('D', '')
-        value = random.randint(0, 10000)
-        monitor_data += f"{register}={value} "
-    return monitor_data
-
-def parse_monitor_data(monitor_data):
-    """Parse the MONITORDATA field and extract D register values."""
-    if pd.isna(monitor_data) or not isinstance(monitor_data, str):
-        return {}
-    
-    # Regular expression to extract D register values
-    pattern = r'D(\d+)=(\d+)'
-    matches = re.findall(pattern, monitor_data)
-    
-    # Create dictionary of D register values
-    d_values = {}
-    for register, value in matches:
-        d_key = f'D{register}'
-        if d_key in D_REGISTER_MEANINGS:
-            # Use the meaningful name as the key
-            d_values[D_REGISTER_MEANINGS[d_key]] = int(value.strip())
-    
-    return d_values
+def generate_monitor_data(registers):
+    """MONITORDATA text ("D174=123 D57=4567 ...") for register values shaped (registers, rows)."""
+    text = pd.Series([''] * registers.shape[1], dtype=object)
+    for register, values in zip(D_REGISTER_MEANINGS, registers):
+        text = text + f"{register}=" + pd.Series(values).astype(str) + ' '
+    return text
 
-def generate_mock_data(start_date, end_date, num_records=None):
-    """Generate mock ASRS log data for the given date range."""
-    date_range = (end_date - start_date).days
-    if date_range <= 0:
-        date_range = 1  # Ensure at least 1 day range
-    
-    # Calculate number of records based on date range
+def _cycle_codes(rng, n, alarm_rate):
+    """
+    PLCCODEs of one SRM, oldest first: steps 1 -> CYCLE_STEPS in order, where any step fails with an
+    alarm code at alarm_rate and the next cycle starts again at step 1. Returns (codes, is_alarm).
+    """
+    position = np.arange(n)
+    is_alarm = rng.random(n) < alarm_rate
+    # Position of the row after the latest alarm (0 before the first one): where the cycle restarted
+    restart = np.maximum.accumulate(np.where(is_alarm, position + 1, 0))
+    codes = (position - restart) % CYCLE_STEPS + 1
+    codes[is_alarm] = rng.choice(ALARM_PLCCODE_VALUES, int(is_alarm.sum()))
+    return codes, is_alarm
+
+def _arrival_offsets(rng, n, span_ms):
+    """n increasing offsets in (0, span_ms) ms: exponential gaps (Poisson arrivals) scaled to the range."""
+    arrivals = np.cumsum(rng.exponential(size=n + 1))
+    return (arrivals[:-1] / arrivals[-1] * span_ms).astype(np.int64)
+
+def _pick(rng, values, n):
+    return pd.Categorical.from_codes(rng.integers(0, len(values), n), categories=values)
+
+def _pick_by_type(rng, normal_values, alarm_values, is_alarm):
+    """Categorical of normal_values on normal rows and alarm_values on alarm rows."""
+    n = len(is_alarm)
+    codes = np.where(is_alarm, len(normal_values) + rng.integers(0, len(alarm_values), n),
+                     rng.integers(0, len(normal_values), n))
+    return pd.Categorical.from_codes(codes, categories=normal_values + alarm_values)
+
+def generate_mock_data(start_date, end_date, num_records=None, seed=None, srms=None, events_per_day=None,
+                       alarm_rate=None, monitor_text=None):
+    """
+    Mock LogMnpAsrs rows between start_date and end_date, newest first, as a DataFrame. Each SRM
+    runs status cycles (see _cycle_codes) at exponential intervals. num_records defaults to
+    srms x events_per_day per day of the range; other arguments default to MOCK_CONFIG. Registers
+    are integer columns unless monitor_text, which builds the raw MONITORDATA text instead.
+    The same seed gives the same rows.
+    """
+    srms = srms or MOCK_CONFIG['srms']
+    events_per_day = events_per_day or MOCK_CONFIG['events_per_day']
+    alarm_rate = MOCK_CONFIG['alarm_rate'] if alarm_rate is None else alarm_rate
+    monitor_text = MOCK_CONFIG['monitor_text'] if monitor_text is None else monitor_text
+    span_ms = max(int((end_date - start_date).total_seconds() * 1000), 1)
     if num_records is None:
-        # Generate approximately 200 records per day
-        num_records = date_range * 200
+        num_records = int(round(srms * events_per_day * span_ms / 86_400_000))
     
     print(f"Generating {num_records} records for date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
     
-    data = []
-    for _ in range(num_records):
-        # Generate a random date within the range
-        random_days = random.random() * date_range
-        random_hours = random.random() * 24
-        random_minutes = random.random() * 60
-        random_seconds = random.random() * 60
-        
-        cdate = start_date + timedelta(
-            days=random_days,
-            hours=random_hours,
-            minutes=random_minutes,
-            seconds=random_seconds
-        )
-        
-        monitor_data = generate_monitor_data()
-        
-        # Decide if this record is a normal operation or an alarm (70% normal, 30% alarm)
-        is_normal = random.random() < 0.7
-        
-        if is_normal:
-            plccode = random.choice(NORMAL_PLCCODE_VALUES)
-            msglog = random.choice(NORMAL_MSGLOG_VALUES)
-            msgtype = random.choice(["INFO", "NORMAL"])
-        else:
-            plccode = random.choice(ALARM_PLCCODE_VALUES)
-            msglog = random.choice(ALARM_MSGLOG_VALUES)
-            msgtype = random.choice(["ERROR", "WARNING", "ALARM"])
-        
-        record = {
-            'ASRS': random.choice(ASRS_VALUES),
-            'BARCODE': random.choice(BARCODE_VALUES),
-            'CHKTYPE': random.choice(CHKTYPE_VALUES),
-            'MSGLOG': msglog,
-            'CDATE': cdate,
-            'MSGTYPE': msgtype,
-            'PLCCODE': plccode,
-            'MONITORDATA': monitor_data,
-        }
-        data.append(record)
+    rng = np.random.default_rng(seed)
+    per_srm = np.full(srms, num_records // srms)
+    per_srm[:num_records % srms] += 1
+    offsets, lines, codes, alarms = [], [], [], []
+    for line, n in enumerate(per_srm, start=1):
+        line_codes, line_alarms = _cycle_codes(rng, n, alarm_rate)
+        offsets.append(_arrival_offsets(rng, n, span_ms))
+        lines.append(np.full(n, line, dtype=np.int16))
+        codes.append(line_codes)
+        alarms.append(line_alarms)
     
-    # Sort by date
-    data.sort(key=lambda x: x['CDATE'], reverse=True)
+    # Newest first across SRMs, like the server returns them
+    offset = np.concatenate(offsets)
+    order = np.argsort(offset, kind='stable')[::-1]
+    offset = offset[order]
+    is_alarm = np.concatenate(alarms)[order]
     
-    return data
+    df_logs = pd.DataFrame({
+        'ASRS': np.concatenate(lines)[order],
+        'BARCODE': _pick(rng, BARCODE_VALUES, num_records),
+        'CHKTYPE': _pick(rng, CHKTYPE_VALUES, num_records),
+        'MSGLOG': _pick_by_type(rng, NORMAL_MSGLOG_VALUES, ALARM_MSGLOG_VALUES, is_alarm),
+        'CDATE': pd.Timestamp(start_date) + pd.to_timedelta(offset, unit='ms'),
+        'MSGTYPE': _pick_by_type(rng, NORMAL_MSGTYPE_VALUES, ALARM_MSGTYPE_VALUES, is_alarm),
+        'PLCCODE': np.concatenate(codes)[order].astype(np.int16),
+    })
+    registers = rng.integers(0, 10_001, size=(len(REGISTER_COLUMNS), num_records), dtype=np.int32)
+    if monitor_text:
+        df_logs['MONITORDATA'] = generate_monitor_data(registers)
+    else:
+        for col, values in zip(REGISTER_COLUMNS, registers):
+            df_logs[col] = values
+    return df_logs
+
+def _mock_seed(start_date, end_date):
+    """Same range, same rows: every fetch over one range sees one consistent mock dataset."""
+    return [int(f"{start_date:%Y%m%d%H%M%S}"), int(f"{end_date:%Y%m%d%H%M%S}")]
+
+def load_range(start_date, end_date):
+    """Mock equivalent of database.load_range: a midnight end date covers that whole day."""
+    end_date_inclusive = end_date
+    if end_date.hour == 0 and end_date.minute == 0 and end_date.second == 0:
+        end_date_inclusive = end_date + timedelta(days=1) - timedelta(seconds=1)
+    return {'start_date': start_date, 'end_date': end_date_inclusive, 'end_inclusive': True}
+
+def _page_key(df_logs):
+    """ASRS as compared by query_builder.page_key_column (NULL lines are -1)."""
+    return pd.to_numeric(df_logs['ASRS'], errors='coerce').fillna(-1)
+
+def _key_mask(df_logs, key, newer):
+    cdate, asrs = key
+    line = _page_key(df_logs)
+    if newer:
+        return (df_logs['CDATE'] > cdate) | ((df_logs['CDATE'] == cdate) & (line > asrs))
+    return (df_logs['CDATE'] < cdate) | ((df_logs['CDATE'] == cdate) & (line <= asrs))
+
+def _filter_mask(df_logs, start_date=None, end_date=None, srms=None, plccodes=None,
+                 plccode_min=None, plccode_max=None, end_inclusive=True, key_from=None, key_before=None):
+    """pandas version of query_builder.build_where."""
+    mask = pd.Series(True, index=df_logs.index)
+    if start_date is not None:
+        mask &= df_logs['CDATE'] >= start_date
+    if end_date is not None:
+        mask &= (df_logs['CDATE'] <= end_date) if end_inclusive else (df_logs['CDATE'] < end_date)
+    srm_list = as_value_list(srms)
+    if srm_list:
+        mask &= df_logs['ASRS'].isin(srm_list)
+    plccode_list = as_value_list(plccodes)
+    if plccode_list:
+        mask &= df_logs['PLCCODE'].isin(plccode_list)
+    if plccode_min is not None:
+        mask &= df_logs['PLCCODE'] >= int(plccode_min)
+    if plccode_max is not None:
+        mask &= df_logs['PLCCODE'] <= int(plccode_max)
+    if key_from is not None:
+        mask &= _key_mask(df_logs, key_from, newer=False)
+    if key_before is not None:
+        mask &= _key_mask(df_logs, key_before, newer=True)
+    return mask
+
+def fetch_logs(columns=None, **filters):
+    """Mock implementation of fetch_logs: generates the range, then applies the same filters in pandas."""
+    start_date = filters.get('start_date') or (datetime.now() - timedelta(days=7))
+    end_date = filters.get('end_date') or datetime.now()
+    df_logs = generate_mock_data(start_date, end_date, seed=_mock_seed(start_date, end_date))
+    
+    columns = list(columns or LOG_COLUMNS)
+    if 'MONITORDATA' in columns and 'MONITORDATA' not in df_logs.columns:
+        # Registers were generated as columns; they stand in for the MONITORDATA text
+        columns = [col for col in columns if col != 'MONITORDATA'] + REGISTER_COLUMNS
+    df_logs = df_logs.loc[_filter_mask(df_logs, **filters), columns].reset_index(drop=True)
+    
+    # Same load-time normalization as the real loader (registers from MONITORDATA, compact dtypes)
+    return normalize_logs(df_logs)
+
+def count_logs(columns=None, **filters):
+    """Mock implementation of count_logs."""
+    return len(fetch_logs(columns=['CDATE'], **filters))
+
+def fetch_page(key=None, offset=0, limit=100, columns=None, **filters):
+    """Mock implementation of fetch_page: the filtered range in query_builder.page_order, then one slice."""
+    df_logs = fetch_logs(key_from=key, **filters)
+    order = pd.DataFrame({'CDATE': df_logs['CDATE'], 'ASRS': _page_key(df_logs),
+                          'PLCCODE': pd.to_numeric(df_logs['PLCCODE'], errors='coerce'),
+                          'BARCODE': df_logs['BARCODE'].astype(str)})
+    order = order.sort_values(['CDATE', 'ASRS', 'PLCCODE', 'BARCODE'], ascending=False, kind='stable')
+    df_logs = df_logs.iloc[order.index[offset:offset + limit]]
+    return df_logs[list(columns or df_logs.columns)].reset_index(drop=True)
+
+def count_logs_by(group_by, columns=None, **filters):
+    """Mock implementation of count_logs_by."""
+    df_logs = fetch_logs(columns=[group_by], **filters)
+    counts = df_logs[group_by].dropna().astype(int).value_counts().rename_axis(group_by).reset_index(name='Count')
+    return counts
 
 def load_data(start_date=None, end_date=None):
     """Mock implementation of load_data function."""
+    loaded_range = (start_date, end_date) if start_date is not None and end_date is not None else None
     try:
         # Determine date filter based on parameters
         if start_date is not None and end_date is not None:
@@ -166,43 +248,8 @@ def load_data(start_date=None, end_date=None):
             end_date = datetime.now()
             print(f"Using default dates: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         
-        # Generate mock data specifically for this date range
-        # Adjust end_date to include the full day
-        end_date_inclusive = end_date
-        if end_date.hour == 0 and end_date.minute == 0 and end_date.second == 0:
-            end_date_inclusive = end_date + timedelta(days=1) - timedelta(seconds=1)
-            
-        mock_data = generate_mock_data(start_date, end_date_inclusive)
-        df_logs = pd.DataFrame(mock_data)
-        
-        # Parse the monitor data
-        parsed_data = []
-        for monitor_data in df_logs['MONITORDATA']:
-            parsed_data.append(parse_monitor_data(monitor_data))
-        
-        # Convert parsed data to DataFrame
-        monitor_df = pd.DataFrame(parsed_data)
-        
-        # Ensure all columns from D_REGISTER_MEANINGS exist in monitor_df
-        for register_name in D_REGISTER_MEANINGS.values():
-            if register_name not in monitor_df.columns:
-                monitor_df[register_name] = pd.NA
-        
-        # Combine the DataFrames
-        if not monitor_df.empty:
-            # Make sure all numeric columns are actually numeric
-            for col in monitor_df.columns:
-                monitor_df[col] = pd.to_numeric(monitor_df[col], errors='coerce')
-            
-            df_logs = pd.concat([df_logs, monitor_df], axis=1)
-        
-        # Ensure ASRS and PLCCODE are numeric
-        df_logs['ASRS'] = pd.to_numeric(df_logs['ASRS'], errors='coerce')
-        df_logs['PLCCODE'] = pd.to_numeric(df_logs['PLCCODE'], errors='coerce')
-        
-        # Drop MONITORDATA as it's no longer needed
-        if 'MONITORDATA' in df_logs.columns:
-            df_logs = df_logs.drop(columns=['MONITORDATA'])
+        # Generate mock data specifically for this date range (end date covers the full day)
+        df_logs = fetch_logs(**load_range(start_date, end_date))
         
         # Initialize pagination state if not already set
         if 'page_logs' not in state:
@@ -214,7 +261,8 @@ def load_data(start_date=None, end_date=None):
         if 'status_logs' not in state:
             state['status_logs'] = 'All'
         
-        state['df_logs'] = df_logs
+        use_dataset(loaded_range)
+        publish_logs(loaded_range, df_logs)
         
         # Determine date info for logging
         if start_date is not None and end_date is not None:
@@ -231,4 +279,45 @@ def load_data(start_date=None, end_date=None):
         print(f"Error loading mock data: {str(e)}")
         import traceback
         traceback.print_exc()
-        return False
\ No newline at end of file
+        return False
+
+def load_data_stream(start_date, end_date, on_progress=None, cancel_event=None, chunksize=LOAD_CHUNK_ROWS):
+    """Mock implementation of load_data_stream: generates the range, then hands it over chunk by chunk."""
+    try:
+        df_logs = fetch_logs(**load_range(start_date, end_date))
+        chunks = (df_logs.iloc[i:i + chunksize] for i in range(0, max(len(df_logs), 1), chunksize))
+        
+        df_logs = publish_chunks(chunks, len(df_logs), (start_date, end_date), on_progress, cancel_event)
+        if df_logs is None:
+            print(f"Mock load cancelled for range {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
+            return False
+        print(f"Mock data loaded for range {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}. Data Row: {len(df_logs)}")
+        return True
+    except Exception as e:
+        print(f"Error loading mock data: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def load_data_tail(start_date, end_date):
+    """Mock implementation of load_data_tail: rows "arrive" at MOCK_CONFIG's rate between the watermark and now."""
+    since = tail_start((start_date, end_date))
+    if since is None:
+        return load_data(start_date=start_date, end_date=end_date)
+    try:
+        query_range = load_range(start_date, end_date)
+        upper = min(datetime.now(), query_range['end_date'])
+        if upper <= since:
+            df_new = generate_mock_data(since, since, num_records=0)
+        else:
+            df_new = generate_mock_data(since, upper, seed=_mock_seed(since, upper))
+        df_new = normalize_logs(df_new)
+        
+        added = publish_tail(df_new, since)
+        print(f"Mock tail refresh for range {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}: {added} new rows. Data Row: {len(state['df_logs'])}")
+        return True
+    except Exception as e:
+        print(f"Error refreshing mock data: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
@@ -0,0 +1,208 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Dictionary mapping D registers to their meanings
+D_REGISTER_MEANINGS = {
+    'D174': 'Command_X_Pos (D174)',
+    'D57':  'X_Distance_mm (D57)',
+    'D130': 'Start_Bank (D130)',
+    'D131': 'Start_Pos_mm (D131)',
+    'D133': 'Start_Level_mm (D133)',
+    'D134': 'End_Bank (D134)',
+    'D135': 'End_Position_mm (D135)',
+    'D137': 'End_Level_mm (D137)',
+    'D138': 'Pallet_ID (D138)',
+    'D140': 'Present_Bay_Arm1 (D140)',
+    'D145': 'Present_Level (D145)',
+    'D146': 'Status_Arm1 (D146)',
+    'D147': 'Status (D147)',
+    'D148': 'Command Machine (D148)',
+}
+
+REGISTER_COLUMNS = list(D_REGISTER_MEANINGS.values())
+
+# API-style names for the same registers (md_D57, md_D130, ...)
+MD_COLUMNS = {f"md_{register}": label for register, label in D_REGISTER_MEANINGS.items()}
+
+# Rows are tokenized in blocks so the byte buffers stay bounded on month-long ranges
+PARSE_CHUNK_ROWS = 200_000
+
+# Longest digit run that can't overflow int64; longer values are decoded one by one
+_MAX_DIGITS = 18
+_INT64_MAX = np.iinfo(np.int64).max
+
+_ROW_SEP = 0      # '\x00' between rows
+_EQUALS = ord('=')
+_LETTER_D = ord('D')
+_ZERO = ord('0')
+
+# Register number -> column position in REGISTER_COLUMNS (-1 for registers we don't keep)
+_REGISTER_NUMBERS = np.array([int(k[1:]) for k in D_REGISTER_MEANINGS], dtype=np.int64)
+_REGISTER_DIGITS = len(str(_REGISTER_NUMBERS.max()))
+_REGISTER_LOOKUP = np.full(10 ** _REGISTER_DIGITS, -1, dtype=np.int64)
+_REGISTER_LOOKUP[_REGISTER_NUMBERS] = np.arange(len(_REGISTER_NUMBERS))
+
+def parse_monitor_data(monitor_data):
+    """Parse a single MONITORDATA value (per-row path, kept for ad-hoc use and benchmarks)."""
+    if pd.isna(monitor_data) or not isinstance(monitor_data, str):
+        return {}
+
+    # Regular expression to extract D register values (ASCII digits, as the PLC writes them)
+    pattern = r'D(\d+)=(\d+)'
+    matches = re.findall(pattern, monitor_data, flags=re.ASCII)
+
+    # Create dictionary of D register values
+    d_values = {}
+    for register, value in matches:
+        d_key = f'D{register}'
+        if d_key in D_REGISTER_MEANINGS:
+            # Use the meaningful name as the key
+            d_values[D_REGISTER_MEANINGS[d_key]] = int(value.strip())
+
+    return d_values
+
+def _digit_run_values(buf, starts, lengths):
+    """Decode the decimal digit runs buf[starts:starts+lengths] into int64, one digit position at a time."""
+    values = np.zeros(len(starts), dtype=np.int64)
+    if len(starts) == 0:
+        return values
+    last = len(buf) - 1
+    for offset in range(int(lengths.max())):
+        digits = buf[np.minimum(starts + offset, last)].astype(np.int64) - _ZERO
+        values = np.where(lengths > offset, values * 10 + digits, values)
+    return values
+
+def _long_run_values(buf, starts, lengths):
+    """Decode digit runs too long for _digit_run_values; -1 where the value doesn't fit int64."""
+    values = np.empty(len(starts), dtype=np.int64)
+    for i, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+        value = int(buf[start:start + length].tobytes())
+        values[i] = value if value <= _INT64_MAX else -1
+    return values
+
+def _tokenize_chunk(texts):
+    """
+    Find every 'D<reg>=<value>' token in a block of rows with one pass over a joined byte buffer.
+    Same matching rules as parse_monitor_data: the register is looked up by its digits as written
+    (D057 is not D57), and values of any length are read. Values beyond int64 are left out (with
+    a warning) since the register columns are Int64. Returns (row, column, value) arrays in text order.
+    """
+    joined = '\x00'.join(texts)
+    if joined.count('\x00') != len(texts) - 1:
+        # NULs inside a value would split rows; they can't be part of a token anyway
+        joined = '\x00'.join(t.replace('\x00', ' ') for t in texts)
+    # Trailing separator doubles as the sentinel after the last value
+    buf = np.frombuffer((joined + '\x00').encode('utf-8', 'replace'), dtype=np.uint8)
+    empty = np.empty(0, dtype=np.int64)
+
+    # Positions of every non-digit byte; digit runs are the gaps between consecutive entries
+    non_digit = np.flatnonzero((buf - _ZERO) > 9)
+    marks = buf[non_digit]
+    eq = np.flatnonzero(marks[1:-1] == _EQUALS) + 1
+    if len(eq) == 0:
+        return empty, empty, empty
+
+    # Register number is the run just before '=', value is the run just after it
+    key_starts = non_digit[eq - 1] + 1
+    key_lengths = non_digit[eq] - key_starts
+    val_starts = non_digit[eq] + 1
+    val_lengths = non_digit[eq + 1] - val_starts
+    keep = (
+        (marks[eq - 1] == _LETTER_D)
+        & (key_lengths > 0) & (key_lengths <= _REGISTER_DIGITS)
+        & ((key_lengths == 1) | (buf[np.minimum(key_starts, len(buf) - 1)] != _ZERO))
+        & (val_lengths > 0)
+    )
+
+    columns = _REGISTER_LOOKUP[_digit_run_values(buf, key_starts[keep], key_lengths[keep])]
+    wanted = columns >= 0
+    hits = eq[keep][wanted]
+    columns = columns[wanted]
+    val_starts = val_starts[keep][wanted]
+    val_lengths = val_lengths[keep][wanted]
+
+    rows = np.cumsum(marks == _ROW_SEP)[hits]
+    short = val_lengths <= _MAX_DIGITS
+    values = np.empty(len(hits), dtype=np.int64)
+    values[short] = _digit_run_values(buf, val_starts[short], val_lengths[short])
+    if not short.all():
+        values[~short] = _long_run_values(buf, val_starts[~short], val_lengths[~short])
+        fits = values >= 0
+        if not fits.all():
+            print(f"MONITORDATA: {int((~fits).sum())} register value(s) beyond int64 left empty")
+            rows, columns, values = rows[fits], columns[fits], values[fits]
+    return rows, columns, values
+
+def parse_monitor_column(monitor_data: pd.Series, chunk_rows: int = PARSE_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Vectorized replacement for `monitor_data.apply(parse_monitor_data)`.
+    Returns one nullable Int64 column per D_REGISTER_MEANINGS entry, aligned to monitor_data's index.
+    """
+    n_rows = len(monitor_data)
+    n_cols = len(REGISTER_COLUMNS)
+    values = np.zeros((n_cols, n_rows), dtype=np.int64)
+    missing = np.ones((n_cols, n_rows), dtype=bool)
+
+    raw = monitor_data.tolist()
+    for offset in range(0, n_rows, chunk_rows):
+        texts = [v if isinstance(v, str) else '' for v in raw[offset:offset + chunk_rows]]
+        rows, cols, vals = _tokenize_chunk(texts)
+        rows += offset
+        values[cols, rows] = vals
+        missing[cols, rows] = False
+
+        # A register repeated within one row: the last occurrence wins, like the dict in parse_monitor_data
+        clash = np.flatnonzero(values[cols, rows] != vals)
+        for i in clash:
+            last = np.flatnonzero((rows == rows[i]) & (cols == cols[i]))[-1]
+            values[cols[i], rows[i]] = vals[last]
+
+    return pd.DataFrame(
+        {name: pd.arrays.IntegerArray(values[i], missing[i]) for i, name in enumerate(REGISTER_COLUMNS)},
+        index=monitor_data.index,
+    )
+
+def add_register_columns(df: pd.DataFrame, source: str = 'MONITORDATA', drop_source: bool = True) -> pd.DataFrame:
+    """Parse df[source] and write the register values into df as typed integer columns."""
+    if df is None or source not in df.columns:
+        return df
+    registers = parse_monitor_column(df[source])
+    for name in registers.columns:
+        df[name] = registers[name]
+    if drop_source:
+        df = df.drop(columns=[source])
+    return df
+
+def normalize_register_columns(df: pd.DataFrame, source: str = 'MONITORDATA') -> pd.DataFrame:
+    """
+    Bring the registers of a frame into REGISTER_COLUMNS in one pass, whatever shape it came in:
+    md_* columns are renamed (text like 'D57=31373' keeps the number), registers that are still
+    missing are parsed from `source`, which is then dropped. Frames without any register data
+    (projected queries) are left alone.
+    """
+    if df is None:
+        return df
+    renames = {md: label for md, label in MD_COLUMNS.items() if md in df.columns}
+    if renames:
+        df = df.rename(columns=renames)
+    if source not in df.columns and not any(col in df.columns for col in REGISTER_COLUMNS):
+        return df
+
+    for col in REGISTER_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            text = df[col].astype('string').str.rsplit('=', n=1).str[-1].str.strip()
+            df[col] = pd.to_numeric(text, errors='coerce').astype('Int64')
+
+    if source in df.columns:
+        incomplete = [col for col in REGISTER_COLUMNS if col not in df.columns or df[col].isna().any()]
+        if incomplete:
+            parsed = parse_monitor_column(df[source])
+            for col in incomplete:
+                df[col] = df[col].fillna(parsed[col]) if col in df.columns else parsed[col]
+        df = df.drop(columns=[source])
+
+    for col in REGISTER_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.array([pd.NA] * len(df), dtype='Int64')
+    return df
@@ -0,0 +1,210 @@
+"""
+Keyset paging over LogMnpAsrs for the details tab.
+
+Pages are read from the server one at a time in query_builder.page_order (newest first). A page
+starts at a cursor {'key': (CDATE, ASRS), 'skip': n}: the rows at or after that key, minus the
+n rows sharing the key that earlier pages already showed. Moving to the next page only needs the
+last row of the current one, so no query ever scans more than a page past its cursor. Jumping to
+an arbitrary page bisects CDATE with COUNTs the server answers from its CDATE index (like
+position_at) until a page-sized window holds the row before it, then reads that window by key.
+"""
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+import pandas as pd
+from src.data_source import fetch_page, count_logs
+from src import tasks
+
+# Pages kept in memory per pager (current, neighbours, a recently visited one)
+PAGE_CACHE_PAGES = 4
+
+# Above any ASRS, so key_before=(t, _MAX_ASRS) means "CDATE after t"
+_MAX_ASRS = 2 ** 31 - 1
+# CDATE resolution; a seek window narrower than this can't be split further
+_TICK = timedelta(milliseconds=1)
+
+def row_key(row_cdate, row_asrs):
+    """(CDATE, ASRS) page key of a row, in the form the queries bind."""
+    asrs = -1 if pd.isna(row_asrs) else int(row_asrs)
+    return pd.Timestamp(row_cdate).to_pydatetime(), asrs
+
+def _keys(df_page):
+    asrs = pd.to_numeric(df_page['ASRS'], errors='coerce').fillna(-1).astype(int).tolist()
+    return [(pd.Timestamp(c).to_pydatetime(), a) for c, a in zip(df_page['CDATE'].tolist(), asrs)]
+
+def next_cursor(cursor, df_page):
+    """Cursor of the page after df_page, which was read from `cursor`."""
+    keys = _keys(df_page)
+    last = keys[-1]
+    skip = sum(1 for key in keys if key == last)
+    if cursor is not None and cursor['key'] == last:
+        # The whole page shared the cursor's key; the rows skipped to reach it are still behind us
+        skip += cursor['skip']
+    return {'key': last, 'skip': skip}
+
+def read_page(filters, cursor, rows_per_page, columns=None):
+    """The page starting at cursor (None: the first page)."""
+    if cursor is None:
+        return fetch_page(limit=rows_per_page, columns=columns, **filters)
+    return fetch_page(key=cursor['key'], offset=cursor['skip'], limit=rows_per_page, columns=columns, **filters)
+
+def iter_pages(filters, rows_per_page, columns=None):
+    """
+    Every row matching filters, one keyset page at a time in page order. Used by exports, so a
+    million-row export never holds more than one page.
+    """
+    cursor = None
+    while True:
+        df_page = read_page(filters, cursor, rows_per_page, columns)
+        if len(df_page) == 0:
+            return
+        yield df_page
+        if len(df_page) < rows_per_page:
+            return
+        cursor = next_cursor(cursor, df_page)
+
+class KeysetPager:
+    """
+    Page source for one set of filters (build_where arguments). The total comes from a COUNT query;
+    pages are fetched on demand, cached (PAGE_CACHE_PAGES), and with a page the neighbours of the
+    page being shown are prefetched on the task pool (key 'prefetch', src/tasks.py) so next/previous
+    don't wait for the server. A newer prefetch, e.g. from the pager that replaces this one when the
+    filters change, supersedes one that hasn't started.
+    """
+
+    def __init__(self, filters, rows_per_page, columns=None, page=None):
+        self.filters = dict(filters)
+        self.page = page
+        self.rows_per_page = rows_per_page
+        self.columns = columns
+        self.total = count_logs(**self.filters)
+        self.cursors = {0: None}
+        self.pages = OrderedDict()
+        self.stats = {'fetched': 0, 'prefetched': 0, 'cache_hits': 0, 'located': 0}
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    @property
+    def total_pages(self):
+        return max(1, (self.total + self.rows_per_page - 1) // self.rows_per_page)
+
+    def cursor(self, page_no):
+        """Cursor of page_no: remembered from a neighbouring page, or located with _seek."""
+        with self._lock:
+            if page_no in self.cursors:
+                return self.cursors[page_no]
+        position = page_no * self.rows_per_page
+        if position > self.total:
+            return None
+        key = self._seek(position - 1)
+        if key is None:
+            return None
+        # Rows sharing the key that come before the page = position minus rows strictly before the key
+        cursor = {'key': key, 'skip': position - count_logs(key_before=key, **self.filters)}
+        with self._lock:
+            self.cursors[page_no] = cursor
+            self.stats['located'] += 1
+        return cursor
+
+    def _rows_after(self, timestamp):
+        """Rows newer than timestamp = page position of its first row."""
+        return count_logs(key_before=row_key(timestamp, _MAX_ASRS), **self.filters)
+
+    def _seek(self, target):
+        """
+        Key of the row at page position target, without OFFSET: bisect CDATE over (lo, hi] with
+        _rows_after(hi) <= target < _rows_after(lo) until the window holds at most a page of rows
+        (or one CDATE tick), then read the window from hi by key.
+        """
+        newest = fetch_page(limit=1, columns=['CDATE', 'ASRS'], **self.filters)
+        if len(newest) == 0:
+            return None
+        hi, n_hi = pd.Timestamp(newest['CDATE'].iloc[0]), 0
+        lo = self.filters.get('start_date')
+        lo = pd.Timestamp(lo) - _TICK if lo is not None else hi - timedelta(days=1)
+        n_lo = self._rows_after(lo)
+        while n_lo <= target:
+            # No lower bound in the filters: widen downwards until the row is inside
+            if hi - lo > timedelta(days=36500):
+                return None
+            lo = hi - (hi - lo) * 2
+            n_lo = self._rows_after(lo)
+        while n_lo - n_hi > self.rows_per_page and hi - lo > _TICK:
+            mid = (lo + (hi - lo) / 2).floor('ms')
+            if mid <= lo:
+                mid = lo + _TICK
+            n_mid = self._rows_after(mid)
+            if n_mid <= target:
+                hi, n_hi = mid, n_mid
+            else:
+                lo, n_lo = mid, n_mid
+        window = fetch_page(key=row_key(hi, _MAX_ASRS), limit=target - n_hi + 1,
+                            columns=['CDATE', 'ASRS'], **self.filters)
+        if len(window) < target - n_hi + 1:
+            return None
+        return row_key(window['CDATE'].iloc[-1], window['ASRS'].iloc[-1])
+
+    def position_at(self, timestamp):
+        """Position of the first row at or before timestamp: a COUNT the server answers from its CDATE index."""
+        return self._rows_after(timestamp)
+
+    def _fetch(self, page_no):
+        cursor = self.cursor(page_no)
+        df_page = read_page(self.filters, cursor, self.rows_per_page, self.columns)
+        with self._lock:
+            if len(df_page):
+                self.cursors[page_no + 1] = next_cursor(cursor, df_page)
+            self.pages[page_no] = df_page
+            self.pages.move_to_end(page_no)
+            while len(self.pages) > PAGE_CACHE_PAGES:
+                self.pages.popitem(last=False)
+        return df_page
+
+    def _load(self, page_no, prefetch=False):
+        """Fetch page_no once, even if the UI thread and a prefetch ask for it at the same time."""
+        with self._lock:
+            if page_no in self.pages:
+                self.pages.move_to_end(page_no)
+                if not prefetch:
+                    self.stats['cache_hits'] += 1
+                return self.pages[page_no]
+            event = self._loading.get(page_no)
+            owner = event is None
+            if owner:
+                event = self._loading[page_no] = threading.Event()
+        if not owner:
+            event.wait()
+            with self._lock:
+                if page_no in self.pages:
+                    return self.pages[page_no]
+            return self._load(page_no, prefetch)
+        try:
+            df_page = self._fetch(page_no)
+            with self._lock:
+                self.stats['prefetched' if prefetch else 'fetched'] += 1
+            return df_page
+        finally:
+            with self._lock:
+                del self._loading[page_no]
+            event.set()
+
+    def get(self, page_no):
+        """Rows of page_no (clamped to the last page); starts prefetching its neighbours."""
+        page_no = max(0, min(page_no, self.total_pages - 1))
+        df_page = self._load(page_no)
+        self.prefetch([page_no + 1, page_no - 1])
+        return df_page
+
+    def prefetch(self, page_nos):
+        wanted = [p for p in page_nos if 0 <= p < self.total_pages]
+        with self._lock:
+            wanted = [p for p in wanted if p not in self.pages and p not in self._loading]
+        if wanted and self.page is not None:
+            tasks.submit(self.page, 'prefetch', lambda: self._prefetch(wanted), update=False)
+
+    def _prefetch(self, page_nos):
+        for page_no in page_nos:
+            try:
+                self._load(page_no, prefetch=True)
+            except Exception as e:
+                print(f"Prefetch of page {page_no + 1} failed: {str(e)}")
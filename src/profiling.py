@@ -0,0 +1,140 @@
+"""
+Opt-in profiling of user actions (date search, filter change, tab switch, export).
+
+With profiling on (ASRS_PROFILE=1, or POST /admin/profiling?enabled=true on the app's port), each
+action handler runs under cProfile and tracemalloc, and so does the background work it submits
+(src/tasks.py tasks, export jobs), labelled "<action>.<task>". Every profiled block writes two
+files to PROFILE_CONFIG['directory'], named after the time, session, label, loaded date range and
+row count:
+
+    <name>.prof   cProfile stats (python -m pstats, snakeviz, ...)
+    <name>.txt    top functions by cumulative time and the top allocations made during the block
+
+Off, the decorators cost one dict lookup per call.
+"""
+import contextvars
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_CONFIG = {
+    'enabled': os.environ.get('ASRS_PROFILE', '0') == '1',
+    'directory': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'profiles'),
+    'sort': 'cumulative',       # pstats sort key for the .txt report
+    'functions': 40,            # functions listed in the .txt report
+    'allocations': 25,          # allocation sites listed in the .txt report
+    'traceback_frames': 1,      # frames tracemalloc keeps per allocation
+}
+
+# Action a piece of work was started by; tasks and export jobs inherit it with the context
+_action = contextvars.ContextVar('asrs_profile_action', default=None)
+
+def set_enabled(enabled):
+    """Admin toggle. Turning profiling off also stops tracemalloc."""
+    PROFILE_CONFIG['enabled'] = bool(enabled)
+    if not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def action(name):
+    """Decorator for event handlers: profile each call as user action `name`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILE_CONFIG['enabled']:
+                return fn(*args, **kwargs)
+            token = _action.set(name)
+            try:
+                with _profiled(name):
+                    return fn(*args, **kwargs)
+            finally:
+                _action.reset(token)
+        return wrapper
+    return decorate
+
+@contextmanager
+def work(name):
+    """Profile background work if it was submitted by a profiled action."""
+    started_by = _action.get()
+    if started_by is None or not PROFILE_CONFIG['enabled']:
+        yield
+        return
+    with _profiled(f"{started_by}.{name}"):
+        yield
+
+@contextmanager
+def _profiled(label):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(PROFILE_CONFIG['traceback_frames'])
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one active cProfile per process; this block only gets allocations
+        profiler = None
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+        try:
+            _write_report(label, seconds, profiler, before, tracemalloc.take_snapshot())
+        except Exception as e:
+            print(f"Could not write profile of {label}: {str(e)}")
+
+def _slug(value):
+    return re.sub(r'[^0-9A-Za-z._-]+', '-', str(value)).strip('-') or 'none'
+
+def _tags(label):
+    from src.state import state, snapshot, session_id
+    date_range = state.get('date_range')
+    df_logs = snapshot().df_logs
+    return {
+        'session': session_id(),
+        'action': label,
+        'date_range': f"{date_range[0]:%Y%m%d}-{date_range[1]:%Y%m%d}" if date_range else None,
+        'rows': 0 if df_logs is None else len(df_logs),
+    }
+
+def _top_allocations(before, after):
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen importlib._bootstrap>')]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+    return [stat for stat in diff if stat.size_diff > 0][:PROFILE_CONFIG['allocations']]
+
+def _write_report(label, seconds, profiler, before, after):
+    tags = _tags(label)
+    name = '_'.join([time.strftime('%Y%m%d-%H%M%S'), _slug(tags['session']), _slug(label),
+                     _slug(tags['date_range']), f"{tags['rows']}rows"])
+    os.makedirs(PROFILE_CONFIG['directory'], exist_ok=True)
+    path = os.path.join(PROFILE_CONFIG['directory'], name)
+
+    report = io.StringIO()
+    for key, value in tags.items():
+        report.write(f"{key}: {value}\n")
+    report.write(f"seconds: {seconds:.3f}\n\n")
+    if profiler is not None:
+        profiler.dump_stats(f"{path}.prof")
+        pstats.Stats(profiler, stream=report).sort_stats(PROFILE_CONFIG['sort']).print_stats(PROFILE_CONFIG['functions'])
+    else:
+        report.write("cProfile was busy with another block; allocations only\n")
+    report.write("Top allocations (net, other threads included):\n")
+    for stat in _top_allocations(before, after):
+        report.write(f"{stat}\n")
+    with open(f"{path}.txt", 'w', encoding='utf-8') as out:
+        out.write(report.getvalue())
+    print(f"Profile of {label} ({seconds:.2f}s) written to {path}.txt")
+
+def list_reports():
+    """Report files in PROFILE_CONFIG['directory'], newest first."""
+    directory = PROFILE_CONFIG['directory']
+    if not os.path.isdir(directory):
+        return []
+    return sorted((f for f in os.listdir(directory) if f.endswith('.txt')), reverse=True)
@@ -0,0 +1,205 @@
+from datetime import datetime
+
+LOGS_TABLE = "[WCSLOG].[dbo].[LogMnpAsrs]"
+
+# Every column load_data has historically pulled from LogMnpAsrs
+LOG_COLUMNS = ['ASRS', 'BARCODE', 'CHKTYPE', 'MSGLOG', 'CDATE', 'MSGTYPE', 'PLCCODE', 'MONITORDATA']
+
+# Columns each view actually reads (registers come from MONITORDATA)
+VIEW_COLUMNS = {
+    'logs': LOG_COLUMNS,
+    'chart': ['ASRS', 'CDATE', 'PLCCODE'],
+    'statistics': ['ASRS', 'PLCCODE'],
+    'before_alarm': ['ASRS', 'BARCODE', 'CDATE', 'PLCCODE', 'MONITORDATA'],
+}
+
+# PLCCODE above 100 is an alarm everywhere in the UI
+ALARM_PLCCODE_MIN = 101
+
+def int_column(column, dialect='mssql'):
+    """
+    SQL expression for a padded varchar column compared as an integer (ASRS, PLCCODE). Blank values
+    are NULL, as in the loaded frame (both servers would otherwise cast '' to 0).
+    """
+    if dialect == 'sqlite':
+        return f"CAST(NULLIF(TRIM([{column}]), '') AS INTEGER)"
+    return f"TRY_CAST(NULLIF(LTRIM(RTRIM([{column}])), '') AS INT)"
+
+def as_value_list(values):
+    if values is None or values == "All":
+        return None
+    if isinstance(values, (str, int)):
+        values = [values]
+    values = [int(v) for v in values if v != "All"]
+    return values or None
+
+def page_key_column(dialect='mssql'):
+    """ASRS as the keyset tie-breaker after CDATE; NULL/unparseable lines sort as -1 instead of vanishing."""
+    return f"COALESCE({int_column('ASRS', dialect)}, -1)"
+
+def sqlite_cdate(value):
+    """
+    CDATE as the SQLite stand-in stores it (src/sqlite_wcslog.py). SQLite has no datetime type, so
+    CDATE is fixed-width 'YYYY-MM-DD HH:MM:SS.fff' text, which compares and sorts like the datetime.
+    """
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+def _cdate_value(value, dialect):
+    # Bound CDATE values on SQLite are text in the stored format (sqlite3 can't bind pd.Timestamp either)
+    return sqlite_cdate(value) if dialect == 'sqlite' else value
+
+def _cdate_param(name, dialect):
+    # SQL Server datetime keeps 1/300 s: casting the bound value to the column type makes a CDATE read
+    # back from a page compare equal to the stored value instead of slightly above or below it
+    if dialect == 'sqlite':
+        return f":{name}"
+    return f"CAST(:{name} AS DATETIME)"
+
+def _key_predicate(name, operator, key, params, dialect):
+    """(CDATE, ASRS) row-value comparison, e.g. operator '<=' for "at or after key in page order"."""
+    cdate, asrs = key
+    params[f'{name}_cdate'] = _cdate_value(cdate, dialect)
+    params[f'{name}_asrs'] = int(asrs)
+    cdate_param = _cdate_param(f'{name}_cdate', dialect)
+    return (f"([CDATE] {operator[0]} {cdate_param} OR "
+            f"([CDATE] = {cdate_param} AND {page_key_column(dialect)} {operator} :{name}_asrs))")
+
+def build_where(start_date: datetime | None = None, end_date: datetime | None = None,
+                srms=None, plccodes=None, plccode_min=None, plccode_max=None,
+                end_inclusive=True, key_from=None, key_before=None, dialect='mssql'):
+    """
+    WHERE clause shared by the LogMnpAsrs queries.
+
+    srms / plccodes: a value or list of values ("All" or None means no predicate).
+    plccode_min / plccode_max: inclusive PLCCODE range, e.g. plccode_min=ALARM_PLCCODE_MIN for alarms.
+    key_from / key_before: a (CDATE, ASRS) page key; keep rows at or after it, or strictly before
+    it, in PAGE_ORDER (newest first). Used by keyset paging.
+    Returns (sql, params, expanding) where expanding lists the IN-list parameters.
+    """
+    where = []
+    params = {}
+    expanding = []
+
+    if start_date is not None:
+        where.append("[CDATE] >= :start_date")
+        params['start_date'] = _cdate_value(start_date, dialect)
+    if end_date is not None:
+        where.append("[CDATE] <= :end_date" if end_inclusive else "[CDATE] < :end_date")
+        params['end_date'] = _cdate_value(end_date, dialect)
+
+    srm_list = as_value_list(srms)
+    if srm_list:
+        where.append(f"{int_column('ASRS', dialect)} IN :srms")
+        params['srms'] = srm_list
+        expanding.append('srms')
+
+    plccode_list = as_value_list(plccodes)
+    if plccode_list:
+        where.append(f"{int_column('PLCCODE', dialect)} IN :plccodes")
+        params['plccodes'] = plccode_list
+        expanding.append('plccodes')
+    if plccode_min is not None:
+        where.append(f"{int_column('PLCCODE', dialect)} >= :plccode_min")
+        params['plccode_min'] = int(plccode_min)
+    if plccode_max is not None:
+        where.append(f"{int_column('PLCCODE', dialect)} <= :plccode_max")
+        params['plccode_max'] = int(plccode_max)
+    if key_from is not None:
+        where.append(_key_predicate('key_from', '<=', key_from, params, dialect))
+    if key_before is not None:
+        where.append(_key_predicate('key_before', '>', key_before, params, dialect))
+
+    return ('WHERE ' + ' AND '.join(where) if where else ''), params, expanding
+
+def _statement(sql, expanding):
+    # SQLAlchemy is only needed once a query is built (never with the mock backend)
+    from sqlalchemy import text, bindparam
+    statement = text(sql)
+    if expanding:
+        statement = statement.bindparams(*[bindparam(name, expanding=True) for name in expanding])
+    return statement
+
+def build_logs_query(columns=None, dialect='mssql', table=LOGS_TABLE, **filters):
+    """
+    Bound-parameter SELECT over LogMnpAsrs, newest first.
+    columns: subset of LOG_COLUMNS to return (default: all); filters: see build_where.
+    Returns (statement, params) ready for pd.read_sql(statement, conn, params=params).
+    """
+    columns = list(columns) if columns else list(LOG_COLUMNS)
+    unknown = [c for c in columns if c not in LOG_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown LogMnpAsrs column(s): {unknown}")
+
+    where, params, expanding = build_where(dialect=dialect, **filters)
+    sql = f"""
+        SELECT {','.join(f'[{c}]' for c in columns)}
+        FROM {table}
+        {where}
+        ORDER BY [CDATE] DESC
+    """
+    return _statement(sql, expanding), params
+
+def page_order(dialect='mssql'):
+    """
+    Total order used by keyset pages: the (CDATE, ASRS) key, then PLCCODE and BARCODE so rows sharing
+    a key come back in the same order on every query (the cursor skips them by count).
+    """
+    return (f"[CDATE] DESC, {page_key_column(dialect)} DESC, "
+            f"{int_column('PLCCODE', dialect)} DESC, [BARCODE] DESC")
+
+def build_page_query(key=None, offset=0, limit=100, columns=None, dialect='mssql', table=LOGS_TABLE, **filters):
+    """
+    One keyset page: up to `limit` rows at or after the (CDATE, ASRS) `key` in page order, skipping
+    the first `offset` of them (rows sharing the key that earlier pages already showed).
+    With key=None the offset counts from the newest row (the pager only uses offset within a key).
+    """
+    columns = list(columns) if columns else list(LOG_COLUMNS)
+    unknown = [c for c in columns if c not in LOG_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown LogMnpAsrs column(s): {unknown}")
+
+    where, params, expanding = build_where(dialect=dialect, key_from=key, **filters)
+    params['page_offset'] = int(offset)
+    params['page_limit'] = int(limit)
+    if dialect == 'sqlite':
+        window = "LIMIT :page_limit OFFSET :page_offset"
+    else:
+        window = "OFFSET :page_offset ROWS FETCH NEXT :page_limit ROWS ONLY"
+    sql = f"""
+        SELECT {','.join(f'[{c}]' for c in columns)}
+        FROM {table}
+        {where}
+        ORDER BY {page_order(dialect)}
+        {window}
+    """
+    return _statement(sql, expanding), params
+
+# Columns aggregate queries may group by (both are padded varchar compared as integers)
+GROUP_COLUMNS = ['ASRS', 'PLCCODE']
+
+def build_group_count_query(group_by, dialect='mssql', table=LOGS_TABLE, **filters):
+    """
+    SELECT <group_by>, COUNT(*) AS [Count] ... GROUP BY <group_by>, with the build_where predicates.
+    group_by: one of GROUP_COLUMNS, returned as an integer column of the same name.
+    """
+    if group_by not in GROUP_COLUMNS:
+        raise ValueError(f"Cannot group LogMnpAsrs by {group_by!r}")
+    where, params, expanding = build_where(dialect=dialect, **filters)
+    key = int_column(group_by, dialect)
+    sql = f"""
+        SELECT {key} AS [{group_by}], COUNT(*) AS [Count]
+        FROM {table}
+        {where}
+        GROUP BY {key}
+    """
+    return _statement(sql, expanding), params
+
+def build_count_query(dialect='mssql', table=LOGS_TABLE, **filters):
+    """SELECT COUNT(*) with the same predicates as build_logs_query."""
+    where, params, expanding = build_where(dialect=dialect, **filters)
+    sql = f"""
+        SELECT COUNT(*) AS [ROWS]
+        FROM {table}
+        {where}
+    """
+    return _statement(sql, expanding), params
@@ -0,0 +1,128 @@
+"""
+Local SQLite stand-in for the WCSLOG database.
+
+A SQLite file with a LogMnpAsrs table shaped like the server's: ASRS and PLCCODE are padded
+strings, MONITORDATA is the raw "D174=... D57=..." text, and CDATE is fixed-width text (see
+query_builder.sqlite_cdate). It is filled by the mock generator at production volume, so the
+real src/database.py path (query building, pd.read_sql, MONITORDATA parsing, schema cleaning)
+runs end to end without a network or SQL Server.
+
+    python -m src.sqlite_wcslog seed cache/wcslog.db 2025-01-01 2025-01-31 [--srms 8 --events-per-day 20000]
+    python -m src.sqlite_wcslog stats cache/wcslog.db
+
+The loader uses it when SQLITE_CONFIG['path'] is set (environment variable WCSLOG_SQLITE) and
+main.use_mock_data is False; see benchmarks/bench_sql_pipeline.py.
+"""
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from src.query_builder import LOG_COLUMNS, sqlite_cdate
+
+SQLITE_CONFIG = {
+    'path': os.environ.get('WCSLOG_SQLITE') or None,   # database file; None uses SQL Server (DB_CONFIG)
+    'table': 'LogMnpAsrs',
+    'srms': 8,                  # SRM lines when seeding
+    'events_per_day': 20_000,   # rows per SRM per day when seeding
+    'seed': 0,
+}
+
+# Column widths of the padded string columns (nchar on the server)
+PADDED_WIDTHS = {'ASRS': 4, 'PLCCODE': 5}
+
+def enabled():
+    return bool(SQLITE_CONFIG['path'])
+
+def connection_url(path=None):
+    return f"sqlite:///{os.path.abspath(path or SQLITE_CONFIG['path'])}"
+
+def query_target():
+    """dialect/table arguments for the query_builder functions."""
+    return {'dialect': 'sqlite', 'table': SQLITE_CONFIG['table']}
+
+def create_table(conn, table=None):
+    table = table or SQLITE_CONFIG['table']
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(f'[{c}] TEXT' for c in LOG_COLUMNS)})")
+
+def _server_rows(df_logs):
+    """Generated rows as the server hands them out: padded strings, text CDATE, raw MONITORDATA."""
+    df_rows = df_logs[LOG_COLUMNS].astype(object)
+    for col, width in PADDED_WIDTHS.items():
+        df_rows[col] = df_logs[col].astype(str).str.ljust(width)
+    df_rows['CDATE'] = df_logs['CDATE'].dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+    return df_rows.itertuples(index=False, name=None)
+
+def seed(path, start_date, end_date, srms=None, events_per_day=None, seed=None):
+    """
+    Fill path's LogMnpAsrs with generated rows for the days [start_date, end_date), one day per
+    transaction. Days that already have rows are skipped. Returns the number of rows inserted.
+    """
+    from src.mock_database import generate_mock_data
+    srms = srms or SQLITE_CONFIG['srms']
+    events_per_day = events_per_day or SQLITE_CONFIG['events_per_day']
+    seed = SQLITE_CONFIG['seed'] if seed is None else seed
+    table = SQLITE_CONFIG['table']
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path)
+    try:
+        # Bulk load: no rollback journal or fsync; a crash mid-seed means seeding again
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        create_table(conn)
+        insert = f"INSERT INTO {table} VALUES ({', '.join('?' for _ in LOG_COLUMNS)})"
+        inserted = 0
+        day = datetime(start_date.year, start_date.month, start_date.day)
+        while day < end_date:
+            next_day = day + timedelta(days=1)
+            if conn.execute(f"SELECT 1 FROM {table} WHERE [CDATE] >= ? AND [CDATE] < ? LIMIT 1",
+                            (sqlite_cdate(day), sqlite_cdate(next_day))).fetchone():
+                day = next_day
+                continue
+            started = time.perf_counter()
+            df_logs = generate_mock_data(day, next_day, seed=[seed, day.toordinal()], srms=srms,
+                                         events_per_day=events_per_day, monitor_text=True)
+            with conn:
+                conn.executemany(insert, _server_rows(df_logs))
+            inserted += len(df_logs)
+            print(f"Seeded {day:%Y-%m-%d}: {len(df_logs)} rows in {time.perf_counter() - started:.1f}s")
+            day = next_day
+        # Range loads and pages filter and sort on CDATE, like the server's index
+        conn.execute(f"CREATE INDEX IF NOT EXISTS IX_{table}_CDATE ON {table} ([CDATE])")
+    finally:
+        conn.close()
+    return inserted
+
+def stats(path):
+    """{'rows', 'first', 'last', 'bytes'} of path's LogMnpAsrs."""
+    conn = sqlite3.connect(path)
+    try:
+        rows, first, last = conn.execute(f"SELECT COUNT(*), MIN([CDATE]), MAX([CDATE]) FROM {SQLITE_CONFIG['table']}").fetchone()
+    finally:
+        conn.close()
+    return {'rows': rows, 'first': first, 'last': last, 'bytes': os.path.getsize(path)}
+
+def _main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m src.sqlite_wcslog', description="SQLite stand-in for WCSLOG")
+    commands = parser.add_subparsers(dest='command', required=True)
+    seed_cmd = commands.add_parser('seed', help="generate LogMnpAsrs rows for the days START..END (END excluded)")
+    seed_cmd.add_argument('path')
+    seed_cmd.add_argument('start', type=lambda s: datetime.strptime(s, '%Y-%m-%d'))
+    seed_cmd.add_argument('end', type=lambda s: datetime.strptime(s, '%Y-%m-%d'))
+    seed_cmd.add_argument('--srms', type=int, default=None)
+    seed_cmd.add_argument('--events-per-day', type=int, default=None, help="rows per SRM per day")
+    seed_cmd.add_argument('--seed', type=int, default=None)
+    stats_cmd = commands.add_parser('stats', help="row count and CDATE coverage")
+    stats_cmd.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'seed':
+        started = time.perf_counter()
+        rows = seed(args.path, args.start, args.end, args.srms, args.events_per_day, args.seed)
+        print(f"Inserted {rows} rows in {time.perf_counter() - started:.1f}s")
+    print(stats(args.path))
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(_main())
@@ -1,13 +1,169 @@
 # Global state management
+#
+# The web app serves every browser session from one process, so `state` is not one dict: it
+# resolves to the state of the session whose code is running. Event handlers find their session
+# through Flet's page context, code outside a handler runs in bind_session, and threads started
+# with start_thread inherit either. Scripts and benchmarks (no session) share one default dict.
+#
+# Loaded logs are not copied per session. state['df_logs'], state['tail_watermark'] and
+# state['data_version'] come from the snapshot of src/dataset_cache.py for the range the session
+# holds (state['dataset']), so sessions looking at the same range share one DataFrame. Assigning
+# df_logs or tail_watermark publishes a new snapshot. Code that reads the data more than once
+# should take snapshot() once instead, so it can't mix two versions.
 
-# Global state
-state = {
+import contextvars
+import threading
+from contextlib import contextmanager
+from collections.abc import MutableMapping
+from src import dataset_cache
+
+DEFAULT_STATE = {
     'page_logs': 0,
     'rows_per_page': 100,
-    'line_logs': "All", 
+    'line_logs': "All",
     'status_logs': "All",
     'selected_date': None,
     'end_date': None,
-    'df_logs': None,
-    'filter_choice': "All"
-}
\ No newline at end of file
+    'filter_choice': "All",
+    'dataset': None,
+}
+
+# Read from the session's dataset snapshot, not stored in the session
+SHARED_KEYS = {'df_logs': 'df_logs', 'tail_watermark': 'tail_watermark', 'data_version': 'version'}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_current = contextvars.ContextVar('asrs_session', default=None)
+
+def _new_session(session_id):
+    return {'id': session_id, 'state': dict(DEFAULT_STATE), 'locals': {}}
+
+_default_session = _new_session(None)
+
+def open_session(session_id):
+    """State of session_id, created on first use."""
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            session = _sessions[session_id] = _new_session(session_id)
+    return session
+
+@contextmanager
+def bind_session(session_id):
+    """Run the block (and threads it starts) against session_id's state."""
+    token = _current.set(open_session(session_id))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+def end_session(session_id):
+    """Forget a closed session and release the dataset it held."""
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None)
+    if session is not None:
+        dataset_cache.release(session['state']['dataset'])
+
+def session_count():
+    with _sessions_lock:
+        return len(_sessions)
+
+def _session():
+    session = _current.get()
+    if session is not None:
+        return session
+    import flet as ft
+    page = ft.context.page
+    if page is not None:
+        with _sessions_lock:
+            session = _sessions.get(page.session_id)
+        if session is not None:
+            return session
+    return _default_session
+
+def session_id():
+    """Id of the session whose code is running (None for scripts and benchmarks)."""
+    return _session()['id']
+
+def start_thread(target, daemon=False):
+    """threading.Thread running target in the current session (and Flet page context)."""
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(target,), daemon=daemon)
+    thread.start()
+    return thread
+
+def use_dataset(key):
+    """
+    Point the session at the shared dataset for key (a loaded date range; None for a load that
+    isn't shared), taking a reference to it and releasing the previous one.
+    """
+    session = _session()
+    if key is None:
+        key = ('session', session['id'])
+    held = session['state']['dataset']
+    if held != key:
+        dataset_cache.acquire(key)
+        session['state']['dataset'] = key
+        dataset_cache.release(held)
+    return key
+
+def publish_dataset(**fields):
+    """Swap in a new snapshot of the session's dataset with fields (df_logs, tail_watermark) replaced."""
+    session = _session()
+    return dataset_cache.publish(session['state']['dataset'] or use_dataset(None), **fields)
+
+def snapshot():
+    """The current session's dataset snapshot (dataset_cache.Snapshot; version 0 when nothing is loaded)."""
+    return dataset_cache.snapshot(_session()['state']['dataset'])
+
+def is_current(version):
+    """Whether data of `version` is still what the current session shows (False once a newer load is published)."""
+    return snapshot().version == version
+
+class SessionMapping(MutableMapping):
+    """
+    Dict-like view of the current session's state, or (with name) of a per-session dict
+    initialized from defaults, for module-level caches that must not be shared between sessions.
+    """
+
+    def __init__(self, name=None, defaults=None):
+        self._name = name
+        self._defaults = defaults or {}
+
+    def _data(self):
+        session = _session()
+        if self._name is None:
+            return session['state']
+        data = session['locals'].get(self._name)
+        if data is None:
+            data = session['locals'][self._name] = dict(self._defaults)
+        return data
+
+    def __getitem__(self, key):
+        if self._name is None and key in SHARED_KEYS:
+            return getattr(dataset_cache.snapshot(self._data()['dataset']), SHARED_KEYS[key])
+        return self._data()[key]
+
+    def __setitem__(self, key, value):
+        if self._name is None and key in SHARED_KEYS:
+            if key == 'data_version':
+                raise KeyError("data_version is assigned when df_logs is published")
+            dataset_cache.publish(self._data()['dataset'] or use_dataset(None), **{key: value})
+            return
+        self._data()[key] = value
+
+    def __delitem__(self, key):
+        del self._data()[key]
+
+    def __iter__(self):
+        keys = list(self._data())
+        return iter(keys + [k for k in SHARED_KEYS if k not in keys] if self._name is None else keys)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __contains__(self, key):
+        return (self._name is None and key in SHARED_KEYS) or key in self._data()
+
+# Global state
+state = SessionMapping()
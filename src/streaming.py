@@ -0,0 +1,58 @@
+import threading
+from src.state import state, use_dataset
+from src.incremental import publish_logs
+from src.log_schema import concat_logs
+
+# Rows per chunk read from LogMnpAsrs; the first chunk is enough to fill page 1 of the details tab
+LOAD_CHUNK_ROWS = 20_000
+
+_load_lock = threading.Lock()
+
+def begin_load():
+    """Cancel whatever load this session is still streaming and return the cancel event for the new one."""
+    cancel_event = threading.Event()
+    with _load_lock:
+        previous = state.get('load_cancel')
+        if previous is not None:
+            previous.set()
+        state['load_cancel'] = cancel_event
+    return cancel_event
+
+def publish_chunks(chunks, total_rows, date_range, on_progress=None, cancel_event=None):
+    """
+    Consume parsed chunks (newest rows first) and publish the growing frame to state['df_logs']
+    (with state['date_range'] set to date_range alongside it).
+
+    The frame is re-published on the first chunk and each time the row count doubles, so the
+    concatenation cost stays linear. on_progress(rows_loaded, total_rows, published) runs after
+    every chunk. Returns the complete DataFrame, or None if cancel_event was set mid-load.
+    """
+    parts = []
+    rows_loaded = 0
+    published_rows = 0
+    for chunk in chunks:
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        parts.append(chunk)
+        rows_loaded += len(chunk)
+
+        published = published_rows == 0 or rows_loaded >= 2 * published_rows
+        if published:
+            if published_rows == 0:
+                use_dataset(date_range)
+            # A partial frame can't be extended incrementally (no watermark)
+            publish_logs(None, concat_logs(parts))
+            state['date_range'] = date_range
+            published_rows = rows_loaded
+        if on_progress:
+            on_progress(rows_loaded, max(total_rows, rows_loaded), published)
+
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    if not parts:
+        return None
+    df_logs = concat_logs(parts)
+    use_dataset(date_range)
+    publish_logs(date_range, df_logs)
+    state['date_range'] = date_range
+    return df_logs
@@ -0,0 +1,122 @@
+"""
+Background work for the views, on one bounded pool.
+
+Views submit work under a per-session key ('load', 'before_alarm', 'statistics', 'prefetch'). Every submit
+bumps the key's generation: a task that hasn't started when a newer one arrives is skipped, and a
+result that comes back after a newer submit is dropped instead of overwriting the newer one.
+With debounce, a task waits that long before it is queued, so a burst of filter clicks ends in one
+computation. Work runs in the submitting session's context; on_result gets the result on the
+same worker and the page is updated after it.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.metrics import span
+from src import profiling
+
+TASK_CONFIG = {
+    'workers': 8,           # tasks running at once, across sessions
+    'debounce': 0.3,        # seconds view computations wait for further filter changes
+}
+
+_executor = None
+_generations = {}
+_lock = threading.Lock()
+task_stats = {
+    'submitted': 0, 'completed': 0, 'errors': 0,
+    'superseded': 0,        # skipped before starting: a newer task with the same key was submitted
+    'stale_results': 0,     # finished, but a newer task had been submitted meanwhile
+    'queued': 0, 'running': 0,
+    'latency_total': 0.0, 'latency_max': 0.0,   # seconds from submit to result, completed tasks
+}
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=TASK_CONFIG['workers'], thread_name_prefix='task')
+    return _executor
+
+def _count(name, amount=1):
+    with _lock:
+        task_stats[name] += amount
+
+def is_latest(task_key, generation):
+    with _lock:
+        return _generations.get(task_key) == generation
+
+def submit(page, key, work, on_result=None, debounce=0.0, update=True):
+    """
+    Run work() for page's session on the pool, then on_result(result) and page.update() unless a
+    newer task with the same key was submitted in the meantime. update=False skips page.update()
+    for work that only fills a cache. Returns the task's generation.
+    """
+    task_key = (page.session_id, key)
+    with _lock:
+        generation = _generations.get(task_key, 0) + 1
+        _generations[task_key] = generation
+        task_stats['submitted'] += 1
+    context = contextvars.copy_context()
+    submitted = time.perf_counter()
+
+    def enqueue():
+        if not is_latest(task_key, generation):
+            _count('superseded')
+            return
+        _count('queued')
+        _pool().submit(context.run, _run, page, task_key, generation, work, on_result, update, submitted)
+
+    if debounce:
+        timer = threading.Timer(debounce, enqueue)
+        timer.daemon = True
+        timer.start()
+    else:
+        enqueue()
+    return generation
+
+def _run(page, task_key, generation, work, on_result, update, submitted):
+    _count('queued', -1)
+    if not is_latest(task_key, generation):
+        _count('superseded')
+        return
+    _count('running')
+    try:
+        with profiling.work(task_key[1]):
+            result = work()
+    except Exception as e:
+        _count('errors')
+        print(f"Task {task_key[1]} failed: {str(e)}")
+        return
+    finally:
+        _count('running', -1)
+    if not is_latest(task_key, generation):
+        _count('stale_results')
+        return
+    try:
+        if on_result:
+            on_result(result)
+        if update:
+            with span('page_update'):
+                page.update()
+    except Exception as e:
+        _count('errors')
+        print(f"Task {task_key[1]} result failed: {str(e)}")
+        return
+    latency = time.perf_counter() - submitted
+    with _lock:
+        task_stats['completed'] += 1
+        task_stats['latency_total'] += latency
+        task_stats['latency_max'] = max(task_stats['latency_max'], latency)
+
+def forget_session(session_id):
+    """Drop a closed session's generations; its pending tasks are then skipped."""
+    with _lock:
+        for task_key in [k for k in _generations if k[0] == session_id]:
+            del _generations[task_key]
+
+def stats():
+    """task_stats plus the average latency of completed tasks."""
+    with _lock:
+        snapshot = dict(task_stats)
+    snapshot['latency_avg'] = snapshot['latency_total'] / snapshot['completed'] if snapshot['completed'] else 0.0
+    return snapshot
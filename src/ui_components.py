@@ -1,14 +1,22 @@
 import flet as ft
 import pandas as pd
-import base64
-from io import BytesIO
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from datetime import datetime, timedelta
 from src.state import state
-from src.filters import apply_filters, get_status_stats
-from src.database import load_data
+from src import tasks
+from src.profiling import action
+from src.filters import get_status_stats, select_rows, memoized
+from src.data_source import load_data, load_data_stream, load_data_tail, load_range
+from src.aggregates import alarm_summary
+from src.query_builder import ALARM_PLCCODE_MIN
+from src.incremental import tail_start
+from src.streaming import begin_load
+from src.export import EXPORT_CONFIG, frame_chunks
+from src import export_jobs
+from src.export_jobs import NoExportData, cancel
+from src.paging import iter_pages
 
 def create_dropdown(label, value, options, width, on_change):
     return ft.Dropdown(
@@ -40,33 +48,80 @@ def create_summary_card(title, value, color):
         padding=10, alignment=ft.alignment.center
     )
 
+def create_page_navigator(total_rows, rows_per_page, current_page, on_page, locate_time=None):
+    """
+    First/prev/next/last buttons, a jump-to-page field and (with locate_time) a jump-to-timestamp
+    field. The same handful of controls whatever the row count, unlike a dropdown with one option
+    per page. on_page(page_no) is called with a valid page; the navigator updates its own fields,
+    the caller redraws the rows and calls page.update(). locate_time(timestamp) returns the row
+    position of the first row at or before the timestamp (e.g. filters.find_time_position).
+    """
+    total_pages = max(1, (total_rows + rows_per_page - 1) // rows_per_page)
+    current = {'page': max(0, min(current_page, total_pages - 1))}
+
+    def refresh():
+        page_no = current['page']
+        page_field.value = str(page_no + 1)
+        page_field.error_text = None
+        first_button.disabled = prev_button.disabled = page_no == 0
+        next_button.disabled = last_button.disabled = page_no >= total_pages - 1
+
+    def go(page_no):
+        page_no = max(0, min(page_no, total_pages - 1))
+        if page_no == current['page']:
+            refresh()
+            return
+        current['page'] = page_no
+        refresh()
+        on_page(page_no)
+
+    def on_page_submit(e):
+        try:
+            go(int(page_field.value) - 1)
+        except (TypeError, ValueError):
+            page_field.error_text = "ใส่เลขหน้า"
+            e.control.update()
+
+    def on_time_submit(e):
+        try:
+            timestamp = pd.Timestamp((time_field.value or '').strip())
+        except (TypeError, ValueError):
+            timestamp = None
+        # A blank field parses to NaT
+        if timestamp is None or pd.isna(timestamp):
+            time_field.error_text = "YYYY-MM-DD HH:MM:SS"
+            e.control.update()
+            return
+        time_field.error_text = None
+        position = locate_time(timestamp)
+        go(min(position, max(total_rows - 1, 0)) // rows_per_page)
+
+    first_button = ft.IconButton(icon=ft.Icons.FIRST_PAGE, tooltip="หน้าแรก", on_click=lambda e: go(0))
+    prev_button = ft.IconButton(icon=ft.Icons.CHEVRON_LEFT, tooltip="ก่อนหน้า", on_click=lambda e: go(current['page'] - 1))
+    next_button = ft.IconButton(icon=ft.Icons.CHEVRON_RIGHT, tooltip="ถัดไป", on_click=lambda e: go(current['page'] + 1))
+    last_button = ft.IconButton(icon=ft.Icons.LAST_PAGE, tooltip="หน้าสุดท้าย", on_click=lambda e: go(total_pages - 1))
+    page_field = ft.TextField(width=80, dense=True, text_align=ft.TextAlign.CENTER,
+                              keyboard_type=ft.KeyboardType.NUMBER, on_submit=on_page_submit)
+    controls = [ft.Text("หน้าที่: ", size=16), first_button, prev_button, page_field,
+                ft.Text(f"/ {total_pages}", size=16), next_button, last_button]
+    if locate_time is not None:
+        time_field = ft.TextField(label="ไปที่เวลา", hint_text="YYYY-MM-DD HH:MM:SS", width=210, dense=True,
+                                  on_submit=on_time_submit)
+        controls.append(time_field)
+    refresh()
+    return ft.Row(controls, spacing=4, vertical_alignment=ft.CrossAxisAlignment.CENTER)
+
 def get_unique_statuses(filter_type="All"):
     df = state['df_logs']
-    if df is None or len(df) == 0:
-        return ["All"]
-    filtered_df = apply_filters(df, state['line_logs'], "All")
-    if 'PLCCODE' in filtered_df.columns:
-        if filter_type == "Alarm":
-            alarm_statuses = filtered_df[filtered_df['PLCCODE'] > 100]['PLCCODE'].dropna().unique().tolist()
-            return ["All"] + sorted(alarm_statuses)
-        elif filter_type == "Normal":
-            normal_statuses = filtered_df[filtered_df['PLCCODE'] <= 100]['PLCCODE'].dropna().unique().tolist()
-            return ["All"] + sorted(normal_statuses)
-        else:
-            statuses = filtered_df['PLCCODE'].dropna().unique().tolist()
-            return ["All"] + sorted(statuses)
-    else:
+    if df is None or len(df) == 0 or 'PLCCODE' not in df.columns:
         return ["All"]
+    line_logs = state['line_logs']
+    # Memoized per (data version, SRM, type) like the selections themselves
+    return memoized(df, ('statuses', str(line_logs), filter_type), lambda version: ["All"] + sorted(
+        select_rows(df, line_logs, "All", filter_type)['PLCCODE'].dropna().unique().tolist()))
 
 def filter_data_by_type(df, filter_type):
-    if df is None or len(df) == 0:
-        return df
-    if 'PLCCODE' in df.columns:
-        if filter_type == "Alarm":
-            return df[df['PLCCODE'] > 100]
-        elif filter_type == "Normal":
-            return df[df['PLCCODE'] <= 100]
-    return df
+    return select_rows(df, filter_type=filter_type)
 
 # ---------- New helpers for date "chips" ----------
 def _date_chip(label: str, value: datetime | None, on_tap, text_control=None):
@@ -181,6 +236,48 @@ def create_filter_controls(page, show_status=True):
         progress_gauge
     ])
 # ---------- Events ----------
+def submit_export(page, key, label, prepare):
+    """
+    Run an export on the background pool (src/export_jobs.py). While it is queued or running the
+    snack bar shows its progress with a cancel action; when it finishes the download link opens.
+    """
+    listener_id = page.session_id
+    progress_text = ft.Text(f"กำลังเตรียม export {label}...")
+    submitted = []
+
+    def on_cancel(e):
+        if submitted:
+            cancel(submitted[0], listener_id)
+        show_no_data_message(page, f"ยกเลิก export {label} แล้ว")
+
+    def on_update(job):
+        if job.status == 'queued':
+            progress_text.value = f"รอคิว export {label}..."
+        elif job.status == 'running':
+            progress_text.value = f"กำลัง export {label}: {job.rows:,} แถว"
+        elif job.status == 'done':
+            page.launch_url(job.url)
+            page.snack_bar = ft.SnackBar(content=ft.Text(f"Exported {label} data successfully"))
+            page.snack_bar.open = True
+        elif job.status == 'failed':
+            page.snack_bar = ft.SnackBar(content=ft.Text(job.error))
+            page.snack_bar.open = True
+        else:
+            return
+        page.update()
+
+    page.snack_bar = ft.SnackBar(content=progress_text, action="ยกเลิก", on_action=on_cancel,
+                                 duration=60 * 60 * 1000)
+    page.snack_bar.open = True
+    page.update()
+    job = export_jobs.submit(key, label, prepare, listener_id, on_update)
+    if job is None:
+        show_no_data_message(page, "มี export รอคิวอยู่มากเกินไป กรุณาลองใหม่ภายหลัง")
+        return None
+    submitted.append(job)
+    return job
+
+@action('export')
 def export_excel(page):
     # Determine which tab is currently active
     if not hasattr(page, 'tabs_control') or page.tabs_control is None:
@@ -198,78 +295,60 @@ def export_excel(page):
     status_logs = state.get("status_logs", "All")
     filter_choice = state.get("filter_choice", "All")
     
-    # Prepare data based on the active tab
+    # Identical requests against the same loaded data share one job (and its file)
+    key = (current_tab, line_logs, status_logs, filter_choice, export_jobs.dataset_version())
+    
+    # The prepare functions run on an export worker, not in this event handler
     if current_tab == "รายละเอียด" or current_tab == "กราฟ":  # Details tab or Chart tab
-        df = state.get("df_logs")
-        if df is None or df.empty:
-            show_no_data_message(page, f"No data available for {current_tab}")
-            return
-        
-        # Apply filters for both tabs in the same way
-        df_filtered = apply_filters(df, line_logs, status_logs)
-        
-        # Apply message type filter
-        if filter_choice == "Alarm":
-            df_filtered = df_filtered[df_filtered['PLCCODE'] > 100]
-        elif filter_choice == "Normal":
-            df_filtered = df_filtered[df_filtered['PLCCODE'] <= 100]
+        from views.asrs_logs_view import LOG_TABLE_CONFIG, keyset_filters
         
         # Set appropriate sheet name and filename based on tab
         if current_tab == "รายละเอียด":
             sheet_name = "Logs"
-            filename = f"logs_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            prefix = "logs_export"
         else:  # Chart tab
             sheet_name = "Chart_Data"
-            filename = f"chart_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-        # Export the data to a single sheet
-        try:
-            buf = BytesIO()
-            with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-                df_filtered.to_excel(writer, index=False, sheet_name=sheet_name)
-            buf.seek(0)
-            
-            b64 = base64.b64encode(buf.getvalue()).decode("ascii")
-            data_url = f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}"
-
-            page.launch_url(data_url)
-            print(f"Downloaded {current_tab} data with filters: line={line_logs}, status={status_logs}, type={filter_choice}")
+            prefix = "chart_data"
+        keyset = current_tab == "รายละเอียด" and LOG_TABLE_CONFIG['source'] == 'keyset'
+        filters = keyset_filters() if keyset else None
+        
+        def prepare():
+            if keyset:
+                # Same filters as the table, read from the server page by page while writing
+                return [(sheet_name, iter_pages(filters, EXPORT_CONFIG['chunk_rows']))], prefix
+            df = state.get("df_logs")
+            if df is None or df.empty:
+                raise NoExportData(f"No data available for {current_tab}")
             
-            page.snack_bar = ft.SnackBar(content=ft.Text(f"Exported {current_tab} data successfully"))
-            page.snack_bar.open = True
-            page.update()
-        except Exception as ex:
-            page.snack_bar = ft.SnackBar(content=ft.Text(f"Export error: {str(ex)}"))
-            page.snack_bar.open = True
-            page.update()
+            # Same rows as both tabs show (line, status and message type filters)
+            df_filtered = select_rows(df, line_logs, status_logs, filter_choice)
+            return [(sheet_name, frame_chunks(df_filtered))], prefix
+        
+        submit_export(page, key, current_tab, prepare)
+        print(f"Queued {current_tab} export with filters: line={line_logs}, status={status_logs}, type={filter_choice}")
     
     elif current_tab == "สรุป Alarm":  # Alarm Summary tab
         from views.Status_Detail import Alarm_status_map
         
-        df = state.get("df_logs")
-        if df is None or df.empty:
+        date_range = state.get("date_range")
+        if not date_range:
             show_no_data_message(page, "No alarm summary data available")
             return
         
-        try:
-            # First filter by line
-            df_filtered = apply_filters(df, line_logs, "All")
-            
-            # Then filter for alarms only
-            alarm_df = df_filtered[df_filtered['PLCCODE'] > 100]
+        def prepare():
+            # Same server-side aggregates as the tab (cached), filtered by line
+            query = dict(load_range(*date_range), srms=line_logs)
+            summary = alarm_summary(**query)
             
-            if alarm_df.empty:
-                show_no_data_message(page, "No alarm data after filtering")
-                return
+            if summary['total_alarms'] == 0:
+                raise NoExportData("No alarm data after filtering")
             
             # Create the same tables as shown in the UI
             # 1. Alarm frequency table
-            plc_counts = alarm_df['PLCCODE'].value_counts().reset_index()
-            plc_counts.columns = ['PLCCODE', 'Count']
-            plc_counts = plc_counts.sort_values('Count', ascending=False)
+            plc_counts = summary['by_plccode'].copy()
             
             # Calculate percentages
-            total_alarms = plc_counts['Count'].sum()
+            total_alarms = summary['total_alarms']
             plc_counts['Percentage'] = (plc_counts['Count'] / total_alarms * 100).round(1).astype(str) + '%'
             
             # Add descriptions
@@ -278,56 +357,31 @@ def export_excel(page):
             )
             
             # 2. Line summary table
-            line_summary = alarm_df.groupby('ASRS').size().reset_index(name='Total_Alarms')
-            line_summary = line_summary.sort_values('Total_Alarms', ascending=False)
+            line_summary = summary['by_srm'].rename(columns={'Count': 'Total_Alarms'})
             line_summary['ASRS_Line'] = line_summary['ASRS'].apply(lambda x: f"SRM{x:02d}")
             
-            # Export both tables to separate sheets
-            buf = BytesIO()
-            with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-                # First sheet: Alarm frequency
-                plc_counts.to_excel(writer, index=False, sheet_name="Alarm_Frequency")
-                
-                # Second sheet: Line summary
-                line_summary.to_excel(writer, index=False, sheet_name="Line_Summary")
-                
-                # Optional: Add a third sheet with the raw alarm data
-                alarm_df.to_excel(writer, index=False, sheet_name="Raw_Alarm_Data")
-            
-            buf.seek(0)
-            
-            b64 = base64.b64encode(buf.getvalue()).decode("ascii")
-            data_url = f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}"
-
-            page.launch_url(data_url)
-            print(f"Downloaded Alarm Summary data with filters: line={line_logs}")
-            
-            page.snack_bar = ft.SnackBar(content=ft.Text("Exported Alarm Summary data successfully"))
-            page.snack_bar.open = True
-            page.update()
-        except Exception as ex:
-            page.snack_bar = ft.SnackBar(content=ft.Text(f"Error preparing summary data: {str(ex)}"))
-            page.snack_bar.open = True
-            page.update()
-            return
+            # Export both tables to separate sheets, then the raw alarm rows (filtered in SQL,
+            # read page by page while the sheet is written)
+            return [
+                ("Alarm_Frequency", [plc_counts]),
+                ("Line_Summary", [line_summary]),
+                ("Raw_Alarm_Data", iter_pages(dict(query, plccode_min=ALARM_PLCCODE_MIN), EXPORT_CONFIG['chunk_rows'])),
+            ], "alarm_summary"
+        
+        submit_export(page, key, "Alarm Summary", prepare)
+        print(f"Queued Alarm Summary export with filters: line={line_logs}")
     
     elif current_tab == "ก่อนเกิด Alarm":  # Before Alarm tab
-        # Get data from the stats_cache in before_alm_view
-        try:
-            from views.before_alm_view import stats_cache, process_alarm_data
+        def prepare():
+            # Same tables as the tab: from its cache when that matches the current data version
+            from views.before_alm_view import cached_alarm_data
             from views.Status_Detail import Alarm_status_map, Normal_status_map
             
             # Get both alarm_df and before_alarm_df
-            alarm_df = stats_cache.get('alarm_df')
-            before_alarm_df = stats_cache.get('before_alarm_df')
-            
-            # If not available in cache, try to generate them
-            if alarm_df is None or before_alarm_df is None or alarm_df.empty or before_alarm_df.empty:
-                alarm_df, before_alarm_df = process_alarm_data()
+            alarm_df, before_alarm_df = cached_alarm_data()
             
             if (alarm_df is None or alarm_df.empty) and (before_alarm_df is None or before_alarm_df.empty):
-                show_no_data_message(page, "No before-alarm data available")
-                return
+                raise NoExportData("No before-alarm data available")
             
             # Format the before_alarm_df data to match the UI display
             if before_alarm_df is not None and not before_alarm_df.empty:
@@ -392,42 +446,28 @@ def export_excel(page):
                 before_alarm_df = display_df
             
             # Export the data to Excel with multiple sheets
-            buf = BytesIO()
-            with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-                # Export before_alarm_df as the main sheet
-                if before_alarm_df is not None and not before_alarm_df.empty:
-                    before_alarm_df.to_excel(writer, index=False, sheet_name="Before_Alarm")
-                
-                # Export alarm_df as a secondary sheet if available
-                if alarm_df is not None and not alarm_df.empty:
-                    # Format alarm_df for better readability
-                    alarm_display = alarm_df.copy()
-                    if 'PLCCODE' in alarm_display.columns:
-                        alarm_display['Detail'] = alarm_display['PLCCODE'].astype(int).map(
-                            lambda x: Alarm_status_map.get(x, "ไม่ทราบสถานะ")
-                        )
-                    if 'CDATE' in alarm_display.columns:
-                        alarm_display['CDATE'] = alarm_display['CDATE'].apply(
-                            lambda x: x.strftime("%Y-%m-%d %H:%M:%S") if isinstance(x, pd.Timestamp) else x
-                        )
-                    alarm_display.to_excel(writer, index=False, sheet_name="Alarms")
-            
-            buf.seek(0)
-            
-            b64 = base64.b64encode(buf.getvalue()).decode("ascii")
-            data_url = f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}"
-
-            page.launch_url(data_url)
-            print(f"Downloaded Before Alarm data with filters: line={line_logs}")
+            sheets = []
+            # Export before_alarm_df as the main sheet
+            if before_alarm_df is not None and not before_alarm_df.empty:
+                sheets.append(("Before_Alarm", frame_chunks(before_alarm_df)))
             
-            page.snack_bar = ft.SnackBar(content=ft.Text("Exported Before Alarm data successfully"))
-            page.snack_bar.open = True
-            page.update()
-        except Exception as ex:
-            page.snack_bar = ft.SnackBar(content=ft.Text(f"Error accessing before alarm data: {str(ex)}"))
-            page.snack_bar.open = True
-            page.update()
-            return
+            # Export alarm_df as a secondary sheet if available
+            if alarm_df is not None and not alarm_df.empty:
+                # Format alarm_df for better readability
+                alarm_display = alarm_df.copy()
+                if 'PLCCODE' in alarm_display.columns:
+                    alarm_display['Detail'] = alarm_display['PLCCODE'].astype(int).map(
+                        lambda x: Alarm_status_map.get(x, "ไม่ทราบสถานะ")
+                    )
+                if 'CDATE' in alarm_display.columns:
+                    alarm_display['CDATE'] = alarm_display['CDATE'].apply(
+                        lambda x: x.strftime("%Y-%m-%d %H:%M:%S") if isinstance(x, pd.Timestamp) else x
+                    )
+                sheets.append(("Alarms", frame_chunks(alarm_display)))
+            return sheets, "before_alarm"
+        
+        submit_export(page, key, "Before Alarm", prepare)
+        print(f"Queued Before Alarm export with filters: line={line_logs}")
     
     else:
         page.snack_bar = ft.SnackBar(content=ft.Text(f"Export not implemented for tab: {current_tab}"))
@@ -442,12 +482,14 @@ def show_no_data_message(page, message):
     page.snack_bar.open = True
     page.update()
     
+@action('filter_change')
 def on_line_filter_change(e, page):
     state['line_logs'] = e.control.value
     state['page_logs'] = 0
     from main import update_view
     update_view(page)
 
+@action('filter_change')
 def on_filter_choice_change(e, page):
     state['filter_choice'] = e.control.value
     state['status_logs'] = "All"
@@ -455,6 +497,7 @@ def on_filter_choice_change(e, page):
     from main import update_view
     update_view(page)
 
+@action('filter_change')
 def on_status_filter_change(e, page):
     state['status_logs'] = e.control.value
     state['page_logs'] = 0
@@ -479,33 +522,113 @@ def on_end_date_change(e, page):
         page.end_date_text.value = f"End: {state['end_date'].strftime('%Y-%m-%d')}"
         page.update()
 
+@action('date_search')
 def apply_date_range(e, page):
-    page.splash.visible = True
-    page.update()
-    try:
-        start = state.get('selected_date')
-        end = state.get('end_date') or start
-        if not start:
-            # no start date chosen; just hide splash and bail
-            page.splash.visible = False
-            page.snack_bar = ft.SnackBar(ft.Text("Please select a start date."))
-            page.snack_bar.open = True
-            page.update()
-            return
-        # load [start, end + 1d)
-        load_data(start, end) 
-        state['page_logs'] = 0
+    start = state.get('selected_date')
+    end = state.get('end_date') or start
+    if not start:
+        # no start date chosen; just bail
+        page.snack_bar = ft.SnackBar(ft.Text("Please select a start date."))
+        page.snack_bar.open = True
+        page.update()
+        return
+
+    def on_done(ok):
         from main import update_view
         update_view(page)
-        page.snack_bar = ft.SnackBar(ft.Text(f"Applied: {start:%Y-%m-%d} → {(end):%Y-%m-%d}"))
-        page.snack_bar.open = True
-    except Exception as ex:
-        page.snack_bar = ft.SnackBar(ft.Text(f"Error: {str(ex)}"))
+        if ok:
+            page.snack_bar = ft.SnackBar(ft.Text(f"Applied: {start:%Y-%m-%d} → {(end):%Y-%m-%d}"))
+        else:
+            page.snack_bar = ft.SnackBar(ft.Text("Error: could not load data for the selected range"))
         page.snack_bar.open = True
-    finally:
-        page.splash.visible = False
         page.update()
 
+    # Same range as the loaded frame: only fetch what was logged since
+    if tail_start((start, end)) is not None:
+        run_tail_refresh(page, start, end, on_done)
+        return
+    # Streams in the background; a second click cancels this load and starts over
+    run_progressive_load(page, start, end, on_done)
+
+def create_load_progress(page):
+    """Thin progress strip shown above the tabs while a date range is streaming in."""
+    page.load_progress_text = ft.Text("", size=12, color=ft.Colors.BLUE_700)
+    page.load_progress_bar = ft.ProgressBar(value=0, height=6, color=ft.Colors.BLUE_400, bgcolor=ft.Colors.BLUE_50)
+    page.load_progress = ft.Container(
+        content=ft.Column([page.load_progress_text, page.load_progress_bar], spacing=2),
+        padding=ft.padding.only(bottom=6), visible=False
+    )
+    return page.load_progress
+
+def show_load_progress(page, rows_loaded, total_rows):
+    if not hasattr(page, 'load_progress'):
+        return
+    percent = (rows_loaded / total_rows * 100) if total_rows else 100
+    page.load_progress_bar.value = percent / 100
+    page.load_progress_text.value = f"กำลังโหลดข้อมูล {rows_loaded:,} / {total_rows:,} แถว ({percent:.0f}%)"
+    page.load_progress.visible = True
+
+def run_progressive_load(page, start, end, on_done=None):
+    """
+    Stream logs for [start, end] on the task pool. The details tab renders page 1 as soon as
+    the first chunk is parsed, the progress strip tracks rows loaded, and starting another load
+    cancels this one (on_done is then never called).
+    """
+    cancel_event = begin_load()
+    state['page_logs'] = 0
+    tab_names = ["กราฟ", "ก่อนเกิด Alarm", "สรุป Alarm", "รายละเอียด"]
+    first_render = {'done': False}
+
+    page.splash.visible = True
+    page.update()
+
+    def on_progress(rows_loaded, total_rows, published):
+        if cancel_event.is_set():
+            return
+        show_load_progress(page, rows_loaded, total_rows)
+        if published and not first_render['done']:
+            first_render['done'] = True
+            page.splash.visible = False
+            current_tab = tab_names[page.tabs_control.selected_index] if hasattr(page, 'tabs_control') else None
+            if current_tab == "รายละเอียด":
+                from main import update_view
+                update_view(page, current_tab)
+                return
+        page.update()
+
+    def worker():
+        ok = False
+        try:
+            ok = load_data_stream(start, end, on_progress=on_progress, cancel_event=cancel_event)
+        finally:
+            if not cancel_event.is_set():
+                page.splash.visible = False
+                if hasattr(page, 'load_progress'):
+                    page.load_progress.visible = False
+                page.update()
+        if not cancel_event.is_set() and on_done:
+            on_done(ok)
+
+    tasks.submit(page, 'load', worker)
+
+def run_tail_refresh(page, start, end, on_done=None):
+    """Incremental refresh of the loaded range on the task pool (cancels any streaming load)."""
+    begin_load()
+    page.splash.visible = True
+    page.update()
+
+    def worker():
+        ok = False
+        try:
+            ok = load_data_tail(start, end)
+        finally:
+            page.splash.visible = False
+            page.update()
+        if on_done:
+            on_done(ok)
+
+    tasks.submit(page, 'load', worker)
+
 def clear_filter(e, page):
     page.splash.visible = True
     page.update()
@@ -538,11 +661,17 @@ def refresh_data(e, page):
         state['status_loops'] = "All"
         state['status_logs'] = "All"
         state['filter_choice'] = "All"
-        from src.database import load_data  # Changed from API_request to match your imports
-        start = state.get('selected_date')
-        if start:
-            end = state.get('end_date') or start
-            load_data(start_date=start, end_date=end + timedelta(days=1))
+        # Keyset pages and their cursors describe the data before the refresh
+        page.log_pager = None
+        loaded_range = state.get('date_range')
+        if loaded_range and tail_start(loaded_range) is not None:
+            # Only rows logged since the last load are fetched and prepended
+            load_data_tail(*loaded_range)
+        else:
+            start = state.get('selected_date')
+            if start:
+                end = state.get('end_date') or start
+                load_data(start_date=start, end_date=end + timedelta(days=1))
         from main import update_view
         update_view(page)
         page.snack_bar = ft.SnackBar(ft.Text("Data refreshed."))
@@ -0,0 +1,36 @@
+import json
+from flet.core.protocol import CommandEncoder
+
+def iter_controls(control):
+    """The control and every descendant (depth first)."""
+    stack = [control]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(current._get_children())
+
+def count_controls(control) -> int:
+    """Number of Flet controls in a tree, i.e. what the client has to create and lay out."""
+    return sum(1 for _ in iter_controls(control))
+
+def _commands_bytes(commands) -> int:
+    return len(json.dumps(commands, cls=CommandEncoder, separators=(',', ':')).encode('utf-8'))
+
+def add_payload_bytes(control) -> int:
+    """
+    Size of the JSON commands that add `control` to a page. Building them marks every attribute as
+    sent, so only use this on trees that won't be sent afterwards (benchmarks).
+    """
+    return _commands_bytes(control._build_add_commands())
+
+def mark_sent(control, prefix='_m'):
+    """Give a measured tree ids, as if the page had added it, so update payloads can be measured."""
+    for n, ctrl in enumerate(iter_controls(control)):
+        if ctrl._Control__uid is None:
+            ctrl._Control__uid = f"{prefix}{n}"
+
+def update_payload_bytes(control) -> int:
+    """Size of the JSON commands page.update() would send for changes made since the tree was sent."""
+    commands = []
+    control.build_update_commands({}, commands, [], [])
+    return _commands_bytes(commands)
@@ -0,0 +1,80 @@
+"""
+HTTP server for the dashboard: the Flet web app plus plain HTTP routes on the same port.
+
+    /download/<token>   exported files (src/export.py), valid for EXPORT_CONFIG['token_ttl']
+    /metrics            span histograms and pool/cache counters, Prometheus text (src/metrics.py)
+    /admin/profiling    GET: profiling mode and reports; POST ?enabled=true|false toggles it (src/profiling.py)
+
+The admin routes (/metrics, /admin/*) answer loopback clients, or others sending header
+X-Admin-Token matching ASRS_ADMIN_TOKEN.
+
+flet_web (installed with Flet's web support) provides the FastAPI/uvicorn stack that ft.app
+would otherwise start internally.
+"""
+import hmac
+import os
+from src.export import resolve_download
+from src import metrics, profiling
+from fastapi import Request   # handler annotation FastAPI resolves; this module is imported only to serve
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets')
+# Remote clients of the admin routes need this token; unset, only this machine may use them
+ADMIN_TOKEN = os.environ.get('ASRS_ADMIN_TOKEN') or None
+LOOPBACK_HOSTS = {'127.0.0.1', '::1', 'localhost'}
+
+def download_handler(token: str):
+    from fastapi import HTTPException
+    from fastapi.responses import FileResponse
+    entry = resolve_download(token)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Download link expired or unknown")
+    # FileResponse streams the file from disk in chunks
+    return FileResponse(entry['path'], media_type=entry['media_type'], filename=entry['filename'])
+
+def _admin_allowed(request):
+    token = request.headers.get('x-admin-token')
+    if ADMIN_TOKEN and token is not None:
+        return hmac.compare_digest(token, ADMIN_TOKEN)
+    return request.client is not None and request.client.host in LOOPBACK_HOSTS
+
+def _require_admin(request, detail):
+    from fastapi import HTTPException
+    if not _admin_allowed(request):
+        raise HTTPException(status_code=403, detail=detail)
+
+def metrics_handler(request: Request):
+    from fastapi.responses import PlainTextResponse
+    # Session counts and the DB host/user in the pool labels: not for anyone on the network
+    _require_admin(request, "Metrics are served to the server itself or with X-Admin-Token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def _profiling_report():
+    return {'enabled': profiling.PROFILE_CONFIG['enabled'], 'directory': profiling.PROFILE_CONFIG['directory'],
+            'reports': profiling.list_reports()}
+
+def profiling_status(request: Request):
+    # Report names embed session ids
+    _require_admin(request, "Profiling status is served to the server itself or with X-Admin-Token")
+    return _profiling_report()
+
+def profiling_toggle(request: Request, enabled: bool):
+    _require_admin(request, "Profiling can only be toggled from the server or with X-Admin-Token")
+    profiling.set_enabled(enabled)
+    return _profiling_report()
+
+def create_web_app(session_handler):
+    """FastAPI app with the extra routes first and the Flet app mounted at / behind them."""
+    from fastapi import FastAPI
+    import flet_web.fastapi as flet_fastapi
+    app = FastAPI()
+    app.add_api_route("/download/{token}", download_handler, methods=["GET"])
+    app.add_api_route("/metrics", metrics_handler, methods=["GET"])
+    app.add_api_route("/admin/profiling", profiling_status, methods=["GET"])
+    app.add_api_route("/admin/profiling", profiling_toggle, methods=["POST"])
+    app.mount("/", flet_fastapi.app(session_handler, assets_dir=ASSETS_DIR if os.path.isdir(ASSETS_DIR) else None))
+    return app
+
+def serve(session_handler, host="0.0.0.0", port=7777):
+    import uvicorn
+    print(f"App URL: http://{'127.0.0.1' if host in ('0.0.0.0', '') else host}:{port}")
+    uvicorn.run(create_web_app(session_handler), host=host, port=port, log_level="warning")
@@ -3,106 +3,20 @@
 import flet as ft
 import sys
 import os
-import re
 import pandas as pd
-import threading
 
 # allow "from src..." imports when running from app root
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.state import state
-from src.filters import apply_filters
-from src.ui_components import create_filter_controls, change_page, filter_data_by_type
+from src.filters import select_rows, find_time_position
+from src.log_schema import normalize_logs, is_normalized
+from src.ui_components import create_filter_controls, create_page_navigator
+from src.data_source import load_range
+from src.paging import KeysetPager
+from src.query_builder import ALARM_PLCCODE_MIN
 from views.Status_Detail import ALARM_CATEGORIES, CATEGORY_COLORS
 
-# --- Mapping: server md_* → legacy display labels used by the UI table ---
-MD_TO_LABELS = {
-    "md_D57":  "X_Distance_mm (D57)",
-    "md_D130": "Start_Bank (D130)",
-    "md_D131": "Start_Pos_mm (D131)",
-    "md_D133": "Start_Level_mm (D133)",
-    "md_D134": "End_Bank (D134)",
-    "md_D135": "End_Position_mm (D135)",
-    "md_D137": "End_Level_mm (D137)",
-    "md_D138": "Pallet_ID (D138)",
-    "md_D140": "Present_Bay_Arm1 (D140)",
-    "md_D145": "Present_Level (D145)",
-    "md_D146": "Status_Arm1 (D146)",
-    "md_D147": "Status (D147)",
-    "md_D148": "Command Machine (D148)",
-    "md_D174": "Command_X_Pos (D174)",
-}
-
-NUMERIC_DISPLAY_COLS = set(MD_TO_LABELS.values()) | {"ASRS", "PLCCODE"}
-
-# Fallback regex to parse "Dxxx<sep>value" where <sep> can be '=', ':', or whitespace
-DPAIR_RE = re.compile(r"\b(D\d+)\s*(?:[:=]|\s)\s*(-?\d+)\b")
-
-def _rename_md_columns(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-    present = {k: v for k, v in MD_TO_LABELS.items() if k in df.columns}
-    if present:
-        df = df.rename(columns=present)
-    return df
-
-def _fallback_parse_from_raw(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    If md_* fields are missing but MONITORDATA exists, try a lightweight parse on the client.
-    This handles tokens like 'D174=31400', 'D174:31400', or 'D174 31400'.
-    """
-    if df is None or df.empty or "MONITORDATA" not in df.columns:
-        return df
-
-    # Find which legacy columns we still need (i.e., entirely null or missing)
-    for md_key, legacy_col in MD_TO_LABELS.items():
-        if legacy_col not in df.columns or df[legacy_col].isna().all():
-            # Extract from MONITORDATA
-            dcode = md_key.replace("md_", "")  # e.g., 'D174'
-            def extract_from_raw(s):
-                if not isinstance(s, str):
-                    return pd.NA
-                # search all pairs and return the one matching dcode
-                for k, v in DPAIR_RE.findall(s):
-                    if k == dcode:
-                        try:
-                            return int(v)
-                        except:
-                            return pd.to_numeric(v, errors="coerce")
-                return pd.NA
-            df[legacy_col] = df[legacy_col] if legacy_col in df.columns else pd.NA
-            filled = df["MONITORDATA"].apply(extract_from_raw)
-            # Only overwrite where we still have NA
-            mask = df[legacy_col].isna()
-            df.loc[mask, legacy_col] = filled[mask]
-    return df
-
-def _ensure_legacy_columns(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-    for col in MD_TO_LABELS.values():
-        if col not in df.columns:
-            df[col] = pd.NA
-    return df
-
-def _coerce_numeric_display_cols(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-    for col in NUMERIC_DISPLAY_COLS:
-        if col in df.columns:
-            # clean patterns like "D57=31373"
-            df[col] = df[col].apply(
-                lambda x: str(x).split("=")[-1] if isinstance(x, str) and "=" in x else x
-            )
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-    if "CDATE" in df.columns:
-        df["CDATE"] = pd.to_datetime(df["CDATE"], errors="coerce")
-    # don't show raw MONITORDATA in table
-    if "MONITORDATA" in df.columns:
-        # keep the column for fallback parsing in other views; remove from this view
-        pass
-    return df
-
 def _get_alarm_category_color(status):
     if pd.isna(status):
         return None
@@ -115,109 +29,120 @@ def _get_alarm_category_color(status):
         pass
     return None
 
+# Details-tab table. 'virtual' keeps a fixed window of row controls and re-binds them while the
+# user scrolls, so a page can hold thousands of rows; 'paged' builds one control per cell.
+# 'source': 'memory' pages through state['df_logs']; 'keyset' reads each page from the server
+# (src/paging.py), so the tab never needs more than a few pages of rows in memory.
+LOG_TABLE_CONFIG = {
+    'mode': 'virtual',
+    'source': 'memory',
+    'keyset_rows_per_page': 500,
+    'virtual_rows_per_page': 1000,
+    'row_height': 60,
+    'window_rows': 40,
+}
+
+# State the tab is built from (main.update_view rebuilds it only when one of these changed)
+VIEW_INPUTS = ('data_version', 'date_range', 'line_logs', 'status_logs', 'filter_choice', 'page_logs',
+               'selected_date', 'end_date')
+
+COLUMN_WIDTHS = {
+    'CDATE': 150,
+    'ASRS': 60,
+    'BARCODE': 90,
+    'CHKTYPE': 90,
+    'MSGLOG': 250,
+    'MSGTYPE': 90,
+    'PLCCODE': 90,
+    'X_Distance_mm (D57)': 120,
+    'Start_Bank (D130)': 100,
+    'Start_Pos_mm (D131)': 120,
+    'Start_Level_mm (D133)': 120,
+    'End_Bank (D134)': 100,
+    'End_Position_mm (D135)': 120,
+    'End_Level_mm (D137)': 120,
+    'Pallet_ID (D138)': 100,
+    'Present_Bay_Arm1 (D140)': 120,
+    'Present_Level (D145)': 120,
+    'Status_Arm1 (D146)': 100,
+    'Status (D147)': 100,
+    'Command Machine (D148)': 130,
+    'Command_X_Pos (D174)': 120,
+}
+
+HEADER_DISPLAY_NAMES = {'CDATE': 'CDATE', 'ASRS': 'SRM LINE'}
+
+def _display_columns(df: pd.DataFrame):
+    ordered_columns = [c for c in COLUMN_WIDTHS.keys() if c in df.columns]
+    return ordered_columns + [c for c in df.columns if c not in ordered_columns]
+
+def _format_cell(value, col):
+    if pd.isna(value):
+        return "NULL"
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (int, float)):
+        return str(int(value)) if float(value).is_integer() else str(value)
+    if col == 'MSGLOG':
+        return str(value).replace("\n", " ")
+    return str(value).replace("\n", " ")[:50]
+
+def _plccode_style(plccode_val):
+    """(text colour, weight) for an alarm PLCCODE cell."""
+    if pd.notna(plccode_val) and plccode_val > 100:
+        try:
+            for category, codes in ALARM_CATEGORIES.items():
+                if int(plccode_val) in codes:
+                    return CATEGORY_COLORS[category], ft.FontWeight.BOLD
+        except Exception:
+            pass
+    return None, None
+
+def _row_color(plccode_val, idx):
+    row_color = _get_alarm_category_color(plccode_val) if pd.notna(plccode_val) and plccode_val > 100 else None
+    return row_color or (ft.Colors.with_opacity(0.05, ft.Colors.GREY_800) if idx % 2 == 0 else ft.Colors.WHITE)
+
+def _header_row(columns):
+    return ft.Row([
+        ft.Container(
+            content=ft.Text(HEADER_DISPLAY_NAMES.get(col, col),
+                            weight=ft.FontWeight.BOLD, size=14, text_align=ft.TextAlign.CENTER),
+            padding=8,
+            alignment=ft.alignment.center,
+            bgcolor=ft.Colors.GREY_100,
+            border=ft.border.all(1, ft.Colors.GREY_400),
+            width=COLUMN_WIDTHS.get(col, 120), height=60
+        )
+        for col in columns
+    ], spacing=0)
+
 def build_data_table(df: pd.DataFrame):
     if df is None or len(df) == 0:
         return ft.Text("No data available", size=14, color=ft.Colors.GREY_700)
 
-    # Normalize: map md_* → legacy, try fallback from raw, coerce numerics
-    display_df = df.copy()
-    display_df = _rename_md_columns(display_df)
-    display_df = _fallback_parse_from_raw(display_df)
-    display_df = _ensure_legacy_columns(display_df)
-    display_df = _coerce_numeric_display_cols(display_df)
-
-    column_widths = {
-        'CDATE': 150,
-        'ASRS': 60,
-        'BARCODE': 90,
-        'CHKTYPE': 90,
-        'MSGLOG': 250,
-        'MSGTYPE': 90,
-        'PLCCODE': 90,
-        'X_Distance_mm (D57)': 120,
-        'Start_Bank (D130)': 100,
-        'Start_Pos_mm (D131)': 120,
-        'Start_Level_mm (D133)': 120,
-        'End_Bank (D134)': 100,
-        'End_Position_mm (D135)': 120,
-        'End_Level_mm (D137)': 120,
-        'Pallet_ID (D138)': 100,
-        'Present_Bay_Arm1 (D140)': 120,
-        'Present_Level (D145)': 120,
-        'Status_Arm1 (D146)': 100,
-        'Status (D147)': 100,
-        'Command Machine (D148)': 130,
-        'Command_X_Pos (D174)': 120,
-    }
-
-    ordered_columns = [c for c in column_widths.keys() if c in display_df.columns]
-    remaining_columns = [c for c in display_df.columns if c not in ordered_columns]
-    final_column_order = ordered_columns + remaining_columns
-    display_df = display_df[final_column_order]
-
-    header_display_names = {'CDATE': 'CDATE', 'ASRS': 'SRM LINE'}
-
-    header_cells = []
-    for col in display_df.columns:
-        width = column_widths.get(col, 120)
-        header_cells.append(
-            ft.Container(
-                content=ft.Text(header_display_names.get(col, col),
-                                weight=ft.FontWeight.BOLD, size=14, text_align=ft.TextAlign.CENTER),
-                padding=8,
-                alignment=ft.alignment.center,
-                bgcolor=ft.Colors.GREY_100,
-                border=ft.border.all(1, ft.Colors.GREY_400),
-                width=width, height=60
-            )
-        )
-    header_row = ft.Row(header_cells, spacing=0)
+    display_df = _normalize_page(df)
+    display_df = display_df[_display_columns(display_df)]
+    header_row = _header_row(display_df.columns)
 
     data_rows = []
     for idx, (_, row) in enumerate(display_df.iterrows()):
         row_cells = []
 
         plccode_val = pd.to_numeric(row.get('PLCCODE', pd.NA), errors='coerce')
-        row_color = _get_alarm_category_color(plccode_val) if pd.notna(plccode_val) and plccode_val > 100 else None
-        if not row_color:
-            row_color = ft.Colors.with_opacity(0.05, ft.Colors.GREY_800) if idx % 2 == 0 else ft.Colors.WHITE
+        row_color = _row_color(plccode_val, idx)
 
         for col in display_df.columns:
-            value = row[col]
-            width = column_widths.get(col, 120)
-
-            if pd.isna(value):
-                cell_text = "NULL"
-            elif isinstance(value, pd.Timestamp):
-                cell_text = value.strftime("%Y-%m-%d %H:%M:%S")
-            elif isinstance(value, (int, float)):
-                cell_text = str(int(value)) if float(value).is_integer() else str(value)
-            elif col == 'MSGLOG':
-                cell_text = str(value).replace("\n", " ")
-            else:
-                cell_text = str(value).replace("\n", " ")[:50]
-
-            text_color = None
-            text_weight = None
-            if col == 'PLCCODE' and pd.notna(plccode_val) and plccode_val > 100:
-                try:
-                    for category, codes in ALARM_CATEGORIES.items():
-                        if int(plccode_val) in codes:
-                            text_color = CATEGORY_COLORS[category]
-                            text_weight = ft.FontWeight.BOLD
-                            break
-                except Exception:
-                    pass
+            text_color, text_weight = _plccode_style(plccode_val) if col == 'PLCCODE' else (None, None)
 
             row_cells.append(
                 ft.Container(
-                    content=ft.Text(cell_text, size=13, color=text_color, weight=text_weight,
+                    content=ft.Text(_format_cell(row[col], col), size=13, color=text_color, weight=text_weight,
                                     text_align=ft.TextAlign.CENTER, max_lines=2),
                     padding=6,
                     alignment=ft.alignment.center,
                     bgcolor=row_color,
                     border=ft.border.all(1, ft.Colors.GREY_300),
-                    width=width, height=60
+                    width=COLUMN_WIDTHS.get(col, 120), height=60
                 )
             )
 
@@ -232,7 +157,7 @@ def build_data_table(df: pd.DataFrame):
         spacing=0, expand=True
     )
 
-    total_width = sum(column_widths.get(col, 120) for col in display_df.columns)
+    total_width = sum(COLUMN_WIDTHS.get(col, 120) for col in display_df.columns)
 
     return ft.Container(
         content=ft.Row(
@@ -242,68 +167,199 @@ def build_data_table(df: pd.DataFrame):
         expand=True, bgcolor=ft.Colors.WHITE, border=ft.border.all(1, ft.Colors.GREY_300)
     )
 
+class VirtualLogTable:
+    """
+    Details table that only has controls for a window of rows around the viewport.
+
+    The window is a fixed pool of row controls. Scrolling re-binds their text and colours, and
+    spacers above and below it stand in for the rows that aren't built, so control count and
+    payload stay the same whether the page holds 40 rows or 40,000. show() rebinds the same pool
+    for a new page or filter, so a page change only sends changed cell values.
+    """
+
+    def __init__(self, row_height=None, window_rows=None):
+        self.row_height = row_height or LOG_TABLE_CONFIG['row_height']
+        self.window_rows = window_rows or LOG_TABLE_CONFIG['window_rows']
+        self.df = None
+        self.columns = []
+        self.start = 0
+        self.rows = []  # pool of (ft.Row, [(cell Container, cell Text), ...])
+
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.list_view = ft.ListView(spacing=0, expand=True, on_scroll_interval=50, on_scroll=self._on_scroll)
+        self.header = ft.Container(padding=0)
+        self.table_box = ft.Container(content=ft.Column([self.header, self.list_view], spacing=0, expand=True))
+        self.control = ft.Container(
+            content=ft.Row(controls=[self.table_box], scroll=ft.ScrollMode.ALWAYS, expand=True),
+            expand=True, bgcolor=ft.Colors.WHITE, border=ft.border.all(1, ft.Colors.GREY_300)
+        )
+
+    def _new_row(self):
+        cells = []
+        for col in self.columns:
+            text = ft.Text("", size=13, text_align=ft.TextAlign.CENTER, max_lines=2)
+            cells.append((ft.Container(content=text, padding=6, alignment=ft.alignment.center,
+                                       border=ft.border.all(1, ft.Colors.GREY_300),
+                                       width=COLUMN_WIDTHS.get(col, 120), height=self.row_height), text))
+        return ft.Row([cell for cell, _ in cells], spacing=0), cells
+
+    def show(self, df: pd.DataFrame):
+        """Display a (normalized) page frame, scrolled to its first row."""
+        columns = _display_columns(df)
+        if columns != self.columns:
+            # Cell widths and count depend on the columns; anything else reuses the pool
+            self.columns = columns
+            self.rows = [self._new_row() for _ in range(self.window_rows)]
+            self.header.content = _header_row(columns)
+            self.table_box.width = max(sum(COLUMN_WIDTHS.get(col, 120) for col in columns), 800)
+            self.list_view.controls = [self.top_spacer] + [row for row, _ in self.rows] + [self.bottom_spacer]
+        self.df = df
+        self.start = 0
+        self._bind()
+        if self.list_view.page is not None:
+            self.list_view.scroll_to(offset=0, duration=0)
+
+    def _bind(self):
+        total = len(self.df)
+        end = min(total, self.start + self.window_rows)
+        window = self.df.iloc[self.start:end]
+        plccodes = pd.to_numeric(window['PLCCODE'], errors='coerce').tolist() if 'PLCCODE' in window.columns else [pd.NA] * len(window)
+        values = {col: window[col].tolist() for col in self.columns}
+
+        for i, (row, cells) in enumerate(self.rows):
+            if i >= len(window):
+                row.visible = False
+                continue
+            row.visible = True
+            plccode_val = plccodes[i]
+            row_color = _row_color(plccode_val, self.start + i)
+            for col, (cell, text) in zip(self.columns, cells):
+                text.value = _format_cell(values[col][i], col)
+                text.color, text.weight = _plccode_style(plccode_val) if col == 'PLCCODE' else (None, None)
+                cell.bgcolor = row_color
+
+        self.top_spacer.height = self.start * self.row_height
+        self.bottom_spacer.height = (total - end) * self.row_height
+
+    def _on_scroll(self, e):
+        if self.df is None or e.pixels is None:
+            return
+        first = int(e.pixels // self.row_height)
+        visible = int((e.viewport_dimension or 0) // self.row_height) + 1
+        margin = max(1, (self.window_rows - visible) // 4)
+        if self.start + margin <= first and first + visible <= self.start + self.window_rows - margin:
+            return
+        # Re-centre the window on the viewport
+        start = max(0, min(first - (self.window_rows - visible) // 2, len(self.df) - self.window_rows))
+        if start != self.start:
+            self.start = start
+            self._bind()
+            self.list_view.update()
+
+def get_virtual_table(page) -> VirtualLogTable:
+    """The page's details table; kept on the page so its row controls survive re-renders."""
+    if getattr(page, 'log_table', None) is None:
+        page.log_table = VirtualLogTable()
+    return page.log_table
+
+def _normalize_page(current_df):
+    # Both loaders normalize at load (log_schema.normalize_logs), so a page is just a slice;
+    # anything else (e.g. a frame built by hand) goes through the same stage here
+    if is_normalized(current_df):
+        return current_df
+    return normalize_logs(current_df.copy())
+
+def keyset_filters():
+    """build_where arguments equivalent to select_rows on the loaded range."""
+    date_range = state.get('date_range')
+    filters = dict(load_range(*date_range)) if date_range else {}
+    filters['srms'] = state['line_logs']
+    filters['plccodes'] = state['status_logs']
+    filter_choice = state.get('filter_choice', 'All')
+    if filter_choice == "Alarm":
+        filters['plccode_min'] = ALARM_PLCCODE_MIN
+    elif filter_choice == "Normal":
+        filters['plccode_max'] = ALARM_PLCCODE_MIN - 1
+    return filters
+
+def get_pager(page, filters, rows_per_page) -> KeysetPager:
+    """The page's keyset pager, replaced when the filters change (refresh_data drops it too)."""
+    pager = getattr(page, 'log_pager', None)
+    if pager is None or pager.filters != filters or pager.rows_per_page != rows_per_page:
+        pager = page.log_pager = KeysetPager(filters, rows_per_page, page=page)
+    return pager
+
 def create_data_table_view(page):
+    if LOG_TABLE_CONFIG['source'] == 'keyset':
+        return create_keyset_table_view(page)
     df = state['df_logs']
-    current_page = state['page_logs']
     line_filter = state['line_logs']
     status_filter = state['status_logs']
     filter_choice = state.get('filter_choice', 'All')
-
-    filtered_df = apply_filters(df, line_filter, status_filter)
-    filtered_df = filter_data_by_type(filtered_df, filter_choice)
-
-    total_pages = max(1, (len(filtered_df) + state['rows_per_page'] - 1) // state['rows_per_page'])
-    
-    # Create page dropdown options
-    page_options = [
-        ft.dropdown.Option(key=str(i), text=f"{i+1}")
-        for i in range(total_pages)
-    ]
-    
-    # Create page dropdown
-    page_dropdown = ft.Dropdown(
-        options=page_options,
-        value=str(current_page),
-        width=100,
-        on_change=lambda e: on_page_change(e, page),
-    )
-    
-    def on_page_change(e, page):
-        state['page_logs'] = int(e.control.value)
-        page.update()
-        # Update the view
-        page.tabs["รายละเอียด"].content.content = create_data_table_view(page)
-        page.update()
-    
-    # Calculate current page slice
-    start_idx = current_page * state['rows_per_page']
-    end_idx = start_idx + state['rows_per_page']
-    current_df = filtered_df.iloc[start_idx:end_idx]
-
-    # Normalize the slice (safe even if df was normalized at load)
-    # NOTE: If server has md_* values, these will populate; otherwise fallback tries MONITORDATA.
-    current_df = _rename_md_columns(current_df.copy())
-    current_df = _fallback_parse_from_raw(current_df)
-    current_df = _ensure_legacy_columns(current_df)
-    current_df = _coerce_numeric_display_cols(current_df)
-
+    rows_per_page = LOG_TABLE_CONFIG['virtual_rows_per_page'] if LOG_TABLE_CONFIG['mode'] == 'virtual' else state['rows_per_page']
+
+    filtered_df = select_rows(df, line_filter, status_filter, filter_choice)
+
+    def page_slice(page_no):
+        start_idx = page_no * rows_per_page
+        return filtered_df.iloc[start_idx:start_idx + rows_per_page]
+
+    return _table_view(page, len(filtered_df), rows_per_page, page_slice,
+                       lambda timestamp: find_time_position(filtered_df, timestamp))
+
+def create_keyset_table_view(page):
+    """create_data_table_view for LOG_TABLE_CONFIG['source'] == 'keyset': one server page at a time."""
+    pager = get_pager(page, keyset_filters(), LOG_TABLE_CONFIG['keyset_rows_per_page'])
+    return _table_view(page, pager.total, pager.rows_per_page, pager.get, pager.position_at)
+
+def _table_view(page, total_rows, rows_per_page, get_page, locate_time):
+    """Filters, page navigator and table over any page source: get_page(page_no) -> page frame."""
+    virtual = LOG_TABLE_CONFIG['mode'] == 'virtual'
+    total_pages = max(1, (total_rows + rows_per_page - 1) // rows_per_page)
+    state['page_logs'] = max(0, min(state['page_logs'], total_pages - 1))
+    range_text = ft.Text("", size=16)
+
+    def load_page(page_no):
+        current_df = get_page(page_no)
+        start_idx = page_no * rows_per_page
+        range_text.value = f" แสดงข้อมูลแถวที่ {start_idx + 1} ถึงแถวที่ {start_idx + len(current_df)} จากทั้งหมด {total_rows} แถว"
+        return _normalize_page(current_df)
+
+    def on_page(page_no):
+        state['page_logs'] = page_no
+        if virtual and table.df is not None:
+            # Same controls, new values: only the changed cells go over the wire
+            table.show(load_page(page_no))
+            # page_logs is one of VIEW_INPUTS: record it so update_view doesn't rebuild the tab
+            from main import record_view_inputs
+            record_view_inputs(page, "รายละเอียด")
+            page.update()
+            return
+        # Through update_view, so the tab's recorded inputs (view_inputs) follow the page change
+        from main import update_view
+        update_view(page, "รายละเอียด")
+
+    current_df = load_page(state['page_logs'])
     filter_controls = create_filter_controls(page=page, show_status=True)
+    navigator = create_page_navigator(total_rows, rows_per_page, state['page_logs'], on_page, locate_time)
 
-    # New pagination controls with dropdown and export button
     pagination_controls = ft.Row(
         [
-            ft.Row([
-                ft.Text("หน้าที่: ", size=16),
-                page_dropdown,
-                ft.Text(f" แสดงข้อมูลแถวที่ {start_idx + 1} ถึงแถวที่ {min(end_idx, len(filtered_df))} จากทั้งหมด {len(filtered_df)} แถว", size=16),
-            ])
+            ft.Row([navigator, range_text])
         ],
         alignment=ft.MainAxisAlignment.SPACE_BETWEEN
     )
 
-    data_table = build_data_table(current_df)
+    table = get_virtual_table(page)
+    if virtual and len(current_df) > 0:
+        table.show(current_df)
+        data_table = table.control
+    else:
+        table.df = None
+        data_table = build_data_table(current_df)
 
     return ft.Container(
         content=ft.Column([filter_controls, ft.Container(height=10), pagination_controls, ft.Container(height=10), data_table]),
         padding=10, expand=True
-    )
\ No newline at end of file
+    )
@@ -1,14 +1,15 @@
 import flet as ft
 import pandas as pd
-import threading
-import time
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.state import state
-from src.filters import get_status_stats, apply_filters
-from src.ui_components import create_filter_controls, create_task_progress_gauge
+from src.state import state, SessionMapping, snapshot, is_current
+from src import tasks
+from src.tasks import TASK_CONFIG
+from src.metrics import span
+from src.filters import get_status_stats, apply_filters, match_before_alarm, find_time_position
+from src.ui_components import create_filter_controls, create_page_navigator
 
 from views.Status_Detail import Alarm_status_map, Normal_status_map , ALARM_CATEGORIES , CATEGORY_COLORS
 
@@ -17,10 +18,13 @@ table_height = 500
 cells_width = 180
 else_width = 70
 
-# Add pagination state to the cache
-stats_cache = {'logs_stats': None, 'alarm_df': None, 'before_alarm_df': None, 'filter_state': None, 'current_page': 0}
+# Add pagination state to the cache (one per session: filter results and table page)
+stats_cache = SessionMapping('before_alarm', {'logs_stats': None, 'alarm_df': None, 'before_alarm_df': None, 'filter_state': None, 'current_page': 0})
 rows_per_page = 10  # Number of rows to display per page
 
+# State the tab is built from (main.update_view rebuilds it only when one of these changed)
+VIEW_INPUTS = ('data_version', 'line_logs', 'filter_choice', 'selected_date', 'end_date')
+
 def create_before_alarm_view(page):
     filter_controls = create_filter_controls(page=page, show_status=False)
     loading_view = ft.Column([
@@ -38,10 +42,10 @@ def create_before_alarm_view(page):
         padding=15, expand=True
     )
     
-    def load_data_async():
-        time.sleep(0.1)
-        # Create a simple tuple for comparison
-        current_filter_state = (str(state['line_logs']), state['selected_date'].strftime("%Y-%m-%d") if hasattr(state['selected_date'], 'strftime') else str(state['selected_date']))
+    def compute():
+        # One snapshot for the whole computation; its version is part of the cache key
+        data = snapshot()
+        current_filter_state = filter_state(data)
         
         # Safe comparison - check if filter state has changed or if cache is empty
         should_reload = (stats_cache['filter_state'] is None or 
@@ -50,9 +54,13 @@ def create_before_alarm_view(page):
         
         if should_reload:
             try:
-                logs_stats, _ = get_status_stats(state['df_logs'], state['line_logs'], state['selected_date'])
+                logs_stats, _ = get_status_stats(data.df_logs, state['line_logs'], state['selected_date'])
                 logs_stats = logs_stats[logs_stats['PLCCODE'] > 100] if len(logs_stats) > 0 else logs_stats
-                alarm_df, before_alarm_df = process_alarm_data()
+                alarm_df, before_alarm_df = process_alarm_data(data.df_logs)
+                if not is_current(data.version):
+                    # A newer load was published meanwhile; its own view rebuild computes the tables
+                    print(f"Dropped before-alarm tables of data version {data.version}")
+                    return False
                 
                 stats_cache.update({
                     'logs_stats': logs_stats,
@@ -71,13 +79,16 @@ def create_before_alarm_view(page):
                     'filter_state': current_filter_state,
                     'current_page': 0
                 }) # type: ignore
-        
+        return True
+    
+    def show(ready):
+        if not ready:
+            return
         try:
             # Modified to only show the pre-alarm table with pagination
             main_content = create_pre_alarm_table(stats_cache['before_alarm_df'], page)
             
             main_container.content = ft.Column([filter_controls, main_content], expand=True)
-            page.update()
         except Exception as e:
             print(f"Error updating statistics view: {e}")
             # Show error message in UI
@@ -91,57 +102,35 @@ def create_before_alarm_view(page):
                 )
             ])
             main_container.content = error_content
-            page.update()
     
-    threading.Thread(target=load_data_async).start()
+    # Rapid filter changes collapse into one computation; older results never replace newer ones
+    tasks.submit(page, 'before_alarm', compute, show, debounce=TASK_CONFIG['debounce'])
     return main_container
 
+def filter_state(data):
+    """Cache key of the before-alarm tables: line filter, selected date and data version."""
+    return (str(state['line_logs']), state['selected_date'].strftime("%Y-%m-%d") if hasattr(state['selected_date'], 'strftime') else str(state['selected_date']), data.version)
+
+def cached_alarm_data():
+    """(alarm_df, before_alarm_df) for the current filters and data, from stats_cache when it is up to date."""
+    data = snapshot()
+    if stats_cache['filter_state'] == filter_state(data) and stats_cache['before_alarm_df'] is not None:
+        return stats_cache['alarm_df'], stats_cache['before_alarm_df']
+    return process_alarm_data(data.df_logs)
+
 # Rest of the file remains unchanged
-def process_alarm_data():
-    df = state['df_logs']
+def process_alarm_data(df=None):
+    if df is None:
+        df = state['df_logs']
     if df is None or len(df) == 0:
         return pd.DataFrame(), pd.DataFrame()
     
-    filtered_df = apply_filters(df, state['line_logs'], "All")
-    alarm_df = filtered_df[filtered_df['PLCCODE'] > 100] if 'PLCCODE' in filtered_df.columns else pd.DataFrame()
-    
-    if len(alarm_df) == 0:
-        return alarm_df, pd.DataFrame()
-    
-    alarm_df = alarm_df.sort_values('CDATE', ascending=False)
-    before_alarm_rows = []
-    sorted_df = filtered_df.sort_values('CDATE')
-    
-    for _, alarm_row in alarm_df.iterrows():
-        line_value = alarm_row['ASRS']
-        alarm_time = alarm_row['CDATE']
-        previous_rows = sorted_df[
-            (sorted_df['ASRS'] == line_value) & 
-            (sorted_df['CDATE'] < alarm_time) &
-            (sorted_df['PLCCODE'] < 100)
-        ]
-        
-        if len(previous_rows) > 0:
-            previous_row = previous_rows.iloc[-1]
-            previous_row = previous_row.copy()
-            previous_row['Alarm'] = alarm_row['PLCCODE']
-            previous_row['AlarmTime'] = alarm_row['CDATE']
-            
-            if isinstance(previous_row['CDATE'], pd.Timestamp) and isinstance(alarm_row['CDATE'], pd.Timestamp):
-                duration_seconds = (alarm_row['CDATE'] - previous_row['CDATE']).total_seconds()
-                previous_row['Duration'] = f"{int(duration_seconds)}"
-            else:
-                previous_row['Duration'] = "Unknown"
-            
-            before_alarm_rows.append(previous_row)
-    
-    if before_alarm_rows:
-        before_alarm_df = pd.DataFrame(before_alarm_rows)
-        before_alarm_df = before_alarm_df.sort_values('CDATE', ascending=False)
-    else:
-        before_alarm_df = pd.DataFrame()
-    
-    return alarm_df, before_alarm_df
+    with span('process_alarm_data') as processing:
+        filtered_df = apply_filters(df, state['line_logs'], "All")
+        # Last normal status before each alarm on the same SRM (as-of join, see filters.match_before_alarm)
+        result = match_before_alarm(filtered_df)
+        processing.rows(len(filtered_df))
+    return result
 
 def create_container_with_header(title, content, height):
     return ft.Container(
@@ -162,22 +151,16 @@ def create_container_with_header(title, content, height):
     )
 
 # Function to handle page change
-def on_page_change(e, page):
-    stats_cache['current_page'] = int(e.control.value)
-    page.update()
-    
-    # Reload the table with the new page
-    task_gauge = create_task_progress_gauge()
+def on_page_change(page_no, page):
+    """Redraw the tab on page_no from the cached tables (no recomputation)."""
+    stats_cache['current_page'] = page_no
     filter_controls = create_filter_controls(page=page, show_status=False)
     main_content = create_pre_alarm_table(stats_cache['before_alarm_df'], page)
-    
-    # Find the main container and update it
-    for control in page.controls:
-        if isinstance(control, ft.Tabs):
-            for tab in control.tabs:
-                if tab.text == "ก่อนเกิด Alarm":
-                    tab.content = ft.Column([filter_controls, task_gauge, main_content], expand=True)
-                    break
+    # Same layout create_before_alarm_view builds and main.update_view wraps
+    page.tabs["ก่อนเกิด Alarm"].content = ft.Container(
+        content=ft.Container(content=ft.Column([filter_controls, main_content], expand=True), padding=15, expand=True),
+        expand=True
+    )
     page.update()
 
 def create_pre_alarm_table(before_alarm_df, page):
@@ -231,26 +214,15 @@ def create_pre_alarm_table(before_alarm_df, page):
     # Get the subset of data for the current page
     page_df = display_df.iloc[start_idx:end_idx]
     
-    # Create page dropdown options
-    page_options = [
-        ft.dropdown.Option(key=str(i), text=f"{i+1}")
-        for i in range(total_pages)
-    ]
-    
-    # Create page dropdown
-    page_dropdown = ft.Dropdown(
-        options=page_options,
-        value=str(current_page),
-        width=100,
-        on_change=lambda e: on_page_change(e, page),
-    )
+    navigator = create_page_navigator(total_rows, rows_per_page, current_page,
+                                      lambda page_no: on_page_change(page_no, page),
+                                      lambda timestamp: find_time_position(before_alarm_df, timestamp))
     
     # Create pagination controls
     pagination_controls = ft.Row(
         [
             ft.Row([
-                ft.Text("หน้าที่: ", size=16),
-                page_dropdown,
+                navigator,
                 ft.Text(f" แสดงข้อมูลแถวที่ {start_idx + 1} ถึงแถวที่ {end_idx} จากทั้งหมด {total_rows} แถว", size=16),
             ])
         ],
@@ -336,6 +308,8 @@ def create_pre_alarm_table(before_alarm_df, page):
                 cell_text = "NULL"
             elif isinstance(value, pd.Timestamp):
                 cell_text = value.strftime("%m-%d %H:%M:%S")
+            elif col == 'Duration':
+                cell_text = f"{int(value)}"
             else:
                 cell_text = str(value)
             
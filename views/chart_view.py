@@ -9,17 +9,19 @@ import numpy as np
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.state import state
-from src.filters import apply_filters, get_status_stats
-from src.ui_components import create_filter_controls ,filter_data_by_type
+from src.filters import select_rows, get_status_stats
+from src.ui_components import create_filter_controls
 from views.Status_Detail import Alarm_status_map, Normal_status_map, ALARM_CATEGORIES, CATEGORY_COLORS
 
+# State the tab is built from (main.update_view rebuilds it only when one of these changed)
+VIEW_INPUTS = ('data_version', 'line_logs', 'status_logs', 'filter_choice', 'selected_date', 'end_date')
+
 def create_chart_view(page):
     df = state['df_logs']
     line_filter = state['line_logs']
     status_filter = state['status_logs']
     filter_choice = state.get('filter_choice', 'All')
-    filtered_df = apply_filters(df, line_filter, status_filter)
-    filtered_df = filter_data_by_type(filtered_df, filter_choice)
+    filtered_df = select_rows(df, line_filter, status_filter, filter_choice)
 
     filter_controls = create_filter_controls(
         page=page,
@@ -1,16 +1,18 @@
 import flet as ft
-import pandas as pd
-import threading
-import time
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from datetime import datetime, timedelta
-from src.state import state
-from src.filters import get_status_stats, apply_filters
+from src.state import state, is_current
+from src import tasks
+from src.tasks import TASK_CONFIG
 from src.ui_components import create_filter_controls
+from src.data_source import load_range
+from src.aggregates import alarm_summary
 from views.Status_Detail import Alarm_status_map
 
+# State the tab is built from (main.update_view rebuilds it only when one of these changed)
+VIEW_INPUTS = ('data_version', 'date_range', 'line_logs', 'status_logs', 'filter_choice', 'selected_date', 'end_date')
+
 def create_statistics_view(page):
     # Create filter controls from ui_components
     filter_container = create_filter_controls(page)
@@ -47,13 +49,35 @@ def create_statistics_view(page):
     
     # Function to run query and update UI
     def run_query():
-        # Function to run in background thread
-        def load_data_thread():
+        # Counts are grouped on the server; no log rows are transferred for this tab
+        def query_summary():
+            version = state['data_version']
+            date_range = state.get('date_range')
+            query = {}
+            if date_range:
+                query.update(load_range(*date_range))
+            query['srms'] = state.get('line_logs', 'All')
             try:
-                # Get data from state
-                df = state.get('df_logs')
+                summary = alarm_summary(**query) if date_range else None
+            except Exception as e:
+                return {'error': e}
+            if not is_current(version):
+                # Another range was loaded meanwhile; its view rebuild queries again
+                print(f"Dropped alarm summary of data version {version}")
+                return None
+            return {'summary': summary}
+        
+        # Runs with the query result, unless a newer query for this session superseded it
+        def show_summary(result):
+            if result is None:
+                return
+            try:
+                if 'error' in result:
+                    raise result['error']
+                summary = result['summary']
+                total_rows = summary['total_rows'] if summary else 0
                 
-                if df is None or len(df) == 0:
+                if total_rows == 0:
                     # No data found
                     page.snack_bar = ft.SnackBar(
                         content=ft.Text("ไม่พบข้อมูลในช่วงวันที่ที่เลือก"),
@@ -63,48 +87,25 @@ def create_statistics_view(page):
                     status_text.value = "ไม่พบข้อมูล กรุณาลองเลือกช่วงวันที่อื่น"
                     status_text.color = ft.Colors.RED_600
                     progress_bar.visible = False
-                    page.update()
                     return
                 
-                # Apply filters - use the filters directly from the page
-                filtered_df = df
-                if hasattr(page, 'filter_asrs') and page.filter_asrs.value != "0":
-                    filtered_df = filtered_df[filtered_df['ASRS'] == int(page.filter_asrs.value)]
-                
-                if hasattr(page, 'filter_status') and page.filter_status.value != "0":
-                    status_filter = int(page.filter_status.value)
-                    if status_filter > 0:
-                        filtered_df = filtered_df[filtered_df['PLCCODE'] == status_filter]
-                
-                if len(filtered_df) == 0:
-                    status_text.value = "ไม่พบข้อมูลที่ตรงกับเงื่อนไขที่เลือก"
-                    status_text.color = ft.Colors.ORANGE_600
-                    results_container.content = ft.Text("ไม่พบข้อมูลที่ตรงกับเงื่อนไขที่เลือก")
-                    line_stats_container.content = ft.Text("ไม่พบข้อมูลที่ตรงกับเงื่อนไขที่เลือก")
-                    progress_bar.visible = False
-                    page.update()
-                    return
+                total_alarms = summary['total_alarms']
                 
                 # --- Main Alarm Table (Left Side) ---
-                if 'PLCCODE' in filtered_df.columns:
-                    alarm_df = filtered_df[filtered_df['PLCCODE'] > 100]
-                    if len(alarm_df) > 0:
-                        plc_counts = alarm_df['PLCCODE'].value_counts().reset_index()
-                        plc_counts.columns = ['PLCCODE', 'Count']
-                        plc_counts = plc_counts.sort_values('Count', ascending=False)
-                        
-                        start_date = state.get('selected_date')
-                        end_date = state.get('end_date')
-                        
-                        date_header = create_date_header(start_date, end_date, len(alarm_df))
-                        alarm_table = create_alarm_table(plc_counts)
-                        results_container.content = ft.Column([date_header, ft.Container(content=alarm_table, expand=True)], scroll=ft.ScrollMode.AUTO, expand=True)
-                    else:
-                        results_container.content = ft.Text("ไม่พบข้อมูล Alarm ในช่วงวันที่ที่เลือก")
+                if total_alarms > 0:
+                    plc_counts = summary['by_plccode']
+                    
+                    start_date = state.get('selected_date')
+                    end_date = state.get('end_date')
+                    
+                    date_header = create_date_header(start_date, end_date, total_alarms)
+                    alarm_table = create_alarm_table(plc_counts)
+                    results_container.content = ft.Column([date_header, ft.Container(content=alarm_table, expand=True)], scroll=ft.ScrollMode.AUTO, expand=True)
+                else:
+                    results_container.content = ft.Text("ไม่พบข้อมูล Alarm ในช่วงวันที่ที่เลือก")
                 
                 # --- Per-Line Summary Table (Right Side) ---
-                line_summary_df = filtered_df[filtered_df['PLCCODE'] > 100].groupby('ASRS').size().reset_index(name='Count')
-                line_summary_df = line_summary_df.sort_values('Count', ascending=False)
+                line_summary_df = summary['by_srm']
                 
                 if not line_summary_df.empty:
                     line_summary_table = create_line_summary_table(line_summary_df)
@@ -117,8 +118,8 @@ def create_statistics_view(page):
                     line_stats_container.content = ft.Text("ไม่พบข้อมูล Alarm เพื่อสรุป")
 
                 # Update status
-                print_total_alarms = len(filtered_df[filtered_df['PLCCODE'] > 100])
-                status_text.value = f"โหลดข้อมูลสำเร็จ พบข้อมูล {len(filtered_df)} มี Alarm ทั้งหมด {print_total_alarms} รายการในช่วงเวลาที่เลือก"
+                print_total_alarms = total_alarms
+                status_text.value = f"โหลดข้อมูลสำเร็จ พบข้อมูล {total_rows} มี Alarm ทั้งหมด {print_total_alarms} รายการในช่วงเวลาที่เลือก"
                 status_text.color = ft.Colors.GREEN_700
                 
             except Exception as e:
@@ -135,10 +136,9 @@ def create_statistics_view(page):
             
             # Hide progress bar
             progress_bar.visible = False
-            page.update()
         
-        # Start background thread
-        threading.Thread(target=load_data_thread).start()
+        # Shared executor: repeated queries are debounced and only the newest result is shown
+        tasks.submit(page, 'statistics', query_summary, show_summary, debounce=TASK_CONFIG['debounce'])
     
     # Main container
     main_container = ft.Container(